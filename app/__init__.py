@@ -1,16 +1,44 @@
 from app.infrastructure.config.setting import Setting
 from app.infrastructure.config.logging import config_logging
 from app.infrastructure.config.celery import config_celery
-from app.infrastructure.db.connection_pool import ConnectionPool
+from app.infrastructure.config.lifecycle import config_lifecycle
+from app.infrastructure.config.cache import config_user_cache
+from app.infrastructure.config.history import config_user_history
+from app.infrastructure.config.activity import config_user_activity
+from app.infrastructure.config.query_monitor import config_query_monitor
+from app.infrastructure.db.connection_pool import ConnectionPool, AsyncConnectionPool
 
 setting = Setting()
 config_logging(setting)
 celery_app = config_celery(setting)
-connection_pool = ConnectionPool(setting.DB_URL)
+connection_pool = ConnectionPool(
+    setting.DB_URL,
+    replica_urls=setting.DB_REPLICA_URLS,
+    replica_selection=setting.DB_REPLICA_SELECTION,
+    pool_config=setting.pool_config,
+    statement_cache_config=setting.statement_cache_config,
+)
+async_connection_pool = AsyncConnectionPool(
+    setting.async_db_url,
+    replica_urls=setting.async_replica_urls,
+    replica_selection=setting.DB_REPLICA_SELECTION,
+    pool_config=setting.pool_config,
+    statement_cache_config=setting.statement_cache_config,
+)
+config_lifecycle(connection_pool, async_connection_pool)
+user_cache = config_user_cache(setting)
+user_history = config_user_history(setting, connection_pool)
+user_activity = config_user_activity(setting, connection_pool)
+query_monitor = config_query_monitor(setting)
 
 __all__ = [
     'setting',
     'celery_app',
     'connection_pool',
+    'async_connection_pool',
+    'user_cache',
+    'user_history',
+    'user_activity',
+    'query_monitor',
     'translation',
 ]
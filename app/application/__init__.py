@@ -1,5 +1,6 @@
-from .context import IContext
+from .context import IContext, IAsyncContext
 
 __all__ = [
     'IContext',
+    'IAsyncContext',
 ]
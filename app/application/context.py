@@ -1,6 +1,7 @@
 import logging
 from typing import Protocol
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.domain.entity.user import User
@@ -20,3 +21,12 @@ class IContext(Protocol):
     def authenticate(self, user: User) -> None: ...
     def set_lang(self, lang: str) -> None: ...
     def t(self, msg: str) -> str: ...
+
+
+class IAsyncContext(Protocol):
+    session: AsyncSession
+    user: 'User | None'
+
+    def authenticate(self, user: User) -> None: ...
+    def set_lang(self, lang: str) -> None: ...
+    def t(self, msg: str) -> str: ...
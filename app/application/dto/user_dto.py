@@ -17,6 +17,10 @@ class UpdateUserDTO(BaseModel):
     phone: str | None = Field(None)
 
 
+class BulkUpdateUserDTO(UpdateUserDTO):
+    id: int
+
+
 class SimpleUserDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -36,10 +40,25 @@ class UserDTO(BaseModel):
     phone: str | None = Field(None)
     created_at: datetime.datetime | None = Field(None)
     updated_at: datetime.datetime | None = Field(None)
+    last_seen_at: datetime.datetime | None = Field(None)
     created_user: SimpleUserDTO | None = Field(None)
     updated_user: SimpleUserDTO | None = Field(None)
 
 
 class UserListDTO(BaseModel):
     results: list[UserDTO]
-    count: int
+    count: int | None = Field(None)
+    next_cursor: str | None = Field(None)
+    prev_cursor: str | None = Field(None)
+
+
+class BulkItemResultDTO(BaseModel):
+    index: int
+    id: int | None = Field(None)
+    error: str | None = Field(None)
+
+
+class BulkResultDTO(BaseModel):
+    results: list[BulkItemResultDTO]
+    succeeded: int
+    failed: int
@@ -2,13 +2,13 @@ from http import HTTPStatus
 
 from fastapi import HTTPException
 
-from app.application.context import IContext
+from app.application.context import IContext, IAsyncContext
 from app.domain.entity.user import User
-from app.domain.repository import user_repository
+from app.domain.repository import user_repository, async_user_repository
 
 
 def read(ctx: IContext, user_id: int) -> User:
-    user = user_repository.find_by_id(ctx.session, user_id)
+    user = user_repository.find_by_id(ctx.session, user_id, eager=True)
     if not user:
         raise HTTPException(HTTPStatus.NOT_FOUND, ctx.t('User ({user_id}) not found').format(user_id=user_id))
     return user
@@ -18,3 +18,16 @@ def validate_unique_email(ctx: IContext, email: str, exclude_id: int | None = No
     user = user_repository.find_by_email(ctx.session, email)
     if user and user.id != exclude_id:
         raise HTTPException(HTTPStatus.UNPROCESSABLE_ENTITY, ctx.t('Email already exists'))
+
+
+async def read_async(ctx: IAsyncContext, user_id: int) -> User:
+    user = await async_user_repository.find_by_id(ctx.session, user_id, eager=True)
+    if not user:
+        raise HTTPException(HTTPStatus.NOT_FOUND, ctx.t('User ({user_id}) not found').format(user_id=user_id))
+    return user
+
+
+async def validate_unique_email_async(ctx: IAsyncContext, email: str, exclude_id: int | None = None) -> None:
+    user = await async_user_repository.find_by_email(ctx.session, email)
+    if user and user.id != exclude_id:
+        raise HTTPException(HTTPStatus.UNPROCESSABLE_ENTITY, ctx.t('Email already exists'))
@@ -3,10 +3,12 @@ from http import HTTPStatus
 
 import jwt
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app import user_activity
 from app.infrastructure.helper.jwt_helper import decode_token
-from app.domain.repository import user_repository
+from app.domain.repository import user_repository, async_user_repository
 
 
 def execute(session: Session, token: str) -> Session:
@@ -22,4 +24,23 @@ def execute(session: Session, token: str) -> Session:
         raise HTTPException(HTTPStatus.UNAUTHORIZED, 'User not found')
 
     session.info['uid'] = user.id
+    # recorded in memory, written later with every other user seen meanwhile
+    user_activity.touch(user.id)
+    return session
+
+
+async def execute_async(session: AsyncSession, token: str) -> AsyncSession:
+    try:
+        claims = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, 'Token has expired')
+    except (jwt.InvalidTokenError, jwt.DecodeError):
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, 'Invalid token')
+
+    user = await async_user_repository.find_by_id(session, int(claims.sub))
+    if not user:
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, 'User not found')
+
+    session.info['uid'] = user.id
+    user_activity.touch(user.id)
     return session
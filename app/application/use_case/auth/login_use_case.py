@@ -1,14 +1,19 @@
 from http import HTTPStatus
 
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 
-from app.application.context import IContext
+from app.application.context import IContext, IAsyncContext
 from app.infrastructure.helper.jwt_helper import generate_token_pair
 from app.infrastructure.helper.password_helper import verify_password
 from app.application.dto.auth_dto import LoginDTO, TokenPairDTO
-from app.domain.repository import user_repository
+from app.domain.repository import user_repository, async_user_repository
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
 
+PROFILE = ExecutionProfile(statement_timeout=1000, lock_timeout=500, jit=False)
 
+
+@execution_profile(PROFILE)
 def execute(ctx: IContext, dto: LoginDTO) -> TokenPairDTO:
     user = user_repository.find_by_email(ctx.session, dto.email)
     if not user:
@@ -20,3 +25,17 @@ def execute(ctx: IContext, dto: LoginDTO) -> TokenPairDTO:
 
     access, refresh = generate_token_pair(user.id)
     return TokenPairDTO(access=access, refresh=refresh)
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, dto: LoginDTO) -> TokenPairDTO:
+    user = await async_user_repository.find_by_email(ctx.session, dto.email)
+    if not user:
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, ctx.t('Invalid credentials'))
+
+    matched = await run_in_threadpool(verify_password, dto.password, user.password)
+    if not matched:
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, ctx.t('Invalid credentials'))
+
+    access, refresh = generate_token_pair(user.id)
+    return TokenPairDTO(access=access, refresh=refresh)
@@ -1,15 +1,20 @@
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.event import listen
 
-from app.application.context import IContext
+from app.application.context import IContext, IAsyncContext
 from app.application.dto.auth_dto import RegisterDTO, TokenPairDTO
 from app.infrastructure.helper.jwt_helper import generate_token_pair
 from app.infrastructure.helper.password_helper import hash_password
 from app.domain.entity.user import User
-from app.domain.repository import user_repository
+from app.domain.repository import user_repository, async_user_repository
 from app.application.service import user_service
 from app.infrastructure.task.mail_task import send_welcome_mail
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
 
+PROFILE = ExecutionProfile(statement_timeout=2000, lock_timeout=1000, jit=False)
 
+
+@execution_profile(PROFILE)
 def execute(ctx: IContext, dto: RegisterDTO) -> TokenPairDTO:
     user_service.validate_unique_email(ctx, dto.email)
 
@@ -24,3 +29,20 @@ def execute(ctx: IContext, dto: RegisterDTO) -> TokenPairDTO:
     )
     access, refresh = generate_token_pair(user.id)
     return TokenPairDTO(access=access, refresh=refresh)
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, dto: RegisterDTO) -> TokenPairDTO:
+    await user_service.validate_unique_email_async(ctx, dto.email)
+
+    data = dto.model_dump(exclude_unset=True)
+    user = User(**data)
+    user.password = await run_in_threadpool(hash_password, dto.password)
+    new_user = await async_user_repository.create(ctx.session, user)
+    listen(
+        ctx.session.sync_session,
+        'after_commit',
+        lambda s: send_welcome_mail.delay(new_user.email, new_user.first_name),
+    )
+    access, refresh = generate_token_pair(user.id)
+    return TokenPairDTO(access=access, refresh=refresh)
@@ -0,0 +1,63 @@
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.application.context import IContext, IAsyncContext
+from app.application.dto.user_dto import BulkItemResultDTO, BulkResultDTO, CreateUserDTO
+from app.infrastructure.helper.password_helper import hash_passwords
+from app.domain.repository import user_repository, async_user_repository
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
+
+PROFILE = ExecutionProfile(statement_timeout=30000, lock_timeout=1000, jit=False)
+
+
+@execution_profile(PROFILE)
+def execute(ctx: IContext, dtos: list[CreateUserDTO]) -> BulkResultDTO:
+    existing = user_repository.find_existing_emails(ctx.session, {dto.email for dto in dtos})
+    pending = _new_items(dtos, existing)
+    passwords = hash_passwords([dto.password for dto in pending.values()])
+    ids = user_repository.bulk_create(ctx.session, _rows(pending, passwords))
+    return _result(ctx, dtos, pending, ids)
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, dtos: list[CreateUserDTO]) -> BulkResultDTO:
+    existing = await async_user_repository.find_existing_emails(ctx.session, {dto.email for dto in dtos})
+    pending = _new_items(dtos, existing)
+    passwords = await run_in_threadpool(hash_passwords, [dto.password for dto in pending.values()])
+    ids = await async_user_repository.bulk_create(ctx.session, _rows(pending, passwords))
+    return _result(ctx, dtos, pending, ids)
+
+
+def _new_items(dtos: list[CreateUserDTO], existing: set[str]) -> dict[int, CreateUserDTO]:
+    # items by index, without taken emails nor repeats of an email earlier in the batch
+    seen = set(existing)
+    pending = {}
+    for index, dto in enumerate(dtos):
+        if dto.email not in seen:
+            seen.add(dto.email)
+            pending[index] = dto
+    return pending
+
+
+def _rows(pending: dict[int, CreateUserDTO], passwords: list[str]) -> list[dict[str, Any]]:
+    # same keys on every row, so they are inserted in as few statements as possible
+    return [{**dto.model_dump(), 'password': password} for dto, password in zip(pending.values(), passwords)]
+
+
+def _result(
+    ctx: IContext | IAsyncContext, dtos: list[CreateUserDTO], pending: dict[int, CreateUserDTO], ids: dict[str, int]
+) -> BulkResultDTO:
+    results = []
+    for index, dto in enumerate(dtos):
+        # emails taken by a concurrent insert are skipped by the database, so they are missing from `ids`
+        if index in pending and dto.email in ids:
+            results.append(BulkItemResultDTO(index=index, id=ids[dto.email], error=None))
+        else:
+            results.append(BulkItemResultDTO(index=index, id=None, error=ctx.t('Email already exists')))
+    return summarize(results)
+
+
+def summarize(results: list[BulkItemResultDTO]) -> BulkResultDTO:
+    failed = sum(result.error is not None for result in results)
+    return BulkResultDTO(results=results, succeeded=len(results) - failed, failed=failed)
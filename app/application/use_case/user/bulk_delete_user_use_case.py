@@ -0,0 +1,32 @@
+from app.application.context import IContext, IAsyncContext
+from app.application.dto.user_dto import BulkItemResultDTO, BulkResultDTO
+from app.application.use_case.user.bulk_create_user_use_case import summarize
+from app.domain.repository import user_repository, async_user_repository
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
+
+PROFILE = ExecutionProfile(statement_timeout=30000, lock_timeout=1000, jit=False)
+
+
+@execution_profile(PROFILE)
+def execute(ctx: IContext, user_ids: list[int]) -> BulkResultDTO:
+    deleted = user_repository.bulk_delete(ctx.session, set(user_ids))
+    return _result(ctx, user_ids, set(deleted))
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, user_ids: list[int]) -> BulkResultDTO:
+    deleted = await async_user_repository.bulk_delete(ctx.session, set(user_ids))
+    return _result(ctx, user_ids, set(deleted))
+
+
+def _result(ctx: IContext | IAsyncContext, user_ids: list[int], deleted: set[int]) -> BulkResultDTO:
+    return summarize(
+        [
+            BulkItemResultDTO(index=index, id=user_id, error=None)
+            if user_id in deleted
+            else BulkItemResultDTO(
+                index=index, id=None, error=ctx.t('User ({user_id}) not found').format(user_id=user_id)
+            )
+            for index, user_id in enumerate(user_ids)
+        ]
+    )
@@ -0,0 +1,45 @@
+from typing import Any
+
+from app.application.context import IContext, IAsyncContext
+from app.application.dto.user_dto import BulkItemResultDTO, BulkResultDTO, BulkUpdateUserDTO
+from app.application.use_case.user.bulk_create_user_use_case import summarize
+from app.domain.repository import user_repository, async_user_repository
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
+
+PROFILE = ExecutionProfile(statement_timeout=30000, lock_timeout=1000, jit=False)
+
+
+@execution_profile(PROFILE)
+def execute(ctx: IContext, dtos: list[BulkUpdateUserDTO]) -> BulkResultDTO:
+    existing = user_repository.find_existing_ids(ctx.session, {dto.id for dto in dtos})
+    user_repository.bulk_update(ctx.session, _rows(dtos, existing))
+    return _result(ctx, dtos, existing)
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, dtos: list[BulkUpdateUserDTO]) -> BulkResultDTO:
+    existing = await async_user_repository.find_existing_ids(ctx.session, {dto.id for dto in dtos})
+    await async_user_repository.bulk_update(ctx.session, _rows(dtos, existing))
+    return _result(ctx, dtos, existing)
+
+
+def _rows(dtos: list[BulkUpdateUserDTO], existing: set[int]) -> list[dict[str, Any]]:
+    # a user listed more than once ends up with its last changes, as if the items were applied in order
+    rows: dict[int, dict[str, Any]] = {}
+    for dto in dtos:
+        if dto.id in existing:
+            rows.setdefault(dto.id, {'id': dto.id}).update(dto.model_dump(exclude_unset=True))
+    return list(rows.values())
+
+
+def _result(ctx: IContext | IAsyncContext, dtos: list[BulkUpdateUserDTO], existing: set[int]) -> BulkResultDTO:
+    return summarize(
+        [
+            BulkItemResultDTO(index=index, id=dto.id, error=None)
+            if dto.id in existing
+            else BulkItemResultDTO(
+                index=index, id=None, error=ctx.t('User ({user_id}) not found').format(user_id=dto.id)
+            )
+            for index, dto in enumerate(dtos)
+        ]
+    )
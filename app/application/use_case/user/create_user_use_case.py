@@ -1,11 +1,17 @@
-from app.application.context import IContext
+from fastapi.concurrency import run_in_threadpool
+
+from app.application.context import IContext, IAsyncContext
 from app.application.dto.user_dto import CreateUserDTO, UserDTO
 from app.infrastructure.helper.password_helper import hash_password
 from app.domain.entity.user import User
-from app.domain.repository import user_repository
+from app.domain.repository import user_repository, async_user_repository
 from app.application.service import user_service
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
+
+PROFILE = ExecutionProfile(statement_timeout=2000, lock_timeout=1000, jit=False)
 
 
+@execution_profile(PROFILE)
 def execute(ctx: IContext, dto: CreateUserDTO) -> UserDTO:
     user_service.validate_unique_email(ctx, dto.email)
 
@@ -14,3 +20,14 @@ def execute(ctx: IContext, dto: CreateUserDTO) -> UserDTO:
     user.password = hash_password(dto.password)
     new_user = user_repository.create(ctx.session, user)
     return UserDTO.model_validate(new_user)
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, dto: CreateUserDTO) -> UserDTO:
+    await user_service.validate_unique_email_async(ctx, dto.email)
+
+    create_data = dto.model_dump(exclude_unset=True)
+    user = User(**create_data)
+    user.password = await run_in_threadpool(hash_password, dto.password)
+    new_user = await async_user_repository.create(ctx.session, user)
+    return UserDTO.model_validate(new_user)
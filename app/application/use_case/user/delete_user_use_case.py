@@ -1,8 +1,18 @@
-from app.application.context import IContext
-from app.domain.repository import user_repository
+from app.application.context import IContext, IAsyncContext
+from app.domain.repository import user_repository, async_user_repository
 from app.application.service import user_service
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
 
+PROFILE = ExecutionProfile(statement_timeout=2000, lock_timeout=1000, jit=False)
 
+
+@execution_profile(PROFILE)
 def execute(ctx: IContext, user_id: int) -> None:
     user = user_service.read(ctx, user_id)
     return user_repository.delete(ctx.session, user)
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, user_id: int) -> None:
+    user = await user_service.read_async(ctx, user_id)
+    return await async_user_repository.delete(ctx.session, user)
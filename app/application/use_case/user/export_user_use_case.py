@@ -0,0 +1,84 @@
+import csv
+import datetime
+import io
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from typing import Any, AsyncIterator, Callable, Iterator, Sequence
+
+import msgspec
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.domain.repository import user_repository, async_user_repository
+from app.infrastructure.db.execution_profile import ExecutionProfile, apply_profile, apply_profile_async
+
+FORMAT_NDJSON = 'ndjson'
+FORMAT_CSV = 'csv'
+MEDIA_TYPES = {FORMAT_NDJSON: 'application/x-ndjson', FORMAT_CSV: 'text/csv'}
+
+# every FETCH from the server-side cursor is a statement of its own, the timeout bounds a batch, not the export
+PROFILE = ExecutionProfile(statement_timeout=3000, lock_timeout=1000, jit=False)
+BATCH_SIZE = 1000
+
+
+class UserExportRow(msgspec.Struct):
+    id: int
+    email: str
+    first_name: str | None
+    last_name: str | None
+    phone: str | None
+    created_at: datetime.datetime | None
+    updated_at: datetime.datetime | None
+
+
+_json_encoder = msgspec.json.Encoder()
+
+
+def execute(
+    open_session: Callable[[], AbstractContextManager[Session]],
+    fmt: str,
+    keyword: str | None = None,
+    email: str | None = None,
+) -> Iterator[bytes]:
+    """
+    Encoded chunks of the matching users, one per batch read from the database.
+
+    The response is sent after the request session closes, so the export reads through its own `open_session()`.
+    """
+
+    # the CSV header goes out before the query runs
+    if fmt == FORMAT_CSV:
+        yield encode_csv([UserExportRow.__struct_fields__])
+    with open_session() as session:
+        apply_profile(session, PROFILE)
+        for rows in user_repository.stream(session, keyword=keyword, email=email, batch_size=BATCH_SIZE):
+            yield encode(fmt, rows)
+
+
+async def execute_async(
+    open_session: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+    fmt: str,
+    keyword: str | None = None,
+    email: str | None = None,
+) -> AsyncIterator[bytes]:
+    if fmt == FORMAT_CSV:
+        yield encode_csv([UserExportRow.__struct_fields__])
+    async with open_session() as session:
+        await apply_profile_async(session, PROFILE)
+        async for rows in async_user_repository.stream(session, keyword=keyword, email=email, batch_size=BATCH_SIZE):
+            yield encode(fmt, rows)
+
+
+def encode(fmt: str, rows: Sequence[Row[Any]]) -> bytes:
+    if fmt == FORMAT_CSV:
+        return encode_csv(rows)
+    return _json_encoder.encode_lines([UserExportRow(*row) for row in rows])
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    # timestamps as in the NDJSON export
+    csv.writer(buffer).writerows(
+        [value.isoformat() if isinstance(value, datetime.datetime) else value for value in row] for row in rows
+    )
+    return buffer.getvalue().encode()
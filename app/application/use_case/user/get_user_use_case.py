@@ -1,8 +1,18 @@
-from app.application.context import IContext
+from app.application.context import IContext, IAsyncContext
 from app.application.service import user_service
 from app.application.dto.user_dto import UserDTO
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
 
+PROFILE = ExecutionProfile(statement_timeout=1000, lock_timeout=500, jit=False)
 
+
+@execution_profile(PROFILE)
 def execute(ctx: IContext, user_id: int) -> UserDTO:
     user = user_service.read(ctx, user_id)
     return UserDTO.model_validate(user)
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, user_id: int) -> UserDTO:
+    user = await user_service.read_async(ctx, user_id)
+    return UserDTO.model_validate(user)
@@ -1,21 +1,117 @@
-from app.application.context import IContext
-from app.domain.repository import user_repository
+import datetime
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from app.application.context import IContext, IAsyncContext
+from app.domain.entity.user import User
+from app.domain.repository import user_repository, async_user_repository
+from app.domain.repository.user_repository import COUNT_EXACT, ORDER_ID, SEARCH_FULLTEXT, SEARCH_SUBSTRING
+from app.domain.value_object.pagination_value_object import NEXT, PREV, Cursor
 from app.application.dto.user_dto import UserListDTO
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
+from app.infrastructure.helper.cursor_helper import decode_cursor, encode_cursor
+
+# keyword search scans and sorts, cap it and give the sort enough memory to stay off disk
+PROFILE = ExecutionProfile(statement_timeout=3000, lock_timeout=1000, work_mem='16MB', jit=False)
 
 
+@execution_profile(PROFILE)
 def execute(
     ctx: IContext,
     keyword: str | None,
     email: str | None,
     limit: int,
     offset: int,
+    count_mode: str = COUNT_EXACT,
+    cursor: str | None = None,
+    mode: str = SEARCH_SUBSTRING,
+    created_from: datetime.datetime | None = None,
+    created_to: datetime.datetime | None = None,
+    order_by: str = ORDER_ID,
 ) -> UserListDTO:
+    keyset = mode != SEARCH_FULLTEXT and order_by == ORDER_ID
+    position = _decode(ctx, cursor, keyset)
     users, total = user_repository.search(
         ctx.session,
         keyword=keyword,
         email=email,
         eager=True,
-        limit=limit,
-        offset=offset,
+        # one row more tells whether there is a next page
+        limit=limit + 1,
+        offset=offset if position is None else None,
+        count_mode=count_mode,
+        cursor=position,
+        mode=mode,
+        created_from=created_from,
+        created_to=created_to,
+        order_by=order_by,
+    )
+    return _page(users, total, limit, offset, position, keyset=keyset)
+
+
+@execution_profile(PROFILE)
+async def execute_async(
+    ctx: IAsyncContext,
+    keyword: str | None,
+    email: str | None,
+    limit: int,
+    offset: int,
+    count_mode: str = COUNT_EXACT,
+    cursor: str | None = None,
+    mode: str = SEARCH_SUBSTRING,
+    created_from: datetime.datetime | None = None,
+    created_to: datetime.datetime | None = None,
+    order_by: str = ORDER_ID,
+) -> UserListDTO:
+    keyset = mode != SEARCH_FULLTEXT and order_by == ORDER_ID
+    position = _decode(ctx, cursor, keyset)
+    users, total = await async_user_repository.search(
+        ctx.session,
+        keyword=keyword,
+        email=email,
+        eager=True,
+        limit=limit + 1,
+        offset=offset if position is None else None,
+        count_mode=count_mode,
+        cursor=position,
+        mode=mode,
+        created_from=created_from,
+        created_to=created_to,
+        order_by=order_by,
     )
-    return UserListDTO(results=users, count=total)
+    return _page(users, total, limit, offset, position, keyset=keyset)
+
+
+def _decode(ctx: IContext | IAsyncContext, cursor: str | None, keyset: bool) -> Cursor | None:
+    if cursor is None:
+        return None
+    if not keyset:
+        # cursors hold an id, ranked results or other orderings have no position to continue from in them
+        raise HTTPException(
+            HTTPStatus.BAD_REQUEST, ctx.t('Full-text search and orderings other than id page with offset, not cursors')
+        )
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, ctx.t('Invalid cursor'))
+
+
+def _page(
+    users: list[User], total: int | None, limit: int, offset: int, position: Cursor | None, keyset: bool
+) -> UserListDTO:
+    backward = position is not None and position.direction == PREV
+    has_more = len(users) > limit
+    # the extra row is the farthest from the cursor: the last one forwards, the first one backwards
+    if has_more:
+        users = users[1:] if backward else users[:limit]
+
+    next_cursor = prev_cursor = None
+    if users and keyset:
+        first, last = users[0], users[-1]
+        if has_more or backward:
+            next_cursor = encode_cursor(Cursor(NEXT, last.id))
+        if (has_more and backward) or (not backward and (position is not None or offset > 0)):
+            prev_cursor = encode_cursor(Cursor(PREV, first.id))
+
+    return UserListDTO(results=users, count=total, next_cursor=next_cursor, prev_cursor=prev_cursor)
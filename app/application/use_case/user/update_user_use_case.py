@@ -1,9 +1,13 @@
-from app.application.context import IContext
-from app.domain.repository import user_repository
+from app.application.context import IContext, IAsyncContext
+from app.domain.repository import user_repository, async_user_repository
 from app.application.service import user_service
 from app.application.dto.user_dto import UpdateUserDTO, UserDTO
+from app.infrastructure.db.execution_profile import ExecutionProfile, execution_profile
 
+PROFILE = ExecutionProfile(statement_timeout=2000, lock_timeout=1000, jit=False)
 
+
+@execution_profile(PROFILE)
 def execute(ctx: IContext, user_id: int, dto: UpdateUserDTO) -> UserDTO:
     user = user_service.read(ctx, user_id)
     update_data = dto.model_dump(exclude_unset=True)
@@ -11,3 +15,13 @@ def execute(ctx: IContext, user_id: int, dto: UpdateUserDTO) -> UserDTO:
         setattr(user, key, value)
     updated_user = user_repository.update(ctx.session, user)
     return UserDTO.model_validate(updated_user)
+
+
+@execution_profile(PROFILE)
+async def execute_async(ctx: IAsyncContext, user_id: int, dto: UpdateUserDTO) -> UserDTO:
+    user = await user_service.read_async(ctx, user_id)
+    update_data = dto.model_dump(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(user, key, value)
+    updated_user = await async_user_repository.update(ctx.session, user)
+    return UserDTO.model_validate(updated_user)
@@ -9,8 +9,11 @@ if TYPE_CHECKING:
 
 
 class AuditMixin:
+    # the timestamps are set by the database and read back with RETURNING as part of the INSERT/UPDATE
+    __mapper_args__ = {'eager_defaults': True}
+
     created_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now())
-    updated_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now(), server_onupdate=func.now())
+    updated_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
     created_user_id: Mapped[int | None] = mapped_column(ForeignKey('user.id'))
     updated_user_id: Mapped[int | None] = mapped_column(ForeignKey('user.id'))
 
@@ -1,13 +1,110 @@
-from sqlalchemy import ColumnElement, func
-from sqlalchemy.ext.hybrid import hybrid_property
+import datetime
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    ColumnExpressionArgument,
+    Computed,
+    Connection,
+    DateTime,
+    Index,
+    String,
+    Table,
+    column,
+    event,
+    func,
+    literal_column,
+    table,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, declared_attr, relationship
 
 from app.infrastructure.db.base import Base
 from app.domain.entity.mixin import AuditMixin
 
 
+def full_name_expression(
+    first_name: ColumnExpressionArgument[str | None], last_name: ColumnExpressionArgument[str | None]
+) -> ColumnElement[str]:
+    # immutable, unlike concat(), as a generated column needs; literals are inlined in the DDL
+    blank, space = literal_column("''", String), literal_column("' '", String)
+    return func.coalesce(first_name, blank).concat(space).concat(func.coalesce(last_name, blank))
+
+
+# full-text document of a user, names weighted above the email (split at '@' so both parts match);
+# PostgreSQL keeps it in the generated `search_vector` column, not mapped so the ORM never loads or writes it
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(first_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(last_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', replace(email, '@', ' ')), 'B')"
+)
+SEARCH_VECTOR = literal_column('"user".search_vector', TSVECTOR)
+
+# number of users on PostgreSQL, so an unfiltered total is a sum of a few rows: statement-level triggers append
+# each statement's change as a row of its own (`+n` inserted, `-n` deleted), so concurrent writers never wait on
+# one another; `USER_ROW_COUNT_COMPACT_SQL` folds the rows back into one, run periodically
+USER_ROW_COUNT = table('user_row_count', column('row_count', BigInteger))
+USER_ROW_COUNT_SQL = (
+    'CREATE TABLE user_row_count (row_count bigint NOT NULL)',
+    'INSERT INTO user_row_count SELECT count(*) FROM "user"',
+    """
+    CREATE FUNCTION user_row_count() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO user_row_count SELECT count(*) FROM changed_rows;
+        ELSIF TG_OP = 'DELETE' THEN
+            INSERT INTO user_row_count SELECT -count(*) FROM changed_rows;
+        ELSE
+            DELETE FROM user_row_count;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    'CREATE TRIGGER user_row_count_insert AFTER INSERT ON "user" REFERENCING NEW TABLE AS changed_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION user_row_count()',
+    'CREATE TRIGGER user_row_count_delete AFTER DELETE ON "user" REFERENCING OLD TABLE AS changed_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION user_row_count()',
+    'CREATE TRIGGER user_row_count_truncate AFTER TRUNCATE ON "user" '
+    'FOR EACH STATEMENT EXECUTE FUNCTION user_row_count()',
+)
+# rows committed since the statement started are left for the next run; concurrent runs each fold what they
+# deleted, rows already deleted by the other are skipped
+USER_ROW_COUNT_COMPACT_SQL = (
+    'WITH folded AS (DELETE FROM user_row_count RETURNING row_count) '
+    'INSERT INTO user_row_count SELECT coalesce(sum(row_count), 0) FROM folded'
+)
+
+
 class User(AuditMixin, Base):
     __tablename__ = 'user'
+    __table_args__ = (
+        # trigram indexes for substring search (`ILIKE '%keyword%'`) on PostgreSQL
+        Index(
+            'ix_user_email_trgm',
+            'email',
+            postgresql_using='gin',
+            postgresql_ops={'email': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_user_full_name_trgm',
+            'full_name',
+            postgresql_using='gin',
+            postgresql_ops={'full_name': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+        # ordering by name, ties by id, read in index order
+        Index('ix_user_full_name', 'full_name', 'id'),
+        # rows are appended in creation order, so a summary of each block range narrows a time window to a few
+        # ranges; new ranges are summarized as they fill up, not at the next vacuum
+        Index(
+            'ix_user_created_at_brin',
+            'created_at',
+            postgresql_using='brin',
+            postgresql_with={'autosummarize': 'on'},
+        ).ddl_if(dialect='postgresql'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     email: Mapped[str] = mapped_column(unique=True, index=True)
@@ -15,21 +112,50 @@ class User(AuditMixin, Base):
     first_name: Mapped[str | None]
     last_name: Mapped[str | None]
     phone: Mapped[str | None]
-
-    @hybrid_property
-    def full_name(self) -> str:
-        return f'{self.first_name} {self.last_name}'
-
-    @full_name.inplace.expression
-    @classmethod
-    def _full_name_expression(cls) -> ColumnElement[str]:
-        return func.concat(cls.first_name, ' ', cls.last_name)
+    # written behind the requests by `LastSeenTracker`, up to an interval late
+    last_seen_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+    # kept by the database, read back with RETURNING when the names are written
+    full_name: Mapped[str] = mapped_column(
+        String, Computed(full_name_expression(column('first_name'), column('last_name')), persisted=True)
+    )
 
     # relationships
     @declared_attr
     def created_user(self) -> Mapped['User | None']:
-        return relationship('User', remote_side=[self.id], foreign_keys=[self.created_user_id])
+        return relationship('User', remote_side='User.id', foreign_keys='User.created_user_id')
 
     @declared_attr
     def updated_user(self) -> Mapped['User | None']:
-        return relationship('User', remote_side=[self.id], foreign_keys=[self.updated_user_id])
+        return relationship('User', remote_side='User.id', foreign_keys='User.updated_user_id')
+
+
+@event.listens_for(User.__table__, 'before_create')
+def _create_trigram_extension(target: Table, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+
+
+@event.listens_for(User.__table__, 'after_create')
+def _create_search_vector(target: Table, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name == 'postgresql':
+        connection.execute(
+            text(
+                f'ALTER TABLE "user" ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED'
+            )
+        )
+        connection.execute(text('CREATE INDEX ix_user_search_vector ON "user" USING gin (search_vector)'))
+
+
+@event.listens_for(User.__table__, 'after_create')
+def _create_row_count(target: Table, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name == 'postgresql':
+        for statement in USER_ROW_COUNT_SQL:
+            connection.execute(text(statement))
+
+
+@event.listens_for(User.__table__, 'after_drop')
+def _drop_row_count(target: Table, connection: Connection, **kw: Any) -> None:
+    # the triggers went with the table
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text('DROP TABLE IF EXISTS user_row_count'))
+        connection.execute(text('DROP FUNCTION IF EXISTS user_row_count()'))
@@ -0,0 +1,23 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import JSON, BigInteger, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.db.base import Base
+
+
+class UserHistory(Base):
+    """One insert, update or delete of a user: `changes` maps each column to its `[old, new]` values."""
+
+    __tablename__ = 'user_history'
+    __table_args__ = (Index('ix_user_history_user_id_changed_at', 'user_id', 'changed_at'),)
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)
+    # no foreign key, the history of a user outlives it
+    user_id: Mapped[int]
+    operation: Mapped[str] = mapped_column(String(6))
+    changes: Mapped[dict[str, Any]] = mapped_column(JSON().with_variant(JSONB, 'postgresql'))
+    changed_user_id: Mapped[int | None]
+    changed_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
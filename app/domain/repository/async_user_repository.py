@@ -0,0 +1,229 @@
+import datetime
+from typing import Any, AsyncIterator, Collection, Mapping, Sequence
+
+import anyio
+from sqlalchemy import Row, delete as sql_delete, func, lambda_stmt, select
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app import user_cache, user_history
+from app.domain.entity.user import User
+from app.domain.repository.user_repository import (
+    COUNT_EXACT,
+    ORDER_ID,
+    READ_OPTIONS,
+    SEARCH_SUBSTRING,
+    TOTAL_PLAN,
+    TOTAL_WINDOW,
+    audit_rows,
+    bulk_insert_statement,
+    bulk_update_statements,
+    created_changes,
+    current_values_statement,
+    explain_statement,
+    export_statement,
+    page_results,
+    plan_rows,
+    record_history,
+    search_statement,
+    total_source,
+    total_statement,
+    updated_changes,
+)
+from app.infrastructure.db.audit_history import DELETE, INSERT, UPDATE
+from app.domain.value_object.pagination_value_object import Cursor
+
+# whole audit users but the password hash, so the entity cache can keep them
+EAGER_OPTIONS = (
+    joinedload(User.created_user).defer(User.password),
+    joinedload(User.updated_user).defer(User.password),
+)
+
+
+async def search(
+    session: AsyncSession,
+    keyword: str | None = None,
+    email: str | None = None,
+    eager: bool = False,
+    limit: int | None = None,
+    offset: int | None = None,
+    count_mode: str = COUNT_EXACT,
+    cursor: Cursor | None = None,
+    mode: str = SEARCH_SUBSTRING,
+    created_from: datetime.datetime | None = None,
+    created_to: datetime.datetime | None = None,
+    order_by: str = ORDER_ID,
+) -> tuple[list[User], int | None]:
+    bind = session.get_bind()
+    filtered = any(value is not None for value in (keyword, email, created_from, created_to))
+    source = total_source(bind, count_mode, filtered=filtered, cursor=cursor)
+    stmt, filters = search_statement(
+        bind,
+        keyword,
+        email,
+        eager,
+        limit,
+        offset,
+        source == TOTAL_WINDOW,
+        cursor,
+        mode,
+        created_from=created_from,
+        created_to=created_to,
+        order_by=order_by,
+    )
+
+    rows = (await session.execute(stmt)).all()
+    results = page_results(rows, cursor)
+    if source is None:
+        return results, None
+
+    if source == TOTAL_PLAN:
+        connection = await session.connection(bind_arguments={'clause': select(User.id)})
+        count = plan_rows((await connection.exec_driver_sql(*explain_statement(bind, filters))).scalar())
+    elif source != TOTAL_WINDOW:
+        count = await session.scalar(total_statement(source, filters)) or 0
+    elif rows:
+        count = rows[0][1]
+    elif offset:
+        # no row to carry the total past the last page
+        count = await session.scalar(select(func.count(User.id)).where(*filters)) or 0
+    else:
+        count = 0
+
+    return results, count
+
+
+async def stream(
+    session: AsyncSession, keyword: str | None = None, email: str | None = None, batch_size: int = 1000
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    result = await session.stream(export_statement(keyword, email, batch_size))
+    async for partition in result.partitions():
+        yield partition
+
+
+async def find_by_id(session: AsyncSession, user_id: int, eager: bool = False) -> User | None:
+    user = await _load_cached(session, user_id)
+    if user is not None and eager and not await _load_cached_refs(session, user):
+        user = None
+    if user is not None:
+        if eager and not user_cache.is_loaded(user, 'last_seen_at'):
+            # not cached, and not lazy loaded under asyncio: serialized users read it from the database
+            await session.refresh(user, ['last_seen_at'])
+        return user
+
+    # relationships can't be lazy loaded under asyncio, so callers serializing them must ask for eager loading;
+    # a user already in the session is loaded again for them, `get()` would return it as is
+    user = await session.get(
+        User,
+        user_id,
+        options=(*READ_OPTIONS, *EAGER_OPTIONS) if eager else READ_OPTIONS,
+        populate_existing=eager,
+    )
+    if user is not None:
+        await _store_cached(session, user)
+    if user is not None and eager:
+        for ref in (user.created_user, user.updated_user):
+            if ref is not None:
+                await _store_cached(session, ref)
+    return user
+
+
+async def _load_cached(session: AsyncSession, user_id: int) -> User | None:
+    user = user_cache.identity(session.sync_session, user_id)
+    if user is not None:
+        return user
+    row = user_cache.get(user_id, remote=False)
+    if row is None and user_cache.remote is not None:
+        row = await anyio.to_thread.run_sync(user_cache.get, user_id)
+    return user_cache.attach(session.sync_session, row) if row is not None else None
+
+
+async def _load_cached_refs(session: AsyncSession, user: User) -> bool:
+    refs = {}
+    for key, ref_id in (('created_user', user.created_user_id), ('updated_user', user.updated_user_id)):
+        if user_cache.is_loaded(user, key):
+            continue
+        refs[key] = await _load_cached(session, ref_id) if ref_id is not None else None
+        if ref_id is not None and refs[key] is None:
+            return False
+    for key, ref in refs.items():
+        user_cache.set_loaded(user, key, ref)
+    return True
+
+
+async def _store_cached(session: AsyncSession, user: User) -> None:
+    row = user_cache.store(session.sync_session, user, remote=False)
+    if row is not None and user_cache.remote is not None:
+        await anyio.to_thread.run_sync(user_cache.set_remote, user.id, row)
+
+
+async def find_by_email(session: AsyncSession, email: str) -> User | None:
+    return (await session.scalars(lambda_stmt(lambda: select(User).where(User.email == email)))).first()
+
+
+async def _load_refs(session: AsyncSession, user: User) -> User:
+    # relationships can't be lazy loaded under asyncio: the audit users, usually the authenticated user, are taken
+    # from the session or the cache, and only queried when missing
+    if await _load_cached_refs(session, user):
+        return user
+    stmt = select(User).where(User.id == user.id).options(*EAGER_OPTIONS).execution_options(populate_existing=True)
+    return (await session.scalars(stmt)).one()
+
+
+async def create(session: AsyncSession, user: User) -> User:
+    user.created_user_id = session.info.get('uid')
+    user.updated_user_id = session.info.get('uid')
+
+    session.add(user)
+    await session.flush([user])
+    return await _load_refs(session, user)
+
+
+async def update(session: AsyncSession, user: User) -> User:
+    user.updated_user_id = session.info.get('uid')
+
+    await session.flush([user])
+    # the relationship still holds the previous user
+    session.expire(user, ['updated_user'])
+    return await _load_refs(session, user)
+
+
+async def delete(session: AsyncSession, user: User) -> None:
+    await session.delete(user)
+    await session.flush()
+
+
+async def find_existing_emails(session: AsyncSession, emails: Collection[str]) -> set[str]:
+    return set(await session.scalars(lambda_stmt(lambda: select(User.email).where(User.email.in_(emails)))))
+
+
+async def find_existing_ids(session: AsyncSession, user_ids: Collection[int]) -> set[int]:
+    return set(await session.scalars(lambda_stmt(lambda: select(User.id).where(User.id.in_(user_ids)))))
+
+
+async def bulk_create(session: AsyncSession, rows: list[dict[str, Any]]) -> dict[str, int]:
+    if not rows:
+        return {}
+    stmt = bulk_insert_statement(session.get_bind()).returning(User.id, User.email)
+    result = await session.execute(stmt, audit_rows(rows, session.info.get('uid')))
+    ids = {email: user_id for user_id, email in result}
+    record_history(session.sync_session, INSERT, created_changes(rows, ids))
+    return ids
+
+
+async def bulk_update(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    current: dict[int, Mapping[str, Any]] = {}
+    if user_history.enabled and rows:
+        current = {row['id']: dict(row) for row in (await session.execute(current_values_statement(rows))).mappings()}
+    for stmt, params in bulk_update_statements(session.get_bind(), rows, session.info.get('uid')):
+        await session.execute(stmt, params)
+    record_history(session.sync_session, UPDATE, updated_changes(rows, current))
+
+
+async def bulk_delete(session: AsyncSession, user_ids: Collection[int]) -> list[int]:
+    if not user_ids:
+        return []
+    deleted = list(await session.scalars(sql_delete(User).where(User.id.in_(user_ids)).returning(User.id)))
+    record_history(session.sync_session, DELETE, ((user_id, None, None) for user_id in deleted))
+    return deleted
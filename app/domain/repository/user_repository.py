@@ -1,8 +1,79 @@
-from sqlalchemy import or_
+import datetime
+from typing import Any, Collection, Iterable, Iterator, Mapping, Sequence
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    Engine,
+    Executable,
+    Insert,
+    Row,
+    Select,
+    Update,
+    column,
+    delete as sql_delete,
+    func,
+    insert,
+    lambda_stmt,
+    literal_column,
+    or_,
+    select,
+    text,
+    update as sql_update,
+    values,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 
-from app.domain.entity.user import User
+from sqlalchemy.orm import Session, defer, joinedload
+
+from app import user_cache, user_history
+from app.domain.entity.user import SEARCH_VECTOR, USER_ROW_COUNT, User
+from app.domain.value_object.pagination_value_object import PREV, Cursor
+from app.infrastructure.db.audit_history import DELETE, INSERT, UPDATE
+
+LIKE_ESCAPE = '\\'
+
+# keyword search modes
+SEARCH_SUBSTRING = 'substring'
+SEARCH_FULLTEXT = 'fulltext'
+
+# search orderings, descending with a leading '-'; ties are broken by id in the same direction
+ORDER_ID = 'id'
+ORDER_COLUMNS = {'id': User.id, 'created_at': User.created_at, 'full_name': User.full_name}
+
+# search totals: counted, estimated by PostgreSQL, or left out
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+
+# where a total comes from, see `total_source()`
+TOTAL_WINDOW = 'window'
+TOTAL_ROW_COUNT = 'row_count'
+TOTAL_RELTUPLES = 'reltuples'
+TOTAL_PLAN = 'plan'
+TOTAL_COUNT = 'count'
+
+# the table size of the last VACUUM/ANALYZE, -1 before the first one
+RELTUPLES_STATEMENT = text(
+    'SELECT CASE WHEN reltuples >= 0 THEN reltuples::bigint '
+    'ELSE (SELECT coalesce(sum(row_count), 0) FROM user_row_count) END '
+    """FROM pg_class WHERE oid = '"user"'::regclass"""
+)
+
+# bind parameters PostgreSQL takes in one statement
+MAX_BIND_PARAMETERS = 65535
+
+# read paths never load the password hash
+READ_OPTIONS = (defer(User.password),)
+
+# list pages only serialize the id, email and name of the audit users (`SimpleUserDTO`)
+AUDIT_USER_COLUMNS = (User.id, User.email, User.full_name)
+SEARCH_EAGER_OPTIONS = (
+    joinedload(User.created_user).load_only(*AUDIT_USER_COLUMNS),
+    joinedload(User.updated_user).load_only(*AUDIT_USER_COLUMNS),
+)
+
+EXPORT_COLUMNS = (User.id, User.email, User.first_name, User.last_name, User.phone, User.created_at, User.updated_at)
 
 
 def search(
@@ -12,47 +83,260 @@ def search(
     eager: bool = False,
     limit: int | None = None,
     offset: int | None = None,
-) -> tuple[list[User], int]:
-    query = session.query(User)
+    count_mode: str = COUNT_EXACT,
+    cursor: Cursor | None = None,
+    mode: str = SEARCH_SUBSTRING,
+    created_from: datetime.datetime | None = None,
+    created_to: datetime.datetime | None = None,
+    order_by: str = ORDER_ID,
+) -> tuple[list[User], int | None]:
+    bind = session.get_bind()
+    filtered = any(value is not None for value in (keyword, email, created_from, created_to))
+    source = total_source(bind, count_mode, filtered=filtered, cursor=cursor)
+    stmt, filters = search_statement(
+        bind,
+        keyword,
+        email,
+        eager,
+        limit,
+        offset,
+        source == TOTAL_WINDOW,
+        cursor,
+        mode,
+        created_from=created_from,
+        created_to=created_to,
+        order_by=order_by,
+    )
+
+    rows = session.execute(stmt).all()
+    results = page_results(rows, cursor)
+    if source is None:
+        return results, None
+
+    if source == TOTAL_PLAN:
+        # routed as the read it plans: on the page's replica, under the request's `statement_timeout`
+        connection = session.connection(bind_arguments={'clause': select(User.id)})
+        count = plan_rows(connection.exec_driver_sql(*explain_statement(bind, filters)).scalar())
+    elif source != TOTAL_WINDOW:
+        count = session.scalar(total_statement(source, filters)) or 0
+    elif rows:
+        count = rows[0][1]
+    elif offset:
+        # no row to carry the total past the last page
+        count = session.scalar(select(func.count(User.id)).where(*filters)) or 0
+    else:
+        count = 0
+
+    return results, count
+
+
+def total_source(bind: Engine | Connection, count_mode: str, filtered: bool, cursor: Cursor | None) -> str | None:
+    """
+    Where `search()` takes the total from, `None` when there is none.
+
+    Exact totals of filtered searches are a window count over the page query, or past a cursor, which the window
+    would only count from, a `COUNT(*)` of their own; unfiltered ones on PostgreSQL the trigger-kept
+    `user_row_count`. Estimates are the planner's row estimate of the filters, or the table size in `pg_class`
+    without filters. Elsewhere estimates are exact.
+    """
+
+    if count_mode == COUNT_NONE:
+        return None
+    if bind.dialect.name == 'postgresql':
+        if not filtered:
+            return TOTAL_ROW_COUNT if count_mode == COUNT_EXACT else TOTAL_RELTUPLES
+        if count_mode == COUNT_ESTIMATE:
+            return TOTAL_PLAN
+    return TOTAL_WINDOW if cursor is None else TOTAL_COUNT
+
+
+def total_statement(source: str, filters: Iterable[ColumnElement[bool]] = ()) -> Executable:
+    if source == TOTAL_RELTUPLES:
+        return RELTUPLES_STATEMENT
+    if source == TOTAL_COUNT:
+        return select(func.count(User.id)).where(*filters)
+    return select(func.coalesce(func.sum(USER_ROW_COUNT.c.row_count), 0))
+
+
+def explain_statement(bind: Engine | Connection, filters: list[ColumnElement[bool]]) -> tuple[str, dict[str, Any]]:
+    # EXPLAIN plans the query without running it; it is sent with its parameters as the driver takes them
+    compiled = select(User.id).where(*filters).compile(bind)
+    return f'EXPLAIN (FORMAT JSON) {compiled}', dict(compiled.params)
+
+
+def plan_rows(plan: Any) -> int:
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def stream(
+    session: Session, keyword: str | None = None, email: str | None = None, batch_size: int = 1000
+) -> Iterator[Sequence[Row[Any]]]:
+    """Batches of `EXPORT_COLUMNS` of the matching users by id, fetched from a server-side cursor."""
+
+    yield from session.execute(export_statement(keyword, email, batch_size)).partitions()
+
+
+def export_statement(keyword: str | None, email: str | None, batch_size: int) -> Select[Any]:
+    # plain rows, not entities: nothing accumulates in the identity map however many users are read
+    return (
+        select(*EXPORT_COLUMNS)
+        .where(*search_filters(keyword=keyword, email=email))
+        .order_by(User.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+def search_statement(
+    bind: Engine | Connection,
+    keyword: str | None,
+    email: str | None,
+    eager: bool,
+    limit: int | None,
+    offset: int | None,
+    window_count: bool,
+    cursor: Cursor | None,
+    mode: str,
+    created_from: datetime.datetime | None = None,
+    created_to: datetime.datetime | None = None,
+    order_by: str = ORDER_ID,
+) -> tuple[Select[Any], list[ColumnElement[bool]]]:
+    """Statement of a `search()` page, and its filters. Rows are a user, then the total with `window_count`."""
+
+    stmt = select(User).options(*READ_OPTIONS)
+    fulltext = uses_fulltext(bind, mode, keyword)
+
+    # total of the filtered rows, computed before LIMIT/OFFSET and returned with every row
+    if window_count:
+        stmt = stmt.add_columns(func.count().over())
 
     # eager loading
     if eager:
-        query = query.options(
-            joinedload(User.created_user),
-            joinedload(User.updated_user),
-        )
+        stmt = stmt.options(*SEARCH_EAGER_OPTIONS)
 
     # filter
-    filters = []
-    if keyword is not None:
+    filters = search_filters(
+        keyword=keyword, email=email, fulltext=fulltext, created_from=created_from, created_to=created_to
+    )
+    stmt = stmt.where(*filters, *keyset_filters(cursor))
+
+    # ordering: by id unless asked otherwise, best matches first in full-text mode
+    if order_by != ORDER_ID:
+        stmt = stmt.order_by(*column_order(order_by))
+    else:
+        if fulltext and keyword is not None:
+            stmt = stmt.order_by(*rank_order(keyword))
+        stmt = stmt.order_by(*sort_order(cursor))
+
+    # pagination
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    if offset is not None:
+        stmt = stmt.offset(offset)
+
+    return stmt, filters
+
+
+def page_results(rows: Sequence[Row[Any]], cursor: Cursor | None) -> list[User]:
+    results = [row[0] for row in rows]
+    if cursor is not None and cursor.direction == PREV:
+        results.reverse()
+    return results
+
+
+def search_filters(
+    keyword: str | None = None,
+    email: str | None = None,
+    fulltext: bool = False,
+    created_from: datetime.datetime | None = None,
+    created_to: datetime.datetime | None = None,
+) -> list[ColumnElement[bool]]:
+    filters: list[ColumnElement[bool]] = []
+    if keyword is not None and fulltext:
+        filters.append(SEARCH_VECTOR.bool_op('@@')(fulltext_query(keyword)))
+    elif keyword is not None:
+        # `ILIKE '%keyword%'` on PostgreSQL, served by the trigram indexes; `icontains()` would wrap the column in
+        # lower() and miss them
         filters.append(
             or_(
-                User.email.icontains(keyword),
-                User.full_name.icontains(keyword),
+                User.email.ilike(contains_pattern(keyword), escape=LIKE_ESCAPE),
+                User.full_name.ilike(contains_pattern(keyword), escape=LIKE_ESCAPE),
             )
         )
     if email is not None:
-        filters.append(User.email.icontains(email))
-    query = query.filter(*filters)
+        filters.append(User.email.ilike(contains_pattern(email), escape=LIKE_ESCAPE))
+    # a half-open range, served by the BRIN index on PostgreSQL
+    if created_from is not None:
+        filters.append(User.created_at >= created_from)
+    if created_to is not None:
+        filters.append(User.created_at < created_to)
+    return filters
 
-    # pagination
-    if limit is not None:
-        query = query.limit(limit)
-    if offset is not None:
-        query = query.offset(offset)
 
-    results = query.all()
-    count = query.count()
+def uses_fulltext(bind: Engine | Connection, mode: str, keyword: str | None) -> bool:
+    # the search vector only exists on PostgreSQL, elsewhere full-text mode falls back to substring search
+    return mode == SEARCH_FULLTEXT and keyword is not None and bind.dialect.name == 'postgresql'
 
-    return results, count
+
+def fulltext_query(keyword: str) -> ColumnElement[Any]:
+    # every word must match, "quoted phrases" and -exclusions are understood
+    return func.websearch_to_tsquery(literal_column("'simple'::regconfig"), keyword)
+
+
+def rank_order(keyword: str) -> list[ColumnElement[Any]]:
+    return [func.ts_rank(SEARCH_VECTOR, fulltext_query(keyword)).desc()]
+
+
+def contains_pattern(value: str) -> str:
+    escaped = (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace('%', f'{LIKE_ESCAPE}%').replace('_', f'{LIKE_ESCAPE}_')
+    )
+    return f'%{escaped}%'
+
+
+def keyset_filters(cursor: Cursor | None) -> list[ColumnElement[bool]]:
+    # ids follow insertion order and the primary key index serves the range scan, whatever the page depth
+    if cursor is None:
+        return []
+    return [User.id < cursor.id if cursor.direction == PREV else User.id > cursor.id]
+
+
+def column_order(order_by: str) -> list[ColumnElement[Any]]:
+    column = ORDER_COLUMNS[order_by.removeprefix('-')]
+    descending = order_by.startswith('-')
+    order: list[ColumnElement[Any]] = [column.desc() if descending else column.asc()]
+    if column is not User.id:
+        order.append(User.id.desc() if descending else User.id.asc())
+    return order
+
+
+def sort_order(cursor: Cursor | None) -> list[ColumnElement[Any]]:
+    # reading backwards from a cursor, the nearest rows come first; callers restore the order
+    if cursor is not None and cursor.direction == PREV:
+        return [User.id.desc()]
+    return [User.id.asc()]
 
 
-def find_by_id(session: Session, user_id: int) -> User | None:
-    return session.query(User).filter(User.id == user_id).first()
+def find_by_id(session: Session, user_id: int, eager: bool = False) -> User | None:
+    user = user_cache.load(session, user_id)
+    if user is None:
+        user = session.get(User, user_id, options=READ_OPTIONS)
+        if user is not None:
+            user_cache.store(session, user)
+
+    # eager loading: the audit users are looked up the same way and set as if they were joined
+    if user is not None and eager:
+        for key, ref_id in (('created_user', user.created_user_id), ('updated_user', user.updated_user_id)):
+            if not user_cache.is_loaded(user, key):
+                user_cache.set_loaded(user, key, find_by_id(session, ref_id) if ref_id is not None else None)
+        # not cached; loaded on its own, a lazy load would also read every other expired column, the password hash
+        if not user_cache.is_loaded(user, 'last_seen_at'):
+            session.refresh(user, ['last_seen_at'])
+
+    return user
 
 
 def find_by_email(session: Session, email: str) -> User | None:
-    return session.query(User).filter(User.email == email).first()
+    return session.scalars(lambda_stmt(lambda: select(User).where(User.email == email))).first()
 
 
 def create(session: Session, user: User) -> User:
@@ -61,7 +345,6 @@ def create(session: Session, user: User) -> User:
 
     session.add(user)
     session.flush([user])
-    session.refresh(user)
 
     return user
 
@@ -70,7 +353,8 @@ def update(session: Session, user: User) -> User:
     user.updated_user_id = session.info.get('uid')
 
     session.flush([user])
-    session.refresh(user)
+    # the relationship still holds the previous user, it reloads from the new id (usually from the session)
+    session.expire(user, ['updated_user'])
 
     return user
 
@@ -78,3 +362,129 @@ def update(session: Session, user: User) -> User:
 def delete(session: Session, user: User) -> None:
     session.delete(user)
     session.flush()
+
+
+def find_existing_emails(session: Session, emails: Collection[str]) -> set[str]:
+    return set(session.scalars(lambda_stmt(lambda: select(User.email).where(User.email.in_(emails)))))
+
+
+def find_existing_ids(session: Session, user_ids: Collection[int]) -> set[int]:
+    return set(session.scalars(lambda_stmt(lambda: select(User.id).where(User.id.in_(user_ids)))))
+
+
+def bulk_create(session: Session, rows: list[dict[str, Any]]) -> dict[str, int]:
+    """Insert `rows` in multi-row statements. Returns the id of each inserted email; taken emails are skipped."""
+
+    if not rows:
+        return {}
+    stmt = bulk_insert_statement(session.get_bind()).returning(User.id, User.email)
+    result = session.execute(stmt, audit_rows(rows, session.info.get('uid')))
+    ids = {email: user_id for user_id, email in result}
+    record_history(session, INSERT, created_changes(rows, ids))
+    return ids
+
+
+def bulk_update(session: Session, rows: list[dict[str, Any]]) -> None:
+    """Update each of `rows`, an `id` with the columns to set."""
+
+    current: dict[int, Mapping[str, Any]] = {}
+    if user_history.enabled and rows:
+        current = {row['id']: dict(row) for row in session.execute(current_values_statement(rows)).mappings()}
+    for stmt, params in bulk_update_statements(session.get_bind(), rows, session.info.get('uid')):
+        session.execute(stmt, params)
+    record_history(session, UPDATE, updated_changes(rows, current))
+
+
+def bulk_delete(session: Session, user_ids: Collection[int]) -> list[int]:
+    """Delete the users of `user_ids` in one statement. Returns the ids that existed."""
+
+    if not user_ids:
+        return []
+    deleted = list(session.scalars(sql_delete(User).where(User.id.in_(user_ids)).returning(User.id)))
+    record_history(session, DELETE, ((user_id, None, None) for user_id in deleted))
+    return deleted
+
+
+Change = tuple[int, Mapping[str, Any] | None, Mapping[str, Any] | None]
+
+
+def record_history(session: Session, operation: str, changes: Iterable[Change]) -> None:
+    # bulk statements bypass the unit of work, so the flush never sees their changes
+    for user_id, new, old in changes:
+        user_history.record(session, user_id, operation, new=new, old=old)
+
+
+def created_changes(rows: list[dict[str, Any]], ids: dict[str, int]) -> list[Change]:
+    # the first row of each inserted email, the others were skipped
+    ids = dict(ids)
+    return [(ids.pop(row['email']), row, None) for row in rows if row['email'] in ids]
+
+
+def current_values_statement(rows: list[dict[str, Any]]) -> Select[Any]:
+    # the values the update replaces, locked until it commits so they are still the old ones when it runs
+    table = User.__table__
+    keys = sorted({key for row in rows for key in row if key != 'id'})
+    return (
+        select(table.c.id, *(table.c[key] for key in keys))
+        .where(table.c.id.in_([row['id'] for row in rows]))
+        .with_for_update()
+    )
+
+
+def updated_changes(rows: list[dict[str, Any]], current: Mapping[int, Mapping[str, Any]]) -> list[Change]:
+    """The columns of each row that `current` (`current_values_statement()`) doesn't hold already, new and old."""
+
+    changes: list[Change] = []
+    for row in rows:
+        old = current.get(row['id'], {})
+        new = {key: value for key, value in row.items() if key != 'id' and old.get(key) != value}
+        changes.append((row['id'], new, {key: old.get(key) for key in new}))
+    return changes
+
+
+def audit_rows(rows: list[dict[str, Any]], uid: int | None) -> list[dict[str, Any]]:
+    return [{**row, 'created_user_id': uid, 'updated_user_id': uid} for row in rows]
+
+
+def bulk_insert_statement(bind: Engine | Connection) -> Insert:
+    # `INSERT ... ON CONFLICT (email) DO NOTHING`: an email taken since it was checked is left out of the
+    # RETURNING rows instead of failing the whole batch; rows are sent as multi-row VALUES pages (insertmanyvalues)
+    if bind.dialect.name == 'postgresql':
+        return postgresql.insert(User).on_conflict_do_nothing(index_elements=[User.email])
+    if bind.dialect.name == 'sqlite':
+        return sqlite.insert(User).on_conflict_do_nothing(index_elements=[User.email])
+    return insert(User)
+
+
+def bulk_update_statements(
+    bind: Engine | Connection, rows: list[dict[str, Any]], uid: int | None
+) -> list[tuple[Update, list[dict[str, Any]] | None]]:
+    """Statements updating `rows`, with their parameters: one per set of changed columns."""
+
+    groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(key for key in row if key != 'id')), []).append(row)
+
+    statements: list[tuple[Update, list[dict[str, Any]] | None]] = []
+    for keys, group in groups.items():
+        if bind.dialect.name != 'postgresql':
+            # ORM bulk UPDATE by primary key: one executemany of `UPDATE ... WHERE id = ?`
+            statements.append((sql_update(User), [{**row, 'updated_user_id': uid} for row in group]))
+            continue
+        # `UPDATE "user" SET ... FROM (VALUES ...) AS data WHERE "user".id = data.id`, one statement per page of
+        # rows: each row binds a parameter per column, `updated_user_id` one more
+        table = User.__table__
+        page_size = (MAX_BIND_PARAMETERS - 1) // (len(keys) + 1)
+        for start in range(0, len(group), page_size):
+            data = values(
+                *(column(key, table.c[key].type) for key in ('id', *keys)),
+                name='data',
+            ).data([tuple(row[key] for key in ('id', *keys)) for row in group[start : start + page_size]])
+            stmt = (
+                sql_update(User)
+                .where(User.id == data.c.id)
+                .values({**{key: data.c[key] for key in keys}, 'updated_user_id': uid})
+                .execution_options(synchronize_session=False)
+            )
+            statements.append((stmt, None))
+    return statements
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+# keyset pagination directions, from the row of the cursor
+NEXT = 'next'
+PREV = 'prev'
+
+
+@dataclass(frozen=True)
+class Cursor:
+    direction: str
+    id: int
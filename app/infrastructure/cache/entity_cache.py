@@ -0,0 +1,207 @@
+import datetime
+import threading
+from typing import Any, Generic, Iterable, TypeVar
+
+import msgspec
+from sqlalchemy import event
+from sqlalchemy.orm import (
+    InstanceState,
+    ORMExecuteState,
+    Session,
+    UOWTransaction,
+    class_mapper,
+    make_transient_to_detached,
+)
+from sqlalchemy.orm.attributes import instance_state
+
+from app.infrastructure.cache.lru_cache import LRUCache
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.db.routing_session import reads_replica
+
+T = TypeVar('T')
+
+# session.info value invalidating the whole cache on commit, after bulk UPDATE/DELETE statements
+_ALL = 'all'
+
+
+class EntityCache(Generic[T]):
+    """
+    Second-level cache of one entity's column values, keyed by primary key.
+
+    Rows live in an in-process LRU, optionally backed by a shared Redis tier. `load()` attaches a cached row
+    to the session as a persistent instance without a query; columns in `exclude` are never cached and load
+    from the database on first access.
+
+    Changed and deleted rows are collected at flush and evicted after commit. Other processes only drop their
+    in-process copy when its TTL expires. Only rows read from the primary are stored.
+    """
+
+    def __init__(
+        self,
+        entity: type[T],
+        local: LRUCache,
+        remote: RedisCache | None = None,
+        exclude: Iterable[str] = (),
+    ) -> None:
+        self.entity = entity
+        self.local = local
+        self.remote = remote
+        mapper = class_mapper(entity)
+        self.columns = [attr.key for attr in mapper.column_attrs if attr.key not in set(exclude)]
+        self._datetime_columns = {
+            attr.key
+            for attr in mapper.column_attrs
+            if attr.key in self.columns and attr.columns[0].type.python_type is datetime.datetime
+        }
+        self._pending_key = f'{mapper.class_.__name__.lower()}_cache_invalidate'
+        self._counters = dict.fromkeys(('hits', 'remote_hits', 'misses', 'invalidations'), 0)
+        self._lock = threading.Lock()
+
+    def register(self) -> None:
+        event.listen(Session, 'after_flush', self._collect_changes)
+        event.listen(Session, 'do_orm_execute', self._collect_bulk_changes)
+        event.listen(Session, 'after_commit', self._invalidate_pending)
+        event.listen(Session, 'after_rollback', self._discard_pending)
+
+    def get(self, key: Any, remote: bool = True) -> dict[str, Any] | None:
+        """Cached row of `key`. With `remote=False`, a local miss is not looked up (nor counted) in Redis."""
+
+        row = self.local.get(key)
+        if row is not None:
+            self._count('hits')
+            return row
+        if self.remote is not None and not remote:
+            return None
+        if self.remote is not None:
+            data = self.remote.get(key)
+            if data is not None:
+                row = self._decode(data)
+                self.local.set(key, row)
+                self._count('remote_hits')
+                return row
+        self._count('misses')
+        return None
+
+    def set(self, key: Any, row: dict[str, Any], remote: bool = True) -> None:
+        self.local.set(key, row)
+        if remote:
+            self.set_remote(key, row)
+
+    def set_remote(self, key: Any, row: dict[str, Any]) -> None:
+        if self.remote is not None:
+            self.remote.set(key, msgspec.json.encode(row))
+
+    def load(self, session: Session, key: Any) -> T | None:
+        instance = self.identity(session, key)
+        if instance is not None:
+            return instance
+        row = self.get(key)
+        return self.attach(session, row) if row is not None else None
+
+    def identity(self, session: Session, key: Any) -> T | None:
+        instance = session.identity_map.get(Session.identity_key(self.entity, key))
+        return instance if isinstance(instance, self.entity) else None
+
+    def attach(self, session: Session, row: dict[str, Any]) -> T:
+        """Add `row` to the session as a clean persistent instance, as if it was just loaded."""
+
+        instance = self.entity(**row)
+        make_transient_to_detached(instance)
+        session.add(instance)
+        return instance
+
+    def can_store(self, session: Session) -> bool:
+        # rows read after this transaction wrote may not be committed yet, rows read from a lagging replica may
+        # predate a committed write whose invalidation already ran
+        return self._pending_key not in session.info and not reads_replica(session)
+
+    def is_loaded(self, instance: T, key: str) -> bool:
+        return key in self._state(instance).dict
+
+    def set_loaded(self, instance: T, key: str, value: Any) -> None:
+        """Set `key` as if it was loaded with `instance`, without marking it changed."""
+
+        # no history is recorded when the value is placed in the instance dict directly
+        self._state(instance).dict[key] = value
+
+    def row(self, instance: T) -> dict[str, Any]:
+        loaded = self._state(instance).dict
+        return {key: loaded[key] for key in self.columns if key in loaded}
+
+    def store(self, session: Session, instance: T, remote: bool = True) -> dict[str, Any] | None:
+        """Cache the columns of `instance`, unless some weren't loaded or may differ from the committed row."""
+
+        state = self._state(instance)
+        if state.identity is None or state.modified or not self.can_store(session):
+            return None
+        row = self.row(instance)
+        # a partial row would lazy load the rest on every hit
+        if len(row) < len(self.columns):
+            return None
+        self.set(state.identity[0], row, remote)
+        return row
+
+    def invalidate(self, keys: Iterable[Any]) -> None:
+        keys = list(keys)
+        for key in keys:
+            self.local.delete(key)
+        if self.remote is not None:
+            self.remote.delete(keys)
+        self._count('invalidations', len(keys))
+
+    def clear(self) -> None:
+        self.local.clear()
+        if self.remote is not None:
+            self.remote.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['remote_hits'] + counters['misses']
+        return {
+            **counters,
+            'hit_ratio': round((counters['hits'] + counters['remote_hits']) / lookups, 4) if lookups else 0.0,
+            'size': len(self.local),
+            'evictions': self.local.evictions,
+            'remote_errors': self.remote.errors if self.remote is not None else 0,
+        }
+
+    def _collect_changes(self, session: Session, flush_context: UOWTransaction) -> None:
+        keys = {
+            state.identity[0]
+            for state in map(instance_state, (*session.dirty, *session.deleted))
+            if isinstance(state.obj(), self.entity) and state.identity is not None
+        }
+        pending = session.info.setdefault(self._pending_key, set())
+        if keys and pending != _ALL:
+            pending.update(keys)
+
+    def _collect_bulk_changes(self, orm_execute_state: ORMExecuteState) -> None:
+        if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        if any(mapper.class_ is self.entity for mapper in orm_execute_state.all_mappers):
+            orm_execute_state.session.info[self._pending_key] = _ALL
+
+    def _invalidate_pending(self, session: Session) -> None:
+        pending = session.info.pop(self._pending_key, None)
+        if pending == _ALL:
+            self.clear()
+        elif pending:
+            self.invalidate(pending)
+
+    def _discard_pending(self, session: Session) -> None:
+        session.info.pop(self._pending_key, None)
+
+    def _state(self, instance: T) -> InstanceState[T]:
+        return instance_state(instance)
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _decode(self, data: bytes) -> dict[str, Any]:
+        row: dict[str, Any] = msgspec.json.decode(data)
+        for key in self._datetime_columns:
+            if isinstance(row.get(key), str):
+                row[key] = datetime.datetime.fromisoformat(row[key])
+        return row
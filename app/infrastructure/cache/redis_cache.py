@@ -0,0 +1,56 @@
+import logging
+from typing import Iterable
+
+from redis import Redis, RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCache:
+    """
+    Shared cache tier in Redis. Errors are logged and treated as misses, the database stays the source of truth.
+    """
+
+    def __init__(self, client: Redis, prefix: str, ttl: float) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.errors = 0
+
+    def get(self, key: object) -> bytes | None:
+        try:
+            value = self.client.get(self._key(key))
+        except RedisError as exc:
+            self._log_error('get', exc)
+            return None
+        return value if isinstance(value, bytes) else None
+
+    def set(self, key: object, value: bytes) -> None:
+        try:
+            self.client.set(self._key(key), value, px=int(self.ttl * 1000))
+        except RedisError as exc:
+            self._log_error('set', exc)
+
+    def delete(self, keys: Iterable[object]) -> None:
+        names = [self._key(key) for key in keys]
+        if not names:
+            return
+        try:
+            self.client.delete(*names)
+        except RedisError as exc:
+            self._log_error('delete', exc)
+
+    def clear(self) -> None:
+        try:
+            names = list(self.client.scan_iter(match=f'{self.prefix}:*', count=1000))
+            if names:
+                self.client.delete(*names)
+        except RedisError as exc:
+            self._log_error('clear', exc)
+
+    def _key(self, key: object) -> str:
+        return f'{self.prefix}:{key}'
+
+    def _log_error(self, operation: str, exc: RedisError) -> None:
+        self.errors += 1
+        logger.warning(f'Redis cache {operation} failed: {exc}')
@@ -0,0 +1,218 @@
+"""
+Import users from a CSV or NDJSON export into PostgreSQL.
+
+    PYTHONPATH=. uv run python app/infrastructure/cmd/import_users.py users.csv --batch-size 10000
+
+Records need an `email` and a plain text `password`, and may have `first_name`, `last_name` and `phone`.
+The file is streamed in batches. Passwords are hashed in a process pool, one batch ahead of the database.
+Each batch is copied (`COPY`) into a temporary staging table, then merged into `user` with
+`ON CONFLICT (email)` and committed. Existing emails are skipped, or with `--update-existing` get the
+imported names and phone. Updated users are evicted from the user cache, and every merged user is recorded
+in `user_history`, as writes through the repository are.
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, cast
+
+import msgspec
+from sqlalchemy import Connection, RowMapping, text
+from tqdm import tqdm
+
+from app import connection_pool, user_cache, user_history
+from app.infrastructure.db.audit_history import INSERT, UPDATE
+from app.infrastructure.helper.password_helper import hash_password
+
+logger = logging.getLogger(__name__)
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+FORMATS = {'.csv': FORMAT_CSV, '.ndjson': FORMAT_NDJSON, '.jsonl': FORMAT_NDJSON}
+
+COLUMNS = ('email', 'password', 'first_name', 'last_name', 'phone')
+# set on existing users with `--update-existing`
+UPDATED_COLUMNS = ('first_name', 'last_name', 'phone')
+Row = tuple[str | None, ...]
+
+STAGING_TABLE = 'user_import'
+# emptied by every commit, so each batch starts from a clean staging table
+CREATE_STAGING_TABLE = f"""
+CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} ({', '.join(f'{column} text' for column in COLUMNS)})
+ON COMMIT DELETE ROWS
+"""
+COPY_STAGING_TABLE = f'COPY {STAGING_TABLE} ({", ".join(COLUMNS)}) FROM STDIN'
+
+# passwords sent to a hashing process at once, so the pool isn't flooded with one task per password
+HASH_CHUNK_SIZE = 64
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    invalid: int = 0
+    imported: int = 0
+    skipped: int = 0
+
+
+def detect_format(path: Path) -> str:
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f'Unknown import format: {path.suffix}, use --format') from None
+
+
+def read_records(path: Path, fmt: str) -> Iterator[dict[str, Any]]:
+    with path.open(newline='', encoding='utf-8') as file:
+        if fmt == FORMAT_CSV:
+            yield from csv.DictReader(file)
+            return
+        for line in file:
+            if line.strip():
+                yield msgspec.json.decode(line)
+
+
+def valid_rows(records: Iterable[dict[str, Any]], stats: ImportStats) -> Iterator[Row]:
+    """Values of `COLUMNS` of each record, blanks as `None`. Records without an email or password are counted."""
+
+    for record in records:
+        stats.read += 1
+        row = tuple(_clean(record.get(column)) for column in COLUMNS)
+        if row[0] is None or row[1] is None:
+            stats.invalid += 1
+            continue
+        yield row
+
+
+def hashed_batches(executor: Executor, batches: Iterable[list[Row]]) -> Iterator[list[Row]]:
+    """`batches` with their passwords hashed. The next batch is hashed while the current one is written."""
+
+    pending = None
+    for batch in batches:
+        hashes = executor.map(hash_password, [row[1] for row in batch], chunksize=HASH_CHUNK_SIZE)
+        if pending is not None:
+            yield _with_hashes(*pending)
+        pending = (batch, hashes)
+    if pending is not None:
+        yield _with_hashes(*pending)
+
+
+def merge_statement(update_existing: bool) -> str:
+    """
+    Merge of the staging table into `user`, returning each row inserted or updated.
+
+    With `update_existing`, rows also carry the values they replaced as `old_<column>`, `NULL` for inserted rows.
+    """
+
+    # one row per email, `ON CONFLICT DO UPDATE` can't touch a row twice in one statement
+    columns = ', '.join(COLUMNS)
+    merge = (
+        f'INSERT INTO "user" ({columns}) '
+        f'SELECT DISTINCT ON (email) {columns} FROM {STAGING_TABLE} ORDER BY email '
+        'ON CONFLICT (email) {on_conflict} '
+        f'RETURNING id, {columns}'
+    )
+    if not update_existing:
+        return merge.format(on_conflict='DO NOTHING')
+    # every part of a statement reads the same snapshot, so `existing` still holds the values before the update
+    old_columns = ', '.join(f'existing.{column} AS old_{column}' for column in UPDATED_COLUMNS)
+    on_conflict = 'DO UPDATE SET {}, updated_at = now()'.format(
+        ', '.join(f'{column} = EXCLUDED.{column}' for column in UPDATED_COLUMNS)
+    )
+    return (
+        f'WITH existing AS (SELECT id, {", ".join(UPDATED_COLUMNS)} FROM "user" '
+        f'WHERE email IN (SELECT email FROM {STAGING_TABLE}) FOR UPDATE), '
+        f'merged AS ({merge.format(on_conflict=on_conflict)}) '
+        f'SELECT merged.*, existing.id IS NOT NULL AS updated, {old_columns} FROM merged LEFT JOIN existing USING (id)'
+    )
+
+
+def write_batch(connection: Connection, batch: list[Row], update_existing: bool) -> list[RowMapping]:
+    """Copy `batch` into the staging table and merge it into `user`. Returns the rows inserted or updated."""
+
+    # COPY goes through psycopg, on the same connection and transaction
+    psycopg_connection = cast(Any, connection.connection.driver_connection)
+    with psycopg_connection.cursor() as cursor:
+        with cursor.copy(COPY_STAGING_TABLE) as copy:
+            for row in batch:
+                copy.write_row(row)
+    return list(connection.execute(text(merge_statement(update_existing))).mappings())
+
+
+def history_entries(merged: Iterable[RowMapping]) -> list[dict[str, Any]]:
+    """`user_history` rows of the merged users: inserts, and updates of the columns that changed."""
+
+    entries = []
+    for row in merged:
+        if row.get('updated'):
+            new = {column: row[column] for column in UPDATED_COLUMNS if row[column] != row[f'old_{column}']}
+            old = {column: row[f'old_{column}'] for column in new}
+            entry = user_history.entry(row['id'], UPDATE, new=new, old=old)
+        else:
+            entry = user_history.entry(
+                row['id'], INSERT, new={'id': row['id'], **{column: row[column] for column in COLUMNS}}
+            )
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+def import_users(
+    path: Path,
+    fmt: str | None = None,
+    batch_size: int = 10000,
+    workers: int | None = None,
+    update_existing: bool = False,
+) -> ImportStats:
+    if connection_pool.engine.dialect.name != 'postgresql':
+        raise ValueError('Importing users needs a PostgreSQL database')
+    stats = ImportStats()
+    rows = valid_rows(read_records(path, fmt or detect_format(path)), stats)
+    batches = (list(batch) for batch in itertools.batched(rows, batch_size))
+
+    with (
+        ProcessPoolExecutor(max_workers=workers) as executor,
+        connection_pool.engine.connect() as connection,
+        tqdm(desc='Importing users', unit=' users') as progress,
+    ):
+        connection.execute(text(CREATE_STAGING_TABLE))
+        connection.commit()
+        for batch in hashed_batches(executor, batches):
+            merged = write_batch(connection, batch, update_existing)
+            connection.commit()
+            # the statement bypasses the ORM, which otherwise evicts cached users and records their history
+            user_cache.invalidate([row['id'] for row in merged if row.get('updated')])
+            if user_history.enabled:
+                user_history.writer.put(history_entries(merged))
+            stats.imported += len(merged)
+            stats.skipped += len(batch) - len(merged)
+            progress.update(len(batch))
+            progress.set_postfix(imported=stats.imported, skipped=stats.skipped, invalid=stats.invalid)
+    return stats
+
+
+def _clean(value: Any) -> str | None:
+    value = str(value).strip() if value is not None else ''
+    return value or None
+
+
+def _with_hashes(batch: list[Row], hashes: Iterable[str]) -> list[Row]:
+    return [(row[0], hashed, *row[2:]) for row, hashed in zip(batch, hashes)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', type=Path, help='CSV or NDJSON file')
+    parser.add_argument('--format', choices=(FORMAT_CSV, FORMAT_NDJSON), help='default: from the file extension')
+    parser.add_argument('--batch-size', type=int, default=10000, help='rows per COPY and commit')
+    parser.add_argument('--workers', type=int, help='hashing processes, default: one per CPU')
+    parser.add_argument('--update-existing', action='store_true', help='update names and phone of existing emails')
+    args = parser.parse_args()
+    result = import_users(args.path, args.format, args.batch_size, args.workers, args.update_existing)
+    logger.info(
+        f'{result.imported} users imported, {result.skipped} skipped, {result.invalid} invalid of {result.read} read'
+    )
@@ -0,0 +1,24 @@
+import atexit
+
+from app.infrastructure.config.setting import Setting
+from app.infrastructure.db.batch_writer import BatchWriter
+from app.infrastructure.db.connection_pool import ConnectionPool
+from app.infrastructure.db.last_seen import LastSeen, LastSeenTracker, write_last_seen
+
+
+def config_user_activity(setting: Setting, connection_pool: ConnectionPool) -> LastSeenTracker:
+    def write(rows: list[LastSeen]) -> None:
+        with connection_pool.engine.begin() as connection:
+            write_last_seen(connection, rows)
+
+    writer = BatchWriter(
+        write,
+        # every user seen in an interval goes in one flush, `write_last_seen` splits it into bounded statements
+        batch_size=setting.USER_LAST_SEEN_MAX_USERS,
+        interval=setting.USER_LAST_SEEN_INTERVAL,
+        max_pending=setting.USER_LAST_SEEN_MAX_USERS,
+        name='user-last-seen-writer',
+        key=lambda row: row[0],
+    )
+    atexit.register(writer.close)
+    return LastSeenTracker(writer, enabled=setting.USER_LAST_SEEN)
@@ -0,0 +1,24 @@
+from redis import Redis
+
+from app.domain.entity.user import User
+from app.infrastructure.cache.entity_cache import EntityCache
+from app.infrastructure.cache.lru_cache import LRUCache
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.config.setting import Setting
+
+
+def config_user_cache(setting: Setting) -> EntityCache[User]:
+    remote = None
+    if setting.USER_CACHE_REDIS:
+        remote = RedisCache(Redis.from_url(setting.REDIS_URL), prefix='user', ttl=setting.USER_CACHE_TTL)
+
+    user_cache = EntityCache(
+        User,
+        LRUCache(maxsize=setting.USER_CACHE_SIZE, ttl=setting.USER_CACHE_TTL),
+        remote=remote,
+        # password hashes stay in the database, they load on access when needed; `last_seen_at` moves with every
+        # authenticated request, a cached copy would be up to the TTL old
+        exclude=('password', 'last_seen_at'),
+    )
+    user_cache.register()
+    return user_cache
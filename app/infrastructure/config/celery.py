@@ -13,6 +13,7 @@ def config_celery(setting: Setting) -> Celery:
         [
             'app.infrastructure.task.health_check',
             'app.infrastructure.task.mail_task',
+            'app.infrastructure.task.row_count_task',
         ],
     )
 
@@ -22,6 +23,11 @@ def config_celery(setting: Setting) -> Celery:
             'schedule': timedelta(hours=1),
             'args': (),
         },
+        'compact-user-row-count': {
+            'task': 'app.infrastructure.task.row_count_task.compact_user_row_count',
+            'schedule': timedelta(minutes=1),
+            'args': (),
+        },
     }
 
     return current_app
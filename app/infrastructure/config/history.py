@@ -0,0 +1,38 @@
+import atexit
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.domain.entity.user import User
+from app.domain.entity.user_history import UserHistory
+from app.infrastructure.config.setting import Setting
+from app.infrastructure.db.audit_history import AuditHistory
+from app.infrastructure.db.batch_writer import BatchWriter
+from app.infrastructure.db.connection_pool import ConnectionPool
+
+
+def config_user_history(setting: Setting, connection_pool: ConnectionPool) -> AuditHistory[User]:
+    def write(rows: list[dict[str, Any]]) -> None:
+        # one executemany, sent as multi-row VALUES pages
+        with connection_pool.engine.begin() as connection:
+            connection.execute(insert(UserHistory), rows)
+
+    writer = BatchWriter(
+        write,
+        batch_size=setting.USER_HISTORY_BATCH_SIZE,
+        interval=setting.USER_HISTORY_FLUSH_INTERVAL,
+        name='user-history-writer',
+    )
+    atexit.register(writer.close)
+
+    user_history = AuditHistory(
+        User,
+        writer,
+        key='user_id',
+        # audit columns are in every history row already, `full_name` follows the names
+        exclude=('created_at', 'updated_at', 'created_user_id', 'updated_user_id', 'full_name'),
+        redact=('password',),
+        enabled=setting.USER_HISTORY,
+    )
+    user_history.register()
+    return user_history
@@ -0,0 +1,37 @@
+import logging
+import os
+from typing import Any, Protocol
+
+from celery.signals import worker_process_init
+
+logger = logging.getLogger(__name__)
+
+
+class ForkAwarePool(Protocol):
+    def dispose_after_fork(self) -> None: ...
+
+
+_pools: list[ForkAwarePool] = []
+
+
+def config_lifecycle(*pools: ForkAwarePool) -> None:
+    """
+    Register the pools to reset in every forked worker process.
+
+    `app` is imported once in the parent (`gunicorn --preload`, Celery prefork), so children inherit
+    its engines. `after_fork()` runs from gunicorn's `post_fork` hook and Celery's `worker_process_init`
+    signal, and makes each child open its own connections.
+    """
+
+    _pools[:] = pools
+    worker_process_init.connect(_on_worker_process_init, weak=False)
+
+
+def after_fork() -> None:
+    for pool in _pools:
+        pool.dispose_after_fork()
+    logger.info(f'Reset {len(_pools)} connection pool(s) in worker process {os.getpid()}')
+
+
+def _on_worker_process_init(**kwargs: Any) -> None:
+    after_fork()
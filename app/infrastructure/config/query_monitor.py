@@ -0,0 +1,11 @@
+from app.infrastructure.config.setting import Setting
+from app.infrastructure.db.query_monitor import QueryMonitor
+
+
+def config_query_monitor(setting: Setting) -> QueryMonitor:
+    query_monitor = QueryMonitor(
+        n_plus_one_threshold=setting.DB_N_PLUS_ONE_THRESHOLD,
+        raise_on_n_plus_one=setting.DB_N_PLUS_ONE_RAISE,
+    )
+    query_monitor.register()
+    return query_monitor
@@ -3,6 +3,9 @@ from dataclasses import dataclass, field
 from decouple import config
 from sqlalchemy import URL, make_url
 
+from app.infrastructure.db.pool import POOL_MODE_PGBOUNCER, PoolConfig
+from app.infrastructure.db.statement_cache import StatementCacheConfig, parse_prepare_threshold
+
 
 @dataclass
 class Setting:
@@ -13,6 +16,36 @@ class Setting:
     JWT_REFRESH_TOKEN_EXPIRES: int = field(default=config('JWT_REFRESH_TOKEN_EXPIRES', default=86400 * 7))
 
     DB_URL: str = field(default=config('DB_URL'))
+    DB_ASYNC: bool = field(default=config('DB_ASYNC', default=False, cast=bool))
+    DB_REPLICA_URLS: list[str] = field(
+        default_factory=lambda: [url for url in config('DB_REPLICA_URLS', default='').split(',') if url],
+    )
+    DB_REPLICA_SELECTION: str = field(default=config('DB_REPLICA_SELECTION', default='round_robin'))
+    DB_POOL_SIZE: int = field(default=config('DB_POOL_SIZE', default=10, cast=int))
+    DB_MAX_OVERFLOW: int = field(default=config('DB_MAX_OVERFLOW', default=30, cast=int))
+    DB_POOL_TIMEOUT: float = field(default=config('DB_POOL_TIMEOUT', default=10, cast=float))
+    DB_POOL_RECYCLE: int = field(default=config('DB_POOL_RECYCLE', default=1800, cast=int))
+    DB_POOL_PRE_PING: str = field(default=config('DB_POOL_PRE_PING', default='idle'))
+    DB_POOL_PRE_PING_IDLE: float = field(default=config('DB_POOL_PRE_PING_IDLE', default=60, cast=float))
+    DB_POOL_MODE: str = field(default=config('DB_POOL_MODE', default='default'))
+    DB_PGBOUNCER_POOL_SIZE: int = field(default=config('DB_PGBOUNCER_POOL_SIZE', default=0, cast=int))
+    DB_PREPARE_THRESHOLD: int | None = field(
+        default=config('DB_PREPARE_THRESHOLD', default='5', cast=parse_prepare_threshold),
+    )
+    DB_QUERY_CACHE_SIZE: int = field(default=config('DB_QUERY_CACHE_SIZE', default=1000, cast=int))
+    DB_N_PLUS_ONE_THRESHOLD: int = field(default=config('DB_N_PLUS_ONE_THRESHOLD', default=5, cast=int))
+    DB_N_PLUS_ONE_RAISE: bool = field(default=config('DB_N_PLUS_ONE_RAISE', default=False, cast=bool))
+    MAX_PAGE_SIZE: int = field(default=config('MAX_PAGE_SIZE', default=100, cast=int))
+    MAX_BULK_SIZE: int = field(default=config('MAX_BULK_SIZE', default=1000, cast=int))
+    USER_CACHE_SIZE: int = field(default=config('USER_CACHE_SIZE', default=10000, cast=int))
+    USER_CACHE_TTL: float = field(default=config('USER_CACHE_TTL', default=30, cast=float))
+    USER_CACHE_REDIS: bool = field(default=config('USER_CACHE_REDIS', default=False, cast=bool))
+    USER_HISTORY: bool = field(default=config('USER_HISTORY', default=True, cast=bool))
+    USER_HISTORY_BATCH_SIZE: int = field(default=config('USER_HISTORY_BATCH_SIZE', default=500, cast=int))
+    USER_HISTORY_FLUSH_INTERVAL: float = field(default=config('USER_HISTORY_FLUSH_INTERVAL', default=1, cast=float))
+    USER_LAST_SEEN: bool = field(default=config('USER_LAST_SEEN', default=True, cast=bool))
+    USER_LAST_SEEN_INTERVAL: float = field(default=config('USER_LAST_SEEN_INTERVAL', default=60, cast=float))
+    USER_LAST_SEEN_MAX_USERS: int = field(default=config('USER_LAST_SEEN_MAX_USERS', default=100000, cast=int))
     REDIS_URL: str = field(default=config('REDIS_URL', default='redis://localhost:6379/0'))
     CELERY_BROKER_URL: str = field(default=config('CELERY_BROKER_URL', default='redis://localhost:6379/1'))
     CELERY_RESULT_BACKEND: str = field(default=config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/2'))
@@ -31,3 +64,41 @@ class Setting:
     @property
     def db_url(self) -> URL:
         return make_url(self.DB_URL)
+
+    @property
+    def pool_config(self) -> PoolConfig:
+        pgbouncer = self.DB_POOL_MODE == POOL_MODE_PGBOUNCER
+        return PoolConfig(
+            # behind PgBouncer, a few local connections at most: the bouncer does the pooling
+            size=self.DB_PGBOUNCER_POOL_SIZE if pgbouncer else self.DB_POOL_SIZE,
+            max_overflow=0 if pgbouncer else self.DB_MAX_OVERFLOW,
+            timeout=self.DB_POOL_TIMEOUT,
+            recycle=self.DB_POOL_RECYCLE,
+            pre_ping=self.DB_POOL_PRE_PING,
+            pre_ping_idle=self.DB_POOL_PRE_PING_IDLE,
+            mode=self.DB_POOL_MODE,
+        )
+
+    @property
+    def statement_cache_config(self) -> StatementCacheConfig:
+        return StatementCacheConfig(
+            prepare_threshold=self.DB_PREPARE_THRESHOLD,
+            query_cache_size=self.DB_QUERY_CACHE_SIZE,
+        )
+
+    @property
+    def async_db_url(self) -> URL:
+        return _to_async_url(self.db_url)
+
+    @property
+    def async_replica_urls(self) -> list[URL]:
+        return [_to_async_url(make_url(url)) for url in self.DB_REPLICA_URLS]
+
+
+def _to_async_url(url: URL) -> URL:
+    backend = url.get_backend_name()
+    if backend == 'postgresql':
+        return url.set(drivername='postgresql+psycopg_async')
+    if backend == 'sqlite':
+        return url.set(drivername='sqlite+aiosqlite')
+    return url
@@ -0,0 +1,140 @@
+import datetime
+from typing import Any, Generic, Iterable, Mapping, TypeVar
+
+import msgspec
+from sqlalchemy import event
+from sqlalchemy.orm import Session, UOWTransaction, class_mapper
+from sqlalchemy.orm.attributes import instance_state
+
+from app.infrastructure.db.batch_writer import BatchWriter
+
+T = TypeVar('T')
+
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+
+REDACTED = '***'
+
+
+class AuditHistory(Generic[T]):
+    """
+    Change history of one entity, written behind the transactions that make the changes.
+
+    Every flush diffs the column values of the new, changed and deleted instances into history rows kept in
+    `session.info`. A commit hands them to `writer`, which inserts them in batches from a background thread; a
+    rollback drops them. The request only pays for the diff. Statements that bypass the unit of work (bulk
+    INSERT/UPDATE/DELETE) report their changes with `record()`; writes outside a session build the rows with
+    `entry()` and put them in `writer` once committed.
+
+    Columns in `exclude` are left out, values of columns in `redact` are replaced by `REDACTED`.
+    """
+
+    def __init__(
+        self,
+        entity: type[T],
+        writer: BatchWriter[dict[str, Any]],
+        key: str,
+        exclude: Iterable[str] = (),
+        redact: Iterable[str] = (),
+        enabled: bool = True,
+    ) -> None:
+        self.entity = entity
+        self.writer = writer
+        self.key = key
+        self.enabled = enabled
+        mapper = class_mapper(entity)
+        self.columns = [attr.key for attr in mapper.column_attrs if attr.key not in set(exclude)]
+        self.redact = set(redact)
+        self._pending_key = f'{mapper.class_.__name__.lower()}_history'
+
+    def register(self) -> None:
+        event.listen(Session, 'after_flush', self._collect_changes)
+        event.listen(Session, 'after_commit', self._hand_over)
+        event.listen(Session, 'after_rollback', self._discard_pending)
+
+    def record(
+        self,
+        session: Session,
+        entity_id: Any,
+        operation: str,
+        new: Mapping[str, Any] | None = None,
+        old: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Add a change of `entity_id` to the history written after the session commits."""
+
+        if not self.enabled:
+            return
+        entry = self.entry(entity_id, operation, new, old, changed_user_id=session.info.get('uid'))
+        if entry is not None:
+            session.info.setdefault(self._pending_key, []).append(entry)
+
+    def entry(
+        self,
+        entity_id: Any,
+        operation: str,
+        new: Mapping[str, Any] | None = None,
+        old: Mapping[str, Any] | None = None,
+        changed_user_id: int | None = None,
+    ) -> dict[str, Any] | None:
+        """History row of a change, `None` for an update that changes nothing."""
+
+        new, old = new or {}, old or {}
+        changes = {
+            key: [self._value(key, old.get(key)), self._value(key, new.get(key))]
+            for key in self.columns
+            if key in new or key in old
+        }
+        if operation == UPDATE and not changes:
+            return None
+        return {
+            self.key: entity_id,
+            'operation': operation,
+            'changes': changes,
+            'changed_user_id': changed_user_id,
+            'changed_at': datetime.datetime.now(datetime.UTC),
+        }
+
+    def _collect_changes(self, session: Session, flush_context: UOWTransaction) -> None:
+        # still the pre-flush state: `new`, `dirty`, `deleted` and the attribute histories
+        if not self.enabled:
+            return
+        for instance in session.new:
+            if isinstance(instance, self.entity):
+                state = instance_state(instance)
+                self.record(session, self._identity(instance), INSERT, new=state.dict)
+        for instance in session.dirty:
+            if isinstance(instance, self.entity):
+                old, new = self._diff(instance)
+                self.record(session, self._identity(instance), UPDATE, new=new, old=old)
+        for instance in session.deleted:
+            if isinstance(instance, self.entity):
+                self.record(session, self._identity(instance), DELETE, old=instance_state(instance).dict)
+
+    def _diff(self, instance: T) -> tuple[dict[str, Any], dict[str, Any]]:
+        old: dict[str, Any] = {}
+        new: dict[str, Any] = {}
+        attrs = instance_state(instance).attrs
+        for key in self.columns:
+            history = attrs[key].history
+            if history.added:
+                new[key] = history.added[0]
+                # an expired or unloaded value has no old value in memory
+                old[key] = history.deleted[0] if history.deleted else None
+        return old, new
+
+    def _identity(self, instance: T) -> Any:
+        return class_mapper(self.entity).primary_key_from_instance(instance)[0]
+
+    def _value(self, key: str, value: Any) -> Any:
+        if key in self.redact and value is not None:
+            return REDACTED
+        return msgspec.to_builtins(value)
+
+    def _hand_over(self, session: Session) -> None:
+        pending = session.info.pop(self._pending_key, None)
+        if pending:
+            self.writer.put(pending)
+
+    def _discard_pending(self, session: Session) -> None:
+        session.info.pop(self._pending_key, None)
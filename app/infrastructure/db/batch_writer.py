@@ -0,0 +1,139 @@
+import itertools
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Callable, Generic, Hashable, Iterable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class BatchWriter(Generic[T]):
+    """
+    Write-behind buffer: items handed over by requests, written by a background thread in batches.
+
+    `put()` only appends to memory. The writer thread wakes up every `interval` seconds, or as soon as
+    `batch_size` items wait, and passes them to `write` in batches of at most `batch_size`. A failed batch is
+    logged and dropped; past `max_pending` waiting items the oldest are dropped, so a database outage can't
+    exhaust memory. Items still waiting are lost if the process is killed, `close()` writes them on a clean exit.
+
+    With `key`, items of the same key coalesce while they wait: the last one put replaces the others, in the place
+    of the first.
+
+    The thread starts with the first `put()` of each process, a forked child discards what its parent buffered.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[T]], Any],
+        batch_size: int = 500,
+        interval: float = 1.0,
+        max_pending: int = 100_000,
+        name: str = 'batch-writer',
+        key: Callable[[T], Hashable] | None = None,
+    ) -> None:
+        self.write = write
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_pending = max_pending
+        self.name = name
+        self.key = key
+        self._counters = dict.fromkeys(('written', 'failed', 'dropped'), 0)
+        self._reset()
+
+    def put(self, items: Iterable[T]) -> None:
+        items = list(items)
+        if not items:
+            return
+        if self._pid != os.getpid():
+            self._reset()
+        with self._condition:
+            if self.key is None:
+                dropped = max(0, len(self._pending) + len(items) - self.max_pending)
+                self._pending.extend(items)
+            else:
+                dropped = self._put_coalesced(items, self.key)
+            self._counters['dropped'] += dropped
+            self._start()
+            if self._waiting() >= self.batch_size:
+                self._condition.notify()
+
+    def flush(self) -> int:
+        """Write every waiting item now, in the calling thread. Returns the number written."""
+
+        written = 0
+        # one batch at a time, in the order the items were put
+        with self._write_lock:
+            while batch := self._take():
+                try:
+                    self.write(batch)
+                except Exception:
+                    logger.exception(f'{self.name}: dropped a batch of {len(batch)} after a failed write')
+                    self._count('failed', len(batch))
+                else:
+                    written += len(batch)
+                    self._count('written', len(batch))
+        return written
+
+    def close(self) -> None:
+        """Stop the writer thread and write what is left."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+        self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {**self._counters, 'pending': self._waiting()}
+
+    def _reset(self) -> None:
+        # also after a fork: the parent's locks may have been held and its thread doesn't exist here
+        self._pid = os.getpid()
+        self._pending: deque[T] = deque(maxlen=self.max_pending)
+        self._coalesced: dict[Hashable, T] = {}
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def _start(self) -> None:
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._closed and self._waiting() < self.batch_size:
+                    self._condition.wait(self.interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    def _put_coalesced(self, items: list[T], key: Callable[[T], Hashable]) -> int:
+        dropped = 0
+        for item in items:
+            self._coalesced[key(item)] = item
+            if len(self._coalesced) > self.max_pending:
+                del self._coalesced[next(iter(self._coalesced))]
+                dropped += 1
+        return dropped
+
+    def _waiting(self) -> int:
+        return len(self._coalesced) if self.key is not None else len(self._pending)
+
+    def _take(self) -> list[T]:
+        with self._condition:
+            if self.key is not None:
+                keys = list(itertools.islice(self._coalesced, self.batch_size))
+                return [self._coalesced.pop(key) for key in keys]
+            return [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+
+    def _count(self, counter: str, amount: int) -> None:
+        with self._condition:
+            self._counters[counter] += amount
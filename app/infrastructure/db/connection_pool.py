@@ -1,31 +1,218 @@
+import dataclasses
 import logging
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Generator, AsyncGenerator, Sequence
 
-from sqlalchemy import create_engine
+import anyio
+from sqlalchemy import create_engine, URL
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import scoped_session, sessionmaker, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker, Session
+
+from app.infrastructure.db.pgbouncer import use_transaction_local_set
+from app.infrastructure.db.pool import (
+    POOL_MODE_PGBOUNCER,
+    PoolConfig,
+    PoolMetrics,
+    RoundTripMetrics,
+    engine_options,
+    instrument_engine,
+    instrument_round_trips,
+    pool_capacity,
+)
+from app.infrastructure.db.statement_cache import StatementCacheConfig, statement_options
+from app.infrastructure.db.routing_session import ReplicaSelector, RoutingSession, ROUND_ROBIN
 
 logger = logging.getLogger(__name__)
 
 
 class ConnectionPool:
-    def __init__(self, db_url: str) -> None:
-        self.engine = create_engine(db_url, echo=False)
-        self.session_factory = scoped_session(
-            sessionmaker(bind=self.engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    def __init__(
+        self,
+        db_url: str | URL,
+        replica_urls: Sequence[str | URL] = (),
+        replica_selection: str = ROUND_ROBIN,
+        pool_config: PoolConfig | None = None,
+        statement_cache_config: StatementCacheConfig | None = None,
+    ) -> None:
+        pool_config = pool_config or PoolConfig()
+        statement_cache_config = _statement_cache_config(pool_config, statement_cache_config)
+        self.engine = create_engine(
+            db_url,
+            echo=False,
+            **engine_options(db_url, pool_config),
+            **statement_options(db_url, statement_cache_config),
+        )
+        self.replica_engines = [
+            create_engine(
+                url,
+                echo=False,
+                **engine_options(url, pool_config),
+                **statement_options(url, statement_cache_config),
+            )
+            for url in replica_urls
+        ]
+        self.pool_metrics: dict[str, PoolMetrics] = {
+            'primary': instrument_engine(self.engine, pool_config),
+            **{
+                f'replica_{index}': instrument_engine(engine, pool_config)
+                for index, engine in enumerate(self.replica_engines)
+            },
+        }
+        self.round_trips = RoundTripMetrics()
+        for engine in (self.engine, *self.replica_engines):
+            instrument_round_trips(engine, self.round_trips)
+            if pool_config.mode == POOL_MODE_PGBOUNCER:
+                use_transaction_local_set(engine)
+        # not thread-scoped: FastAPI may enter, use and exit one request's session on different threadpool threads
+        self.session_factory = sessionmaker(
+            class_=RoutingSession,
+            bind=self.engine,
+            replica_selector=ReplicaSelector(self.replica_engines, replica_selection) if self.replica_engines else None,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
         )
+        capacity = pool_capacity(db_url, pool_config)
+        self._session_slots = anyio.Semaphore(capacity) if capacity else None
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {
+            'pools': {name: metrics.snapshot() for name, metrics in self.pool_metrics.items()},
+            'round_trips': self.round_trips.snapshot(),
+        }
+
+    def dispose_after_fork(self) -> None:
+        # drop connections inherited from the parent without closing them, the parent still owns the sockets
+        for engine in (self.engine, *self.replica_engines):
+            engine.dispose(close=False)
+
+    @asynccontextmanager
+    async def session_slot(self) -> AsyncGenerator[None, None]:
+        """
+        Wait on the event loop until the pool can serve one more session.
+
+        Sync sessions check out their connection on a threadpool thread; without this gate, a burst larger
+        than the pool parks every thread in checkout while the requests holding connections wait for a thread.
+        """
+
+        if self._session_slots is None:
+            yield
+            return
+        async with self._session_slots:
+            yield
 
     @contextmanager
-    def open_session(self) -> Generator[Session, None, None]:
-        session = self.session_factory()
+    def open_session(self, read_only: bool = False) -> Generator[Session, None, None]:
+        """
+        Open a request session, committed on exit.
+
+        A `read_only` session runs a `READ ONLY` transaction and is never committed: closing it rolls back.
+        """
+
+        session = self.session_factory(read_only=read_only)
         session.info.clear()
         try:
             yield session
-            session.commit()
+            if not read_only:
+                session.commit()
         except IntegrityError as exc:
             session.rollback()
             logger.exception(exc)
             raise exc
         finally:
             session.close()
+
+
+def _statement_cache_config(
+    pool_config: PoolConfig, statement_cache_config: StatementCacheConfig | None
+) -> StatementCacheConfig:
+    statement_cache_config = statement_cache_config or StatementCacheConfig()
+    if pool_config.mode == POOL_MODE_PGBOUNCER:
+        # prepared statements live on one server connection, the bouncer may switch it between transactions
+        return dataclasses.replace(statement_cache_config, prepare_threshold=None)
+    return statement_cache_config
+
+
+class AsyncConnectionPool:
+    """
+    Asyncio counterpart of `ConnectionPool`, built on the psycopg async dialect.
+
+    Sessions are not scoped to a thread: every `open_async_session()` call gets its own
+    `AsyncSession`, so concurrency is bounded by the pool size rather than by a worker threadpool.
+    """
+
+    def __init__(
+        self,
+        db_url: str | URL,
+        replica_urls: Sequence[str | URL] = (),
+        replica_selection: str = ROUND_ROBIN,
+        pool_config: PoolConfig | None = None,
+        statement_cache_config: StatementCacheConfig | None = None,
+    ) -> None:
+        pool_config = pool_config or PoolConfig()
+        statement_cache_config = _statement_cache_config(pool_config, statement_cache_config)
+        self.engine = create_async_engine(
+            db_url,
+            echo=False,
+            **engine_options(db_url, pool_config),
+            **statement_options(db_url, statement_cache_config),
+        )
+        self.replica_engines = [
+            create_async_engine(
+                url,
+                echo=False,
+                **engine_options(url, pool_config),
+                **statement_options(url, statement_cache_config),
+            )
+            for url in replica_urls
+        ]
+        self.pool_metrics: dict[str, PoolMetrics] = {
+            'primary': instrument_engine(self.engine.sync_engine, pool_config),
+            **{
+                f'replica_{index}': instrument_engine(engine.sync_engine, pool_config)
+                for index, engine in enumerate(self.replica_engines)
+            },
+        }
+        self.round_trips = RoundTripMetrics()
+        for engine in (self.engine, *self.replica_engines):
+            instrument_round_trips(engine.sync_engine, self.round_trips)
+            if pool_config.mode == POOL_MODE_PGBOUNCER:
+                use_transaction_local_set(engine.sync_engine)
+        replica_selector = (
+            ReplicaSelector([engine.sync_engine for engine in self.replica_engines], replica_selection)
+            if self.replica_engines
+            else None
+        )
+        self.session_factory = async_sessionmaker(
+            bind=self.engine,
+            sync_session_class=RoutingSession,
+            replica_selector=replica_selector,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {
+            'pools': {name: metrics.snapshot() for name, metrics in self.pool_metrics.items()},
+            'round_trips': self.round_trips.snapshot(),
+        }
+
+    def dispose_after_fork(self) -> None:
+        for engine in (self.engine, *self.replica_engines):
+            engine.sync_engine.dispose(close=False)
+
+    @asynccontextmanager
+    async def open_async_session(self, read_only: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        session = self.session_factory(read_only=read_only)
+        try:
+            yield session
+            if not read_only:
+                await session.commit()
+        except IntegrityError as exc:
+            await session.rollback()
+            logger.exception(exc)
+            raise exc
+        finally:
+            await session.close()
@@ -0,0 +1,80 @@
+import functools
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar, cast
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class ExecutionProfile:
+    """
+    PostgreSQL settings scoped to the transaction of one use case.
+
+    Timeouts are in milliseconds; `None` keeps the server default.
+    """
+
+    statement_timeout: int | None = None
+    lock_timeout: int | None = None
+    work_mem: str | None = None
+    jit: bool | None = None
+
+    def settings(self) -> dict[str, str]:
+        settings = {
+            'statement_timeout': self.statement_timeout,
+            'lock_timeout': self.lock_timeout,
+            'work_mem': self.work_mem,
+            'jit': None if self.jit is None else ('on' if self.jit else 'off'),
+        }
+        return {name: str(value) for name, value in settings.items() if value is not None}
+
+    def statement(self) -> Select[Any] | None:
+        # `set_config(..., true)` is `SET LOCAL`: the values end with the transaction, so they are also
+        # safe behind a transaction-pooling PgBouncer. All of them are sent in a single round trip.
+        settings = self.settings()
+        if not settings:
+            return None
+        return select(*(func.set_config(name, value, True) for name, value in settings.items()))
+
+
+def apply_profile(session: Session, profile: ExecutionProfile) -> None:
+    statement = profile.statement()
+    if statement is None or session.get_bind(clause=statement).dialect.name != 'postgresql':
+        return
+    session.execute(statement)
+
+
+async def apply_profile_async(session: AsyncSession, profile: ExecutionProfile) -> None:
+    statement = profile.statement()
+    if statement is None or session.get_bind(clause=statement).dialect.name != 'postgresql':
+        return
+    await session.execute(statement)
+
+
+def execution_profile(profile: ExecutionProfile) -> Callable[[F], F]:
+    """
+    Apply `profile` to `ctx.session` before running a use case `execute(ctx, ...)` or `execute_async(ctx, ...)`.
+    """
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(ctx: Any, *args: Any, **kwargs: Any) -> Any:
+                await apply_profile_async(ctx.session, profile)
+                return await func(ctx, *args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(ctx: Any, *args: Any, **kwargs: Any) -> Any:
+            apply_profile(ctx.session, profile)
+            return func(ctx, *args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
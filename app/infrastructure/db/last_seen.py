@@ -0,0 +1,86 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import Connection, DateTime, Engine, Integer, Update, bindparam, column, func, or_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.domain.entity.user import User
+from app.infrastructure.db.batch_writer import BatchWriter
+
+LastSeen = tuple[int, datetime.datetime]
+
+# rows per UPDATE: a flush holds every user seen in an interval, the statements stay bounded
+STATEMENT_ROWS = 10_000
+
+
+class LastSeenTracker:
+    """
+    Time each authenticated user was last seen, written behind the requests.
+
+    `touch()` keeps the latest time per user id in memory; `writer` sets them all in one flush per interval,
+    so reads stay reads. Timestamps are up to an interval late, and lost with the buffer if a worker is killed.
+    """
+
+    def __init__(self, writer: BatchWriter[LastSeen], enabled: bool = True) -> None:
+        self.writer = writer
+        self.enabled = enabled
+
+    def touch(self, user_id: int) -> None:
+        if self.enabled:
+            self.writer.put([(user_id, datetime.datetime.now(datetime.UTC))])
+
+
+def write_last_seen(connection: Connection, rows: list[LastSeen]) -> None:
+    # chunks in id order too, for the same lock order
+    rows = sorted(rows)
+    for start in range(0, len(rows), STATEMENT_ROWS):
+        stmt, params = last_seen_statement(connection, rows[start : start + STATEMENT_ROWS])
+        connection.execute(stmt, params)
+
+
+def last_seen_statement(
+    bind: Engine | Connection, rows: list[LastSeen]
+) -> tuple[Update, list[dict[str, Any]] | dict[str, Any]]:
+    """
+    `last_seen_at` of `rows`, never moved backwards (workers flush independently).
+
+    Built on the table, not the entity: ORM bulk UPDATEs make the entity cache drop every row. `updated_at` is set
+    to itself, or its `onupdate` would date activity as a change.
+    """
+
+    table = User.__table__
+    # ids in order, so concurrent flushes lock rows in the same order
+    rows = sorted(rows)
+    if bind.dialect.name != 'postgresql':
+        stmt = (
+            update(table)
+            .where(
+                table.c.id == bindparam('user_id'),
+                or_(table.c.last_seen_at.is_(None), table.c.last_seen_at < bindparam('seen_at')),
+            )
+            .values(last_seen_at=bindparam('seen_at'), updated_at=table.c.updated_at)
+        )
+        return stmt, [{'user_id': user_id, 'seen_at': seen_at} for user_id, seen_at in rows]
+
+    # `UPDATE "user" SET ... FROM unnest(:ids, :seen_at) AS data(id, last_seen_at) WHERE "user".id = data.id`:
+    # two array parameters whatever the number of rows, where VALUES would bind two per row
+    data = (
+        func.unnest(
+            bindparam('ids', type_=ARRAY(Integer)),
+            bindparam('seen_at', type_=ARRAY(DateTime(timezone=True))),
+        )
+        .table_valued(
+            column('id', Integer),
+            column('last_seen_at', DateTime(timezone=True)),
+        )
+        .render_derived(name='data')
+    )
+    stmt = (
+        update(table)
+        .where(
+            table.c.id == data.c.id,
+            or_(table.c.last_seen_at.is_(None), table.c.last_seen_at < data.c.last_seen_at),
+        )
+        .values(last_seen_at=data.c.last_seen_at, updated_at=table.c.updated_at)
+    )
+    return stmt, {'ids': [user_id for user_id, _ in rows], 'seen_at': [seen_at for _, seen_at in rows]}
@@ -0,0 +1,36 @@
+import logging
+import re
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+# `SET [SESSION] name ...`, leaving `SET LOCAL`, `SET TRANSACTION`, `SET CONSTRAINTS` and
+# `SET SESSION CHARACTERISTICS/AUTHORIZATION` (transaction-scoped or not a parameter) alone
+_SESSION_SET = re.compile(
+    r'^\s*SET\s+(?:SESSION\s+(?!CHARACTERISTICS\b|AUTHORIZATION\b))?(?!LOCAL\b|TRANSACTION\b|CONSTRAINTS\b|SESSION\b)',
+    re.IGNORECASE,
+)
+
+
+def to_set_local(statement: str) -> str:
+    return _SESSION_SET.sub('SET LOCAL ', statement, count=1)
+
+
+def use_transaction_local_set(engine: Engine) -> None:
+    """
+    Rewrite session-level `SET` statements to `SET LOCAL`.
+
+    Behind PgBouncer in transaction mode the next transaction may run on another server connection, so
+    session state would leak to other clients. `SET LOCAL` ends with the transaction that set it.
+    """
+
+    @event.listens_for(engine, 'before_cursor_execute', retval=True)
+    def _set_local(
+        connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> tuple[str, Any]:
+        local = to_set_local(statement)
+        if local != statement:
+            logger.debug(f'Rewrote session-level SET for PgBouncer: {statement}')
+        return local, parameters
@@ -0,0 +1,284 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, cast
+
+from sqlalchemy import Connection, Engine, URL, event, make_url
+from sqlalchemy.engine.default import DefaultDialect
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    NullPool,
+    Pool,
+    PoolProxiedConnection,
+    QueuePool,
+)
+
+from app.infrastructure.db.routing_session import READ_ONLY, READ_WRITE, SESSION_MODE
+
+logger = logging.getLogger(__name__)
+
+PRE_PING_ALWAYS = 'always'
+PRE_PING_IDLE = 'idle'
+PRE_PING_OFF = 'off'
+
+POOL_MODE_DEFAULT = 'default'
+# PgBouncer in transaction mode: the bouncer pools server connections, the app keeps few or none
+POOL_MODE_PGBOUNCER = 'pgbouncer'
+
+
+@dataclass
+class PoolConfig:
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30
+    recycle: int = -1
+    pre_ping: str = PRE_PING_OFF
+    # with `pre_ping='idle'`, only connections idle for longer than this many seconds are pinged
+    pre_ping_idle: float = 60
+    # in `pgbouncer` mode, `size=0` opens a connection to the bouncer per checkout (`NullPool`)
+    mode: str = POOL_MODE_DEFAULT
+
+    def __post_init__(self) -> None:
+        if self.pre_ping not in (PRE_PING_ALWAYS, PRE_PING_IDLE, PRE_PING_OFF):
+            raise ValueError(f'Unknown pre-ping mode: {self.pre_ping}')
+        if self.mode not in (POOL_MODE_DEFAULT, POOL_MODE_PGBOUNCER):
+            raise ValueError(f'Unknown pool mode: {self.mode}')
+
+    @property
+    def is_null_pool(self) -> bool:
+        return self.mode == POOL_MODE_PGBOUNCER and self.size == 0
+
+
+class PoolMetrics:
+    """
+    Live counters of one engine's pool, fed by pool event listeners.
+
+    Checkout wait is measured by the instrumented pool classes, around `Pool.connect()`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.pool: Pool | None = None
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_checkout(self, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'pool_size': _pool_stat(self.pool, 'size'),
+                'checked_out': self.checked_out,
+                'overflow': _pool_stat(self.pool, 'overflow'),
+                'idle': _pool_stat(self.pool, 'checkedin'),
+                'peak_checked_out': self.peak_checked_out,
+                'peak_overflow': self.peak_overflow,
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'pings': self.pings,
+                'ping_failures': self.ping_failures,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+            }
+
+
+class RoundTripMetrics:
+    """
+    Round trips per session mode: statements plus BEGIN/COMMIT/ROLLBACK.
+
+    The mode is read from the `session_mode` execution option of the connection.
+    """
+
+    COUNTERS = ('statements', 'begins', 'commits', 'rollbacks')
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {mode: dict.fromkeys(self.COUNTERS, 0) for mode in (READ_WRITE, READ_ONLY)}
+
+    def increment(self, mode: str, counter: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(mode, dict.fromkeys(self.COUNTERS, 0))
+            counts[counter] += 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {mode: {**counts, 'round_trips': sum(counts.values())} for mode, counts in self._counts.items()}
+
+
+def _pool_stat(pool: Pool | None, name: str) -> int | None:
+    stat = getattr(pool, name, None)
+    return stat() if callable(stat) else None
+
+
+class _InstrumentedPoolMixin(Pool):
+    metrics: PoolMetrics | None = None
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            if self.metrics:
+                self.metrics.record_timeout()
+            logger.warning(f'Connection pool exhausted: {self.status()}')
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self) -> Any:
+        # `Engine.dispose()` swaps in a recreated pool, keep feeding the same metrics
+        pool = cast(_InstrumentedPoolMixin, super().recreate())
+        pool.metrics = self.metrics
+        if self.metrics:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(db_url: str | URL, config: PoolConfig) -> dict[str, Any]:
+    """
+    Keyword arguments for `create_engine()`/`create_async_engine()` applying `config`.
+
+    Sizing only applies to queue pools; SQLite in-memory databases keep their single-connection pool.
+    """
+
+    url = make_url(db_url)
+    if config.is_null_pool:
+        return {'poolclass': NullPool}
+    options: dict[str, Any] = {
+        'pool_recycle': config.recycle,
+        'pool_pre_ping': config.pre_ping == PRE_PING_ALWAYS,
+    }
+    if issubclass(_pool_class(url), QueuePool):
+        is_async = issubclass(_pool_class(url), AsyncAdaptedQueuePool)
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=config.size,
+            max_overflow=config.max_overflow,
+            pool_timeout=config.timeout,
+        )
+    return options
+
+
+def pool_capacity(db_url: str | URL, config: PoolConfig) -> int | None:
+    """Most connections a queue pool hands out at once, `None` for other pools."""
+
+    url = make_url(db_url)
+    if not config.is_null_pool and issubclass(_pool_class(url), QueuePool):
+        return config.size + config.max_overflow
+    return None
+
+
+def _pool_class(url: URL) -> type[Pool]:
+    return cast(type[DefaultDialect], url.get_dialect()).get_pool_class(url)
+
+
+def instrument_engine(engine: Engine, config: PoolConfig) -> PoolMetrics:
+    metrics = PoolMetrics()
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, _InstrumentedPoolMixin):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+        metrics.increment('connects')
+
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(
+        dbapi_connection: Any, connection_record: ConnectionPoolEntry, connection_proxy: PoolProxiedConnection
+    ) -> None:
+        checked_in_at = connection_record.info.pop('checked_in_at', None)
+        if (
+            config.pre_ping == PRE_PING_IDLE
+            and checked_in_at is not None
+            and time.monotonic() - checked_in_at > config.pre_ping_idle
+        ):
+            _ping(engine, dbapi_connection, metrics)
+        overflow = _pool_stat(metrics.pool, 'overflow')
+        metrics.record_checkout(overflow or 0)
+
+    @event.listens_for(engine, 'checkin')
+    def _on_checkin(dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+        connection_record.info['checked_in_at'] = time.monotonic()
+        metrics.record_checkin()
+
+    @event.listens_for(engine, 'invalidate')
+    def _on_invalidate(dbapi_connection: Any, connection_record: ConnectionPoolEntry, exception: Any) -> None:
+        metrics.increment('invalidations')
+
+    return metrics
+
+
+def instrument_round_trips(engine: Engine, metrics: RoundTripMetrics) -> None:
+    def _count(connection: Connection, counter: str) -> None:
+        metrics.increment(connection.get_execution_options().get(SESSION_MODE, READ_WRITE), counter)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _on_execute(connection: Connection, *args: Any) -> None:
+        _count(connection, 'statements')
+
+    @event.listens_for(engine, 'begin')
+    def _on_begin(connection: Connection) -> None:
+        _count(connection, 'begins')
+
+    @event.listens_for(engine, 'commit')
+    def _on_commit(connection: Connection) -> None:
+        _count(connection, 'commits')
+
+    @event.listens_for(engine, 'rollback')
+    def _on_rollback(connection: Connection) -> None:
+        _count(connection, 'rollbacks')
+
+
+def _ping(engine: Engine, dbapi_connection: Any, metrics: PoolMetrics) -> None:
+    metrics.increment('pings')
+    try:
+        engine.dialect.do_ping(dbapi_connection)
+    except engine.dialect.loaded_dbapi.Error as exc:
+        metrics.increment('ping_failures')
+        # the pool discards the connection and retries the checkout with a fresh one
+        raise DisconnectionError() from exc
@@ -0,0 +1,94 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from sqlalchemy import Connection, Engine, event
+
+logger = logging.getLogger(__name__)
+
+# connection.info key of the start time of the statement in flight
+_STARTED_AT = 'query_started_at'
+
+# `(?, ?, ?)` and other expanded IN lists, whatever the paramstyle
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+))*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+_current_stats: ContextVar['QueryStats | None'] = ContextVar('query_stats', default=None)
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDER_LIST.sub('(?)', _WHITESPACE.sub(' ', statement).strip())
+
+
+class QueryMonitor:
+    """
+    Statement count and database time of a unit of work, usually a request.
+
+    Cursor events of every engine record into the `QueryStats` of the enclosing `track()`, which follows
+    the request into the threadpool and asyncio tasks as a context variable. Statements outside `track()`
+    are not recorded.
+
+    When one statement shape runs `n_plus_one_threshold` times in a `track()` (`0` disables it), a likely
+    N+1 is logged, or raised as `NPlusOneError` with `raise_on_n_plus_one`.
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 0, raise_on_n_plus_one: bool = False) -> None:
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.raise_on_n_plus_one = raise_on_n_plus_one
+
+    def register(self) -> None:
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    @contextmanager
+    def track(self) -> Iterator[QueryStats]:
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            _current_stats.reset(token)
+
+    def _before_cursor_execute(
+        self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        if _current_stats.get() is not None:
+            conn.info[_STARTED_AT] = time.perf_counter()
+
+    def _after_cursor_execute(
+        self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        stats = _current_stats.get()
+        started_at = conn.info.pop(_STARTED_AT, None)
+        if stats is None or started_at is None:
+            return
+
+        stats.count += 1
+        stats.duration += time.perf_counter() - started_at
+        shape = statement_shape(statement)
+        stats.shapes[shape] += 1
+        if self.n_plus_one_threshold and stats.shapes[shape] == self.n_plus_one_threshold:
+            message = f'Possible N+1, statement ran {self.n_plus_one_threshold} times in one request: {shape}'
+            if self.raise_on_n_plus_one:
+                raise NPlusOneError(message)
+            logger.warning(message)
@@ -0,0 +1,115 @@
+import itertools
+import threading
+from typing import Any, Sequence
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import ORMExecuteState, Session
+
+ROUND_ROBIN = 'round_robin'
+LEAST_CONNECTIONS = 'least_connections'
+
+# session.info flag sending every statement of the session to the primary
+USE_PRIMARY = 'use_primary'
+
+# session modes, carried by connections as the `session_mode` execution option
+READ_WRITE = 'read_write'
+READ_ONLY = 'read_only'
+SESSION_MODE = 'session_mode'
+
+_read_only_engines: dict[Engine, Engine] = {}
+_read_only_engines_lock = threading.Lock()
+
+
+class ReadOnlySessionError(InvalidRequestError):
+    pass
+
+
+def read_only_engine(engine: Engine) -> Engine:
+    """
+    View of `engine` whose connections run `READ ONLY` transactions (on PostgreSQL).
+
+    Cached per engine: every option engine registers its own connect listener.
+    """
+
+    with _read_only_engines_lock:
+        if engine not in _read_only_engines:
+            _read_only_engines[engine] = engine.execution_options(
+                postgresql_readonly=True,
+                **{SESSION_MODE: READ_ONLY},
+            )
+        return _read_only_engines[engine]
+
+
+class ReplicaSelector:
+    def __init__(self, engines: Sequence[Engine], strategy: str = ROUND_ROBIN) -> None:
+        if strategy not in (ROUND_ROBIN, LEAST_CONNECTIONS):
+            raise ValueError(f'Unknown replica selection strategy: {strategy}')
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._cycle = itertools.cycle(self.engines)
+        self._lock = threading.Lock()
+
+    def select(self) -> Engine:
+        if self.strategy == LEAST_CONNECTIONS:
+            return min(self.engines, key=lambda engine: getattr(engine.pool, 'checkedout', lambda: 0)())
+        with self._lock:
+            return next(self._cycle)
+
+
+class RoutingSession(Session):
+    """
+    Session sending reads to a replica and everything else to the primary (the session bind).
+
+    A session sticks to the replica it picked first, so a request sees one consistent snapshot.
+    Once the session writes, or `pin_primary()` is called, all following statements go to the primary
+    so the request reads its own writes.
+
+    A `read_only` session runs `READ ONLY` transactions on whichever engine it uses and rejects writes.
+    """
+
+    def __init__(self, replica_selector: ReplicaSelector | None = None, read_only: bool = False, **kwargs: Any) -> None:
+        if read_only and isinstance(kwargs.get('bind'), Engine):
+            kwargs['bind'] = read_only_engine(kwargs['bind'])
+        super().__init__(**kwargs)
+        self.replica_selector = replica_selector
+        self.read_only = read_only
+        self._replica: Engine | None = None
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        if getattr(clause, 'is_dml', False):
+            pin_primary(self)
+        if self.replica_selector is None or self._flushing or self.info.get(USE_PRIMARY) or not _is_read(clause):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self._replica is None:
+            replica = self.replica_selector.select()
+            self._replica = read_only_engine(replica) if self.read_only else replica
+        return self._replica
+
+
+def _is_read(clause: Any) -> bool:
+    return bool(getattr(clause, 'is_select', False)) and getattr(clause, '_for_update_arg', None) is None
+
+
+def pin_primary(session: Session) -> None:
+    session.info[USE_PRIMARY] = True
+
+
+def reads_replica(session: Session) -> bool:
+    """Whether the session has read from a replica, so its rows may lag behind the primary."""
+
+    return getattr(session, '_replica', None) is not None
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _pin_primary_before_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    if getattr(session, 'read_only', False) and (session.new or session.dirty or session.deleted):
+        raise ReadOnlySessionError('Cannot write from a read-only session')
+    pin_primary(session)
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _reject_read_only_dml(orm_execute_state: ORMExecuteState) -> None:
+    is_dml = orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    if getattr(orm_execute_state.session, 'read_only', False) and is_dml:
+        raise ReadOnlySessionError('Cannot write from a read-only session')
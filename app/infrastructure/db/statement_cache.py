@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import URL, make_url
+
+PSYCOPG_DRIVERS = ('psycopg', 'psycopg_async')
+
+
+@dataclass
+class StatementCacheConfig:
+    # psycopg prepares a query server-side once it ran this many times on a connection, `None` never prepares
+    prepare_threshold: int | None = 5
+    # SQLAlchemy compiled-statement (SQL string) cache entries per engine
+    query_cache_size: int = 500
+
+
+def statement_options(db_url: str | URL, config: StatementCacheConfig) -> dict[str, Any]:
+    """
+    Keyword arguments for `create_engine()`/`create_async_engine()` applying `config`.
+
+    Prepare settings only apply to psycopg 3; other drivers just get the compiled cache size.
+    """
+
+    options: dict[str, Any] = {'query_cache_size': config.query_cache_size}
+    if make_url(db_url).get_driver_name() in PSYCOPG_DRIVERS:
+        options['connect_args'] = {'prepare_threshold': config.prepare_threshold}
+    return options
+
+
+def parse_prepare_threshold(value: str) -> int | None:
+    """`DB_PREPARE_THRESHOLD` value: a number of executions, or `off` to never prepare (PgBouncer-safe)."""
+
+    if value.strip().lower() in ('', 'off', 'none', 'false'):
+        return None
+    return int(value)
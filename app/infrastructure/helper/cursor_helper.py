@@ -0,0 +1,21 @@
+import base64
+import binascii
+
+import msgspec
+
+from app.domain.value_object.pagination_value_object import NEXT, PREV, Cursor
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    return base64.urlsafe_b64encode(msgspec.json.encode(cursor)).rstrip(b'=').decode()
+
+
+def decode_cursor(value: str) -> Cursor:
+    try:
+        data = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+        cursor = msgspec.json.decode(data, type=Cursor)
+    except (binascii.Error, ValueError, msgspec.DecodeError) as exc:
+        raise ValueError(f'Invalid cursor: {value}') from exc
+    if cursor.direction not in (NEXT, PREV):
+        raise ValueError(f'Invalid cursor direction: {cursor.direction}')
+    return cursor
@@ -1,6 +1,8 @@
 import logging
+import os
 import string
 import random
+from concurrent.futures import ThreadPoolExecutor
 
 from argon2 import PasswordHasher
 
@@ -14,6 +16,15 @@ def hash_password(password: str) -> str:
     return ph.hash(password=password)
 
 
+def hash_passwords(passwords: list[str], max_workers: int | None = None) -> list[str]:
+    # argon2 releases the GIL while hashing, so threads hash in parallel; each hash holds its memory cost
+    # (64 MiB by default), hence one worker per CPU rather than the executor's default
+    if len(passwords) <= 1:
+        return [hash_password(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(hash_password, passwords))
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         return ph.verify(hashed_password, plain_password)
@@ -0,0 +1,53 @@
+import logging
+from http import HTTPStatus
+
+from sqlalchemy.exc import DBAPIError
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.infrastructure.http.response import MsgSpecJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL SQLSTATE codes
+QUERY_CANCELED = '57014'
+LOCK_NOT_AVAILABLE = '55P03'
+
+RETRY_AFTER_SECONDS = '1'
+
+
+async def db_error_handler(request: Request, exc: Exception) -> Response:
+    """
+    Turn timeouts set by execution profiles into clean responses.
+
+    `statement_timeout` cancels the query (504), `lock_timeout` gives up on a busy row or table (503).
+    Any other database error is re-raised.
+    """
+
+    sqlstate = _sqlstate(exc)
+    if sqlstate == QUERY_CANCELED:
+        logger.warning(f'Statement timeout on {request.method} {request.url.path}: {exc}')
+        return MsgSpecJSONResponse({'detail': 'Database query timed out'}, status_code=HTTPStatus.GATEWAY_TIMEOUT)
+    if sqlstate == LOCK_NOT_AVAILABLE:
+        logger.warning(f'Lock timeout on {request.method} {request.url.path}: {exc}')
+        return MsgSpecJSONResponse(
+            {'detail': 'Database is busy, retry later'},
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            headers={'Retry-After': RETRY_AFTER_SECONDS},
+        )
+    raise exc
+
+
+async def pool_timeout_handler(request: Request, exc: Exception) -> Response:
+    return MsgSpecJSONResponse(
+        {'detail': 'Database is busy, retry later'},
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        headers={'Retry-After': RETRY_AFTER_SECONDS},
+    )
+
+
+def _sqlstate(exc: Exception) -> str | None:
+    if not isinstance(exc, DBAPIError):
+        return None
+    # psycopg 3 exposes `sqlstate`, psycopg2 `pgcode`
+    return getattr(exc.orig, 'sqlstate', None) or getattr(exc.orig, 'pgcode', None)
@@ -5,6 +5,7 @@ from typing import Callable, Awaitable, Any
 from starlette.requests import Request
 from starlette.responses import Response
 
+from app import query_monitor
 from app.infrastructure.helper.log_helper import mask_sensitive_values
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,9 @@ async def log_request_response_middleware(request: Request, call_next: Callable[
         logger.error(f'Error reading request body: {e}')
 
     response = await call_next(request)
+    # streamed bodies (no Content-Length) are passed through as they come, not held in memory
+    if 'content-length' not in response.headers:
+        return response
     chunks = []
     async for chunk in response.body_iterator:
         chunks.append(chunk)
@@ -41,3 +45,13 @@ async def log_request_response_middleware(request: Request, call_next: Callable[
         headers=dict(response.headers),
         media_type=response.media_type,
     )
+
+
+async def query_stats_middleware(request: Request, call_next: Callable[[Request], Awaitable[Any]]) -> Response:
+    with query_monitor.track() as stats:
+        response: Response = await call_next(request)
+
+    response.headers['X-DB-Query-Count'] = str(stats.count)
+    response.headers['X-DB-Time-Ms'] = str(stats.duration_ms)
+    logger.info(f'{request.method} {request.url.path} - {stats.count} queries in {stats.duration_ms} ms')
+    return response
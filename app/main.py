@@ -1,10 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
 
-from app.infrastructure.http.middleware import log_request_response_middleware
+from app import setting
+from app.infrastructure.http.exception_handler import db_error_handler, pool_timeout_handler
+from app.infrastructure.http.middleware import log_request_response_middleware, query_stats_middleware
 from app.infrastructure.http.response import MsgSpecJSONResponse
-from app.presentation.api.auth_api import auth_router
-from app.presentation.api.user_api import user_router
+from app.presentation.api.auth_api import auth_router, async_auth_router
+from app.presentation.api.health_api import health_router
+from app.presentation.api.user_api import user_router, async_user_router
 
 app = FastAPI(
     title='FastAPI Boilerplate',
@@ -23,7 +27,17 @@ app.add_middleware(
     allow_headers=['*'],
 )
 app.middleware('http')(log_request_response_middleware)
+app.middleware('http')(query_stats_middleware)
+
+# exception handler
+app.add_exception_handler(OperationalError, db_error_handler)
+app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
 
 # router
-app.include_router(auth_router, prefix='/api/v1')
-app.include_router(user_router, prefix='/api/v1')
+app.include_router(health_router, prefix='/api/v1')
+if setting.DB_ASYNC:
+    app.include_router(async_auth_router, prefix='/api/v1')
+    app.include_router(async_user_router, prefix='/api/v1')
+else:
+    app.include_router(auth_router, prefix='/api/v1')
+    app.include_router(user_router, prefix='/api/v1')
@@ -3,12 +3,13 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 from fastapi.params import Body
 
-from app.application.context import IContext
+from app.application.context import IContext, IAsyncContext
 from app.application.dto.auth_dto import LoginDTO, TokenPairDTO, RegisterDTO
-from app.presentation.dependency.context import get_context
+from app.presentation.dependency.context import get_context, get_async_context
 from app.application.use_case.auth import register_use_case, login_use_case
 
 auth_router = APIRouter(prefix='/auth', tags=['Auth'])
+async_auth_router = APIRouter(prefix='/auth', tags=['Auth'])
 
 
 @auth_router.post('/login/')
@@ -47,3 +48,41 @@ def register(
     ],
 ) -> TokenPairDTO:
     return register_use_case.execute(ctx, dto)
+
+
+@async_auth_router.post('/login/')
+async def login_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context(False))],
+    dto: Annotated[
+        LoginDTO,
+        Body(
+            examples=[
+                {
+                    'email': 'user@example.com',
+                    'password': 'password',
+                }
+            ]
+        ),
+    ],
+) -> TokenPairDTO:
+    return await login_use_case.execute_async(ctx, dto)
+
+
+@async_auth_router.post('/register/')
+async def register_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context(False))],
+    dto: Annotated[
+        RegisterDTO,
+        Body(
+            examples=[
+                {
+                    'email': 'user@example.com',
+                    'password': 'password',
+                    'first_name': 'John',
+                    'last_name': 'Doe',
+                }
+            ]
+        ),
+    ],
+) -> TokenPairDTO:
+    return await register_use_case.execute_async(ctx, dto)
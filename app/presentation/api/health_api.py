@@ -0,0 +1,34 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app import connection_pool, async_connection_pool, user_cache, user_history
+from app.presentation.dependency.db import get_read_only_authenticated_db
+
+health_router = APIRouter(prefix='/health', tags=['Health'])
+
+# pool, cache and writer internals are for operators, not anonymous callers
+AUTHENTICATED = [Depends(get_read_only_authenticated_db)]
+
+
+@health_router.get('/')
+def get_liveness() -> dict[str, str]:
+    return {'status': 'ok'}
+
+
+@health_router.get('/db/', dependencies=AUTHENTICATED)
+def get_db_pool_metrics() -> dict[str, Any]:
+    return {
+        'sync': connection_pool.metrics(),
+        'async': async_connection_pool.metrics(),
+    }
+
+
+@health_router.get('/cache/', dependencies=AUTHENTICATED)
+def get_cache_metrics() -> dict[str, Any]:
+    return {'user': user_cache.stats()}
+
+
+@health_router.get('/history/', dependencies=AUTHENTICATED)
+def get_history_metrics() -> dict[str, Any]:
+    return {'user': {**user_history.writer.stats(), 'enabled': user_history.enabled}}
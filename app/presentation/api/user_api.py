@@ -1,29 +1,60 @@
+import datetime
+from functools import partial
 from http import HTTPStatus
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Iterator, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query
+from fastapi.responses import StreamingResponse
 
-from app.application.context import IContext
-from app.presentation.dependency.context import get_context
-from app.application.dto.user_dto import UserDTO, CreateUserDTO, UserListDTO, UpdateUserDTO
+from app import async_connection_pool, connection_pool, setting
+from app.application.context import IContext, IAsyncContext
+from app.presentation.dependency.context import get_context, get_async_context
+from app.application.dto.user_dto import (
+    BulkResultDTO,
+    BulkUpdateUserDTO,
+    UserDTO,
+    CreateUserDTO,
+    UserListDTO,
+    UpdateUserDTO,
+)
 from app.application.use_case.user import (
+    bulk_create_user_use_case,
+    bulk_delete_user_use_case,
+    bulk_update_user_use_case,
     search_user_use_case,
     update_user_use_case,
     create_user_use_case,
     delete_user_use_case,
+    export_user_use_case,
     get_user_use_case,
 )
 
 user_router = APIRouter(prefix='/user', tags=['User'])
+async_user_router = APIRouter(prefix='/user', tags=['User'])
+
+BULK_DESCRIPTION = 'Items succeed or fail one by one, see `results`'
+COUNT_MODE_DESCRIPTION = (
+    '`exact` counts every matching user, also when paging with a `cursor`; `estimate` is the row estimate of '
+    'PostgreSQL, cheap but approximate; `none` leaves `count` null'
+)
 
 
 @user_router.get('/')
 def search_users(
-    ctx: Annotated[IContext, Depends(get_context())],
+    ctx: Annotated[IContext, Depends(get_context(read_only=True))],
     keyword: str | None = Query(None),
     email: str | None = Query(None),
-    limit: int = Query(10),
-    offset: int = Query(0),
+    limit: int = Query(10, ge=1, le=setting.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    count_mode: Literal['exact', 'estimate', 'none'] = Query('exact', description=COUNT_MODE_DESCRIPTION),
+    include_count: bool = Query(True, deprecated=True, description='`false` is `count_mode=none`'),
+    cursor: str | None = Query(None, description='`next_cursor` or `prev_cursor` of a page, `offset` is ignored'),
+    mode: Literal['substring', 'fulltext'] = Query('substring', description='`fulltext` ranks matches of all words'),
+    created_from: datetime.datetime | None = Query(None, description='Users created at or after'),
+    created_to: datetime.datetime | None = Query(None, description='Users created before'),
+    order_by: Literal['id', '-id', 'created_at', '-created_at', 'full_name', '-full_name'] = Query(
+        'id', description='`-` sorts descending; orderings other than `id` page with `offset`'
+    ),
 ) -> UserListDTO:
     return search_user_use_case.execute(
         ctx,
@@ -31,12 +62,55 @@ def search_users(
         email=email,
         limit=limit,
         offset=offset,
+        count_mode=count_mode if include_count else 'none',
+        cursor=cursor,
+        mode=mode,
+        created_from=created_from,
+        created_to=created_to,
+        order_by=order_by,
+    )
+
+
+@user_router.get('/export/', response_class=StreamingResponse)
+def export_users(
+    ctx: Annotated[IContext, Depends(get_context(read_only=True))],
+    fmt: Literal['ndjson', 'csv'] = Query('ndjson', alias='format'),
+    keyword: str | None = Query(None),
+    email: str | None = Query(None),
+) -> StreamingResponse:
+    chunks = export_user_use_case.execute(
+        partial(connection_pool.open_session, read_only=True), fmt, keyword=keyword, email=email
     )
+    return _export_response(chunks, fmt)
+
+
+@user_router.post('/bulk/', description=BULK_DESCRIPTION)
+def bulk_create_users(
+    ctx: Annotated[IContext, Depends(get_context())],
+    dtos: list[CreateUserDTO] = Body(min_length=1, max_length=setting.MAX_BULK_SIZE),
+) -> BulkResultDTO:
+    return bulk_create_user_use_case.execute(ctx, dtos)
+
+
+@user_router.patch('/bulk/', description=BULK_DESCRIPTION)
+def bulk_update_users(
+    ctx: Annotated[IContext, Depends(get_context())],
+    dtos: list[BulkUpdateUserDTO] = Body(min_length=1, max_length=setting.MAX_BULK_SIZE),
+) -> BulkResultDTO:
+    return bulk_update_user_use_case.execute(ctx, dtos)
+
+
+@user_router.delete('/bulk/', description=BULK_DESCRIPTION)
+def bulk_delete_users(
+    ctx: Annotated[IContext, Depends(get_context())],
+    user_ids: list[int] = Body(min_length=1, max_length=setting.MAX_BULK_SIZE),
+) -> BulkResultDTO:
+    return bulk_delete_user_use_case.execute(ctx, user_ids)
 
 
 @user_router.get('/{user_id}/')
 def get_user(
-    ctx: Annotated[IContext, Depends(get_context())],
+    ctx: Annotated[IContext, Depends(get_context(read_only=True))],
     user_id: int,
 ) -> UserDTO:
     return get_user_use_case.execute(ctx, user_id)
@@ -65,3 +139,113 @@ def delete_user(
     user_id: int,
 ) -> None:
     return delete_user_use_case.execute(ctx, user_id)
+
+
+@async_user_router.get('/')
+async def search_users_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context(read_only=True))],
+    keyword: str | None = Query(None),
+    email: str | None = Query(None),
+    limit: int = Query(10, ge=1, le=setting.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    count_mode: Literal['exact', 'estimate', 'none'] = Query('exact', description=COUNT_MODE_DESCRIPTION),
+    include_count: bool = Query(True, deprecated=True, description='`false` is `count_mode=none`'),
+    cursor: str | None = Query(None, description='`next_cursor` or `prev_cursor` of a page, `offset` is ignored'),
+    mode: Literal['substring', 'fulltext'] = Query('substring', description='`fulltext` ranks matches of all words'),
+    created_from: datetime.datetime | None = Query(None, description='Users created at or after'),
+    created_to: datetime.datetime | None = Query(None, description='Users created before'),
+    order_by: Literal['id', '-id', 'created_at', '-created_at', 'full_name', '-full_name'] = Query(
+        'id', description='`-` sorts descending; orderings other than `id` page with `offset`'
+    ),
+) -> UserListDTO:
+    return await search_user_use_case.execute_async(
+        ctx,
+        keyword=keyword,
+        email=email,
+        limit=limit,
+        offset=offset,
+        count_mode=count_mode if include_count else 'none',
+        cursor=cursor,
+        mode=mode,
+        created_from=created_from,
+        created_to=created_to,
+        order_by=order_by,
+    )
+
+
+@async_user_router.get('/export/', response_class=StreamingResponse)
+async def export_users_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context(read_only=True))],
+    fmt: Literal['ndjson', 'csv'] = Query('ndjson', alias='format'),
+    keyword: str | None = Query(None),
+    email: str | None = Query(None),
+) -> StreamingResponse:
+    chunks = export_user_use_case.execute_async(
+        partial(async_connection_pool.open_async_session, read_only=True), fmt, keyword=keyword, email=email
+    )
+    return _export_response(chunks, fmt)
+
+
+@async_user_router.post('/bulk/', description=BULK_DESCRIPTION)
+async def bulk_create_users_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context())],
+    dtos: list[CreateUserDTO] = Body(min_length=1, max_length=setting.MAX_BULK_SIZE),
+) -> BulkResultDTO:
+    return await bulk_create_user_use_case.execute_async(ctx, dtos)
+
+
+@async_user_router.patch('/bulk/', description=BULK_DESCRIPTION)
+async def bulk_update_users_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context())],
+    dtos: list[BulkUpdateUserDTO] = Body(min_length=1, max_length=setting.MAX_BULK_SIZE),
+) -> BulkResultDTO:
+    return await bulk_update_user_use_case.execute_async(ctx, dtos)
+
+
+@async_user_router.delete('/bulk/', description=BULK_DESCRIPTION)
+async def bulk_delete_users_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context())],
+    user_ids: list[int] = Body(min_length=1, max_length=setting.MAX_BULK_SIZE),
+) -> BulkResultDTO:
+    return await bulk_delete_user_use_case.execute_async(ctx, user_ids)
+
+
+@async_user_router.get('/{user_id}/')
+async def get_user_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context(read_only=True))],
+    user_id: int,
+) -> UserDTO:
+    return await get_user_use_case.execute_async(ctx, user_id)
+
+
+@async_user_router.post('/', status_code=HTTPStatus.CREATED)
+async def create_user_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context())],
+    dto: CreateUserDTO,
+) -> UserDTO:
+    return await create_user_use_case.execute_async(ctx, dto)
+
+
+@async_user_router.patch('/{user_id}/')
+async def update_user_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context())],
+    user_id: int,
+    dto: UpdateUserDTO,
+) -> UserDTO:
+    return await update_user_use_case.execute_async(ctx, user_id, dto)
+
+
+@async_user_router.delete('/{user_id}/', status_code=HTTPStatus.NO_CONTENT)
+async def delete_user_async(
+    ctx: Annotated[IAsyncContext, Depends(get_async_context())],
+    user_id: int,
+) -> None:
+    return await delete_user_use_case.execute_async(ctx, user_id)
+
+
+def _export_response(chunks: Iterator[bytes] | AsyncIterator[bytes], fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=export_user_use_case.MEDIA_TYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="users.{fmt}"'},
+    )
@@ -3,11 +3,22 @@ import logging
 from typing import Callable
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.application.context import IContext, ITranslator
+from app.application.context import IContext, IAsyncContext, ITranslator
 from app.domain.entity.user import User
-from app.presentation.dependency.db import get_db, get_authenticated_db
+from app.infrastructure.db.routing_session import pin_primary
+from app.presentation.dependency.db import (
+    get_db,
+    get_authenticated_db,
+    get_read_only_db,
+    get_read_only_authenticated_db,
+    get_async_db,
+    get_async_authenticated_db,
+    get_async_read_only_db,
+    get_async_read_only_authenticated_db,
+)
 from app.presentation.dependency.translator import Translator
 
 logger = logging.getLogger(__name__)
@@ -33,11 +44,64 @@ class AppContext:
         return self.translator.translate(msg)
 
 
-def get_context(is_authenticated: bool = True) -> Callable[[Session, Translator], IContext]:
+@dataclass
+class AsyncAppContext:
+    session: AsyncSession
+    user: 'User | None' = field(default=None)
+    translator: ITranslator | None = field(default=None)
+
+    def authenticate(self, user: User) -> None:
+        self.user = user
+        self.session.info['uid'] = user.id
+
+    def set_lang(self, lang: str) -> None:
+        if self.translator:
+            self.translator.set_lang(lang)
+
+    def t(self, msg: str) -> str:
+        if not self.translator:
+            return msg
+        return self.translator.translate(msg)
+
+
+def get_context(is_authenticated: bool = True, read_only: bool = False) -> Callable[[Session, Translator], IContext]:
+    """
+    Build the request context dependency.
+
+    `read_only` contexts run in a read-only, never committed session that may serve reads from replicas.
+    Other contexts are pinned to the primary once authentication (itself a replica read) is done.
+    """
+
+    if read_only:
+        get_session = get_read_only_authenticated_db if is_authenticated else get_read_only_db
+    else:
+        get_session = get_authenticated_db if is_authenticated else get_db
+
     def _get_context(
-        session: Session = Depends(get_db if not is_authenticated else get_authenticated_db),
+        session: Session = Depends(get_session),
         translator: Translator = Depends(Translator),
     ) -> IContext:
+        if not read_only:
+            pin_primary(session)
         return AppContext(session=session, translator=translator)
 
     return _get_context
+
+
+def get_async_context(
+    is_authenticated: bool = True, read_only: bool = False
+) -> Callable[[AsyncSession, Translator], IAsyncContext]:
+    if read_only:
+        get_session = get_async_read_only_authenticated_db if is_authenticated else get_async_read_only_db
+    else:
+        get_session = get_async_authenticated_db if is_authenticated else get_async_db
+
+    def _get_async_context(
+        session: AsyncSession = Depends(get_session),
+        translator: Translator = Depends(Translator),
+    ) -> IAsyncContext:
+        if not read_only:
+            pin_primary(session.sync_session)
+        return AsyncAppContext(session=session, translator=translator)
+
+    return _get_async_context
@@ -1,19 +1,28 @@
 import logging
-from typing import Annotated, Generator
+from typing import Annotated, Generator, AsyncGenerator
 
 from fastapi import Security, Depends
+from fastapi.concurrency import contextmanager_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import connection_pool
+from app import connection_pool, async_connection_pool
 from app.application.use_case.auth import authenticate_use_case
 
 logger = logging.getLogger(__name__)
 
 
-def get_db() -> Generator[Session, None, None]:
-    with connection_pool.open_session() as session:
-        yield session
+async def get_db() -> AsyncGenerator[Session, None]:
+    async with connection_pool.session_slot():
+        async with contextmanager_in_threadpool(connection_pool.open_session()) as session:
+            yield session
+
+
+async def get_read_only_db() -> AsyncGenerator[Session, None]:
+    async with connection_pool.session_slot():
+        async with contextmanager_in_threadpool(connection_pool.open_session(read_only=True)) as session:
+            yield session
 
 
 def get_authenticated_db(
@@ -21,3 +30,34 @@ def get_authenticated_db(
     session: Annotated[Session, Depends(get_db)],
 ) -> Generator[Session, None, None]:
     yield authenticate_use_case.execute(session, token.credentials)
+
+
+def get_read_only_authenticated_db(
+    token: Annotated[HTTPAuthorizationCredentials, Security(HTTPBearer(auto_error=True))],
+    session: Annotated[Session, Depends(get_read_only_db)],
+) -> Generator[Session, None, None]:
+    yield authenticate_use_case.execute(session, token.credentials)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_connection_pool.open_async_session() as session:
+        yield session
+
+
+async def get_async_read_only_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_connection_pool.open_async_session(read_only=True) as session:
+        yield session
+
+
+async def get_async_authenticated_db(
+    token: Annotated[HTTPAuthorizationCredentials, Security(HTTPBearer(auto_error=True))],
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    yield await authenticate_use_case.execute_async(session, token.credentials)
+
+
+async def get_async_read_only_authenticated_db(
+    token: Annotated[HTTPAuthorizationCredentials, Security(HTTPBearer(auto_error=True))],
+    session: Annotated[AsyncSession, Depends(get_async_read_only_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    yield await authenticate_use_case.execute_async(session, token.credentials)
@@ -0,0 +1,120 @@
+"""
+Side-by-side load benchmark of the sync (threadpool) and async (AsyncSession) request paths.
+
+Both routers are mounted on one in-process ASGI app, under `/sync` and `/async`, and hit
+with the same number of concurrent requests. Point `DB_URL` at a migrated PostgreSQL database:
+
+    PYTHONPATH=. uv run python benchmark/db_mode_benchmark.py --requests 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app import connection_pool, async_connection_pool
+from app.domain.entity.user import User
+from app.domain.repository import user_repository
+from app.infrastructure.helper.jwt_helper import generate_token_pair
+from app.infrastructure.helper.password_helper import hash_password
+from app.infrastructure.http.response import MsgSpecJSONResponse
+from app.presentation.api.user_api import user_router, async_user_router
+
+BENCH_EMAIL = 'benchmark-{index}@example.com'
+
+
+@dataclass
+class BenchmarkResult:
+    mode: str
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: list[float]
+
+    def report(self) -> str:
+        quantiles = statistics.quantiles(self.latencies, n=100)
+        return (
+            f'{self.mode:>5}: {self.requests / self.elapsed:8.1f} req/s | '
+            f'p50 {quantiles[49] * 1000:7.2f} ms | p95 {quantiles[94] * 1000:7.2f} ms | '
+            f'p99 {quantiles[98] * 1000:7.2f} ms | errors {self.errors}'
+        )
+
+
+def seed_users(count: int) -> list[int]:
+    password = hash_password('benchmark')
+    user_ids = []
+    with connection_pool.open_session() as session:
+        for index in range(count):
+            email = BENCH_EMAIL.format(index=index)
+            user = user_repository.find_by_email(session, email)
+            if not user:
+                user = user_repository.create(
+                    session, User(email=email, password=password, first_name='Bench', last_name=str(index))
+                )
+            user_ids.append(user.id)
+    return user_ids
+
+
+def build_app() -> FastAPI:
+    app = FastAPI(default_response_class=MsgSpecJSONResponse)
+    app.include_router(user_router, prefix='/sync')
+    app.include_router(async_user_router, prefix='/async')
+    return app
+
+
+async def run_mode(app: FastAPI, mode: str, user_ids: list[int], total: int, concurrency: int) -> BenchmarkResult:
+    access, _ = generate_token_pair(user_ids[0])
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url=f'http://benchmark/{mode}',
+        headers={'Authorization': f'Bearer {access}'},
+    ) as client:
+
+        async def one(index: int) -> None:
+            nonlocal errors
+            # mix of detail and list calls, the two hottest read endpoints
+            path = f'/user/{user_ids[index % len(user_ids)]}/' if index % 2 else '/user/?limit=10'
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return BenchmarkResult(mode=mode, requests=total, errors=errors, elapsed=elapsed, latencies=latencies)
+
+
+async def main(total: int, concurrency: int, users: int) -> None:
+    user_ids = seed_users(users)
+    app = build_app()
+
+    # warm up both pools so connection establishment is not measured
+    for mode in ('sync', 'async'):
+        await run_mode(app, mode, user_ids, min(total, concurrency), concurrency)
+
+    for mode in ('sync', 'async'):
+        result = await run_mode(app, mode, user_ids, total, concurrency)
+        print(result.report())
+
+    await async_connection_pool.engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per mode')
+    parser.add_argument('--concurrency', type=int, default=100, help='in-flight requests')
+    parser.add_argument('--users', type=int, default=100, help='users to seed and read')
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.users))
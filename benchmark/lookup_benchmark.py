@@ -0,0 +1,87 @@
+"""
+Cost per call of the ways to look a user up by primary key, as `find_by_id` did and does now.
+
+- `query()`: legacy `session.query(User).filter(User.id == id).first()`, rebuilt and run on every call
+- `select()`: 2.0-style statement, rebuilt on every call, its SQL string from the compiled cache
+- `lambda_stmt()`: the statement is built once per code location, later calls only extract the parameters
+- `session.get()`: returns the instance in the identity map without SQL, otherwise runs a cached statement
+
+`in session` repeats lookups of users already loaded by the session, as `user_service.read` does after
+authentication in the same request; `not in session` empties the identity map before each call. The user cache
+is bypassed, so only statement overhead and round trips are measured. Works on any `DB_URL`, e.g. SQLite:
+
+    PYTHONPATH=. uv run python benchmark/lookup_benchmark.py --calls 20000
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app import connection_pool
+from app.domain.entity.user import User
+from app.domain.repository import user_repository
+from app.infrastructure.db.base import Base
+
+BENCH_EMAIL = 'lookup-bench-{index}@example.com'
+
+Lookup = Callable[[Session, int], Any]
+
+LOOKUPS: dict[str, Lookup] = {
+    'query()': lambda session, user_id: session.query(User).filter(User.id == user_id).first(),
+    'select()': lambda session, user_id: session.scalars(select(User).where(User.id == user_id)).first(),
+    'lambda_stmt()': lambda session, user_id: session.scalars(
+        lambda_stmt(lambda: select(User).where(User.id == user_id))
+    ).first(),
+    'session.get()': lambda session, user_id: session.get(User, user_id),
+}
+
+
+def seed_users(count: int) -> list[int]:
+    Base.metadata.create_all(connection_pool.engine)
+    user_ids = []
+    with connection_pool.open_session() as session:
+        for index in range(count):
+            email = BENCH_EMAIL.format(index=index)
+            user = user_repository.find_by_email(session, email)
+            if not user:
+                user = user_repository.create(
+                    session, User(email=email, password='benchmark', first_name='Bench', last_name=str(index))
+                )
+            user_ids.append(user.id)
+    return user_ids
+
+
+def time_lookup(lookup: Lookup, user_ids: list[int], calls: int, in_session: bool) -> float:
+    with connection_pool.open_session(read_only=True) as session:
+        # the identity map holds instances weakly, a request keeps the ones it uses referenced
+        _loaded = [lookup(session, user_id) for user_id in user_ids]
+        elapsed = 0.0
+        for index in range(calls):
+            if not in_session:
+                session.expunge_all()
+            start = time.perf_counter()
+            lookup(session, user_ids[index % len(user_ids)])
+            elapsed += time.perf_counter() - start
+        return elapsed / calls
+
+
+def main(calls: int, users: int) -> None:
+    user_ids = seed_users(users)
+
+    print(f'{"":>16}' + ''.join(f'{name:>18}' for name in LOOKUPS))
+    for mode, in_session in (('in session', True), ('not in session', False)):
+        row = ''.join(
+            f'{time_lookup(lookup, user_ids, calls, in_session) * 1e6:>15.1f} us' for lookup in LOOKUPS.values()
+        )
+        print(f'{mode:>16}{row}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=5000, help='calls per lookup and mode')
+    parser.add_argument('--users', type=int, default=100, help='users to seed and read')
+    args = parser.parse_args()
+    main(args.calls, args.users)
@@ -0,0 +1,145 @@
+"""
+Cost per call of the hot repository reads under different statement cache settings.
+
+Each scenario gets its own `ConnectionPool`, and so its own connections and caches:
+
+- `no cache`: SQLAlchemy compiles every statement, psycopg never prepares
+- `compiled cache`: SQL strings come from the compiled cache, still parsed and planned by PostgreSQL each time
+- `cache + prepare`: psycopg also prepares a query server-side after `DB_PREPARE_THRESHOLD` executions
+
+On PostgreSQL, the planning time of each query (from `EXPLAIN ANALYZE`) is printed as well: it is what a
+prepared statement stops paying on every call. Point `DB_URL` at a migrated database:
+
+    PYTHONPATH=. uv run python benchmark/statement_cache_benchmark.py --calls 5000
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import setting
+from app.domain.entity.user import User
+from app.domain.repository import user_repository
+from app.infrastructure.db.connection_pool import ConnectionPool
+from app.infrastructure.db.statement_cache import StatementCacheConfig
+from app.infrastructure.helper.password_helper import hash_password
+
+BENCH_EMAIL = 'statement-bench-{index}@example.com'
+
+Operation = Callable[[Session, int], Any]
+
+
+def find_by_id(session: Session, user_id: int) -> User | None:
+    # the query `user_repository.find_by_id` sends on a miss: there, the entity cache and the identity map would
+    # answer most calls without reaching PostgreSQL
+    session.expunge_all()
+    return session.get(User, user_id, options=user_repository.READ_OPTIONS)
+
+
+def operations(user_ids: list[int]) -> dict[str, Operation]:
+    return {
+        'find_by_id': lambda session, index: find_by_id(session, user_ids[index % len(user_ids)]),
+        'find_by_email': lambda session, index: user_repository.find_by_email(
+            session, BENCH_EMAIL.format(index=index % len(user_ids))
+        ),
+        'search': lambda session, index: user_repository.search(session, keyword='bench', eager=True, limit=10),
+    }
+
+
+def scenarios() -> dict[str, StatementCacheConfig]:
+    threshold = setting.DB_PREPARE_THRESHOLD if setting.DB_PREPARE_THRESHOLD is not None else 5
+    return {
+        'no cache': StatementCacheConfig(prepare_threshold=None, query_cache_size=0),
+        'compiled cache': StatementCacheConfig(prepare_threshold=None, query_cache_size=setting.DB_QUERY_CACHE_SIZE),
+        'cache + prepare': StatementCacheConfig(
+            prepare_threshold=threshold, query_cache_size=setting.DB_QUERY_CACHE_SIZE
+        ),
+    }
+
+
+def seed_users(pool: ConnectionPool, count: int) -> list[int]:
+    password = hash_password('benchmark')
+    user_ids = []
+    with pool.open_session() as session:
+        for index in range(count):
+            email = BENCH_EMAIL.format(index=index)
+            user = user_repository.find_by_email(session, email)
+            if not user:
+                user = user_repository.create(
+                    session, User(email=email, password=password, first_name='Bench', last_name=str(index))
+                )
+            user_ids.append(user.id)
+    return user_ids
+
+
+def time_operation(pool: ConnectionPool, operation: Operation, calls: int) -> float:
+    # one session holds one connection, so psycopg's per-connection prepared statements are reused
+    with pool.open_session(read_only=True) as session:
+        for index in range(min(calls, 10)):
+            operation(session, index)
+        start = time.perf_counter()
+        for index in range(calls):
+            operation(session, index)
+        return (time.perf_counter() - start) / calls
+
+
+def planning_times(pool: ConnectionPool, ops: dict[str, Operation]) -> dict[str, float]:
+    """Planning time in ms of the statements each operation sends, summed."""
+
+    times = {}
+    with pool.engine.connect() as connection:
+        for name, operation in ops.items():
+            statements: list[tuple[str, Any]] = []
+
+            def capture(conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any) -> None:
+                statements.append((statement, parameters))
+
+            event.listen(pool.engine, 'before_cursor_execute', capture)
+            try:
+                with pool.open_session(read_only=True) as session:
+                    operation(session, 0)
+            finally:
+                event.remove(pool.engine, 'before_cursor_execute', capture)
+
+            total = 0.0
+            for statement, parameters in statements:
+                plan = connection.exec_driver_sql(
+                    f'EXPLAIN (ANALYZE, FORMAT JSON) {statement}', parameters
+                ).scalar_one()
+                total += (json.loads(plan) if isinstance(plan, str) else plan)[0]['Planning Time']
+            times[name] = total
+    return times
+
+
+def main(calls: int, users: int) -> None:
+    pools = {
+        name: ConnectionPool(setting.DB_URL, pool_config=setting.pool_config, statement_cache_config=config)
+        for name, config in scenarios().items()
+    }
+    user_ids = seed_users(next(iter(pools.values())), users)
+    ops = operations(user_ids)
+
+    print(f'{"":>16}' + ''.join(f'{name:>18}' for name in ops))
+    for name, pool in pools.items():
+        row = ''.join(f'{time_operation(pool, operation, calls) * 1e6:>15.1f} us' for operation in ops.values())
+        print(f'{name:>16}{row}')
+
+    primary = next(iter(pools.values()))
+    if primary.engine.dialect.name == 'postgresql':
+        row = ''.join(f'{ms * 1000:>15.1f} us' for ms in planning_times(primary, ops).values())
+        print(f'{"planning time":>16}{row}')
+
+    for pool in pools.values():
+        pool.engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=2000, help='calls per operation and scenario')
+    parser.add_argument('--users', type=int, default=100, help='users to seed and read')
+    args = parser.parse_args()
+    main(args.calls, args.users)
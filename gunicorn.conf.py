@@ -0,0 +1,26 @@
+import multiprocessing
+from typing import Any
+
+import decouple
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+worker_class = 'uvicorn.workers.UvicornWorker'
+# one event loop per core; every worker opens its own DB_POOL_SIZE + DB_MAX_OVERFLOW connections
+workers = decouple.config('WEB_CONCURRENCY', default=multiprocessing.cpu_count(), cast=int)
+
+# import the app once in the master, workers share its memory copy-on-write and boot without re-importing
+preload_app = True
+
+# recycle workers regularly, the jitter keeps them from restarting all at once
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=10000, cast=int)
+max_requests_jitter = decouple.config('GUNICORN_MAX_REQUESTS_JITTER', default=1000, cast=int)
+
+timeout = decouple.config('GUNICORN_TIMEOUT', default=60, cast=int)
+graceful_timeout = decouple.config('GUNICORN_GRACEFUL_TIMEOUT', default=30, cast=int)
+keepalive = 5
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    from app.infrastructure.config.lifecycle import after_fork
+
+    after_fork()
@@ -0,0 +1,60 @@
+"""add user full name column
+
+Revision ID: 0b7e4d2c9a15
+Revises: f3a9c2d81b54
+Create Date: 2026-10-17 15:48:31.902174
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4d2c9a15'
+down_revision: Union[str, None] = 'f3a9c2d81b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a stored generated column rewrites the table under an exclusive lock, plan it for a quiet window
+    op.add_column(
+        'user',
+        sa.Column(
+            'full_name',
+            sa.String(),
+            sa.Computed("coalesce(first_name, '') || ' ' || coalesce(last_name, '')", persisted=True),
+            nullable=False,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        # searches filter on the column now, the expression index no longer matches them
+        op.create_index(
+            'ix_user_full_name_trgm_new',
+            'user',
+            ['full_name'],
+            postgresql_using='gin',
+            postgresql_ops={'full_name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_user_full_name_trgm', table_name='user', postgresql_concurrently=True)
+        op.execute('ALTER INDEX ix_user_full_name_trgm_new RENAME TO ix_user_full_name_trgm')
+        op.create_index('ix_user_full_name', 'user', ['full_name', 'id'], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_full_name', table_name='user', postgresql_concurrently=True)
+        op.create_index(
+            'ix_user_full_name_trgm_old',
+            'user',
+            [sa.text("(coalesce(first_name, '') || ' ' || coalesce(last_name, '')) gin_trgm_ops")],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_user_full_name_trgm', table_name='user', postgresql_concurrently=True)
+        op.execute('ALTER INDEX ix_user_full_name_trgm_old RENAME TO ix_user_full_name_trgm')
+    op.drop_column('user', 'full_name')
@@ -0,0 +1,60 @@
+"""append user row count deltas
+
+Revision ID: 5d2a8e4c1f67
+Revises: c8f4b1e6a973
+Create Date: 2026-10-17 21:08:43.527194
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a8e4c1f67'
+down_revision: Union[str, None] = 'c8f4b1e6a973'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_function(insert_sql: str, delete_sql: str, truncate_sql: str) -> None:
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION user_row_count() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {insert_sql};
+            ELSIF TG_OP = 'DELETE' THEN
+                {delete_sql};
+            ELSE
+                {truncate_sql};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+
+
+def upgrade() -> None:
+    # the single row becomes the first delta: writers append rows instead of all updating it
+    _replace_function(
+        'INSERT INTO user_row_count SELECT count(*) FROM changed_rows',
+        'INSERT INTO user_row_count SELECT -count(*) FROM changed_rows',
+        'DELETE FROM user_row_count',
+    )
+
+
+def downgrade() -> None:
+    # writes wait, so no delta is appended between the fold and the old function
+    op.execute('LOCK TABLE "user" IN SHARE ROW EXCLUSIVE MODE')
+    op.execute(
+        'WITH folded AS (DELETE FROM user_row_count RETURNING row_count) '
+        'INSERT INTO user_row_count SELECT coalesce(sum(row_count), 0) FROM folded'
+    )
+    _replace_function(
+        'UPDATE user_row_count SET row_count = row_count + (SELECT count(*) FROM changed_rows)',
+        'UPDATE user_row_count SET row_count = row_count - (SELECT count(*) FROM changed_rows)',
+        'UPDATE user_row_count SET row_count = 0',
+    )
@@ -0,0 +1,35 @@
+"""add user created_at brin index
+
+Revision ID: 6e1d8f3b7c20
+Revises: 0b7e4d2c9a15
+Create Date: 2026-10-17 17:05:44.517093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1d8f3b7c20'
+down_revision: Union[str, None] = '0b7e4d2c9a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_created_at_brin',
+            'user',
+            ['created_at'],
+            postgresql_using='brin',
+            postgresql_with={'autosummarize': 'on'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_created_at_brin', table_name='user', postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""add user trigram indexes
+
+Revision ID: 8c3f5a1d2e7b
+Revises: 195e8cd3df2b
+Create Date: 2026-10-17 10:04:18.227391
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f5a1d2e7b'
+down_revision: Union[str, None] = '195e8cd3df2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # built without blocking writes, which needs to run outside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_email_trgm',
+            'user',
+            ['email'],
+            postgresql_using='gin',
+            postgresql_ops={'email': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        # the exact expression of `User.full_name`, or the planner won't match queries to it
+        op.create_index(
+            'ix_user_full_name_trgm',
+            'user',
+            [sa.text("(coalesce(first_name, '') || ' ' || coalesce(last_name, '')) gin_trgm_ops")],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_full_name_trgm', table_name='user', postgresql_concurrently=True)
+        op.drop_index('ix_user_email_trgm', table_name='user', postgresql_concurrently=True)
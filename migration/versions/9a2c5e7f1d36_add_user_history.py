@@ -0,0 +1,39 @@
+"""add user history
+
+Revision ID: 9a2c5e7f1d36
+Revises: 6e1d8f3b7c20
+Create Date: 2026-10-17 18:21:09.774612
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a2c5e7f1d36'
+down_revision: Union[str, None] = '6e1d8f3b7c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_history',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(length=6), nullable=False),
+        sa.Column('changes', postgresql.JSONB(), nullable=False),
+        sa.Column('changed_user_id', sa.Integer(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_history_user_id_changed_at', 'user_history', ['user_id', 'changed_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_history_user_id_changed_at', table_name='user_history')
+    op.drop_table('user_history')
@@ -0,0 +1,28 @@
+"""add user last_seen_at
+
+Revision ID: c8f4b1e6a973
+Revises: 9a2c5e7f1d36
+Create Date: 2026-10-17 19:34:52.106388
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f4b1e6a973'
+down_revision: Union[str, None] = '9a2c5e7f1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # nullable without a default, so PostgreSQL adds it without rewriting the table
+    op.add_column('user', sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'last_seen_at')
@@ -0,0 +1,43 @@
+"""add user search vector
+
+Revision ID: d41e7b90c6a2
+Revises: 8c3f5a1d2e7b
+Create Date: 2026-10-17 11:37:52.604915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e7b90c6a2'
+down_revision: Union[str, None] = '8c3f5a1d2e7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a stored generated column rewrites the table under an exclusive lock, plan it for a quiet window
+    op.execute(
+        'ALTER TABLE "user" ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ('
+        "setweight(to_tsvector('simple', coalesce(first_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(last_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', replace(email, '@', ' ')), 'B')"
+        ') STORED'
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_search_vector',
+            'user',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_search_vector', table_name='user', postgresql_concurrently=True)
+    op.drop_column('user', 'search_vector')
@@ -0,0 +1,61 @@
+"""add user row count
+
+Revision ID: f3a9c2d81b54
+Revises: d41e7b90c6a2
+Create Date: 2026-10-17 14:12:06.318420
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c2d81b54'
+down_revision: Union[str, None] = 'd41e7b90c6a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # writes wait until the triggers exist, so none is missed between the initial count and the first trigger
+    op.execute('LOCK TABLE "user" IN SHARE ROW EXCLUSIVE MODE')
+    op.execute('CREATE TABLE user_row_count (row_count bigint NOT NULL)')
+    op.execute('INSERT INTO user_row_count SELECT count(*) FROM "user"')
+    op.execute(
+        """
+        CREATE FUNCTION user_row_count() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE user_row_count SET row_count = row_count + (SELECT count(*) FROM changed_rows);
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE user_row_count SET row_count = row_count - (SELECT count(*) FROM changed_rows);
+            ELSE
+                UPDATE user_row_count SET row_count = 0;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        'CREATE TRIGGER user_row_count_insert AFTER INSERT ON "user" REFERENCING NEW TABLE AS changed_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION user_row_count()'
+    )
+    op.execute(
+        'CREATE TRIGGER user_row_count_delete AFTER DELETE ON "user" REFERENCING OLD TABLE AS changed_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION user_row_count()'
+    )
+    op.execute(
+        'CREATE TRIGGER user_row_count_truncate AFTER TRUNCATE ON "user" '
+        'FOR EACH STATEMENT EXECUTE FUNCTION user_row_count()'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER user_row_count_truncate ON "user"')
+    op.execute('DROP TRIGGER user_row_count_delete ON "user"')
+    op.execute('DROP TRIGGER user_row_count_insert ON "user"')
+    op.execute('DROP FUNCTION user_row_count()')
+    op.execute('DROP TABLE user_row_count')
@@ -27,12 +27,15 @@ class TestAuthenticateUseCase:
         )
         mocker.patch('app.domain.repository.user_repository.find_by_id', return_value=fake_user)
 
+        touch = mocker.patch('app.application.use_case.auth.authenticate_use_case.user_activity.touch')
+
         # Act
         result = authenticate_use_case.execute(session, token)
 
         # Assert
         assert result == session
         assert session.info['uid'] == fake_user_id
+        touch.assert_called_once_with(fake_user_id)
 
     def test_execute_expired_token_raises_401(self, mocker):
         # Arrange
@@ -1,13 +1,15 @@
 from uuid import uuid4
 
 import pytest
-from typing import Generator
+from typing import Generator, AsyncGenerator
 
 from sqlalchemy import create_engine, StaticPool, Engine, text
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
 
 from app.infrastructure.db.base import Base
-from app import connection_pool, setting
+from app.infrastructure.db.routing_session import RoutingSession
+from app import connection_pool, async_connection_pool, setting, user_activity, user_cache, user_history
 
 
 @pytest.fixture(scope='session')
@@ -20,16 +22,58 @@ def _engine() -> Generator[Engine, None, None]:
 @pytest.fixture(autouse=True)
 def setup_test(_engine) -> Generator[None, None, None]:
     connection_pool.engine = _engine
-    connection_pool.session_factory = scoped_session(
-        sessionmaker(bind=connection_pool.engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    connection_pool.session_factory = sessionmaker(
+        class_=RoutingSession, bind=connection_pool.engine, autocommit=False, autoflush=False, expire_on_commit=False
     )
     Base.metadata.create_all(bind=connection_pool.engine)
+    # ids are reused once the tables are recreated
+    user_cache.clear()
+    # background writers would share the test connection; tests of them enable them and flush themselves
+    user_history.enabled = False
+    user_activity.enabled = False
     yield
     Base.metadata.drop_all(bind=connection_pool.engine)
 
 
+@pytest.fixture
+def history(monkeypatch) -> Generator[list[dict], None, None]:
+    """Enable the user history. Committed rows are collected in the returned list, the writer never starts."""
+
+    rows: list[dict] = []
+    monkeypatch.setattr(user_history, 'enabled', True)
+    monkeypatch.setattr(user_history.writer, 'put', rows.extend)
+    yield rows
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.fixture
+async def setup_test_async(anyio_backend) -> AsyncGenerator[None, None]:
+    """
+    Fixture for tests that run through `AsyncConnectionPool`.
+
+    The async engine keeps its own in-memory database, so data used by async tests
+    must be created through `async_connection_pool` as well.
+    """
+
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:', poolclass=StaticPool)
+    async_connection_pool.engine = engine
+    async_connection_pool.session_factory = async_sessionmaker(
+        bind=engine, sync_session_class=RoutingSession, autocommit=False, autoflush=False, expire_on_commit=False
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+
 @pytest.fixture(scope='session')
 def _engine_pg() -> Generator[Engine, None, None]:
+    if setting.db_url.get_backend_name() != 'postgresql':
+        pytest.skip('DB_URL is not a PostgreSQL database')
     default_engine = create_engine(setting.db_url.set(database='postgres'))
     db_test_name = f'db_test_{uuid4().hex}'
     with default_engine.connect() as connection:
@@ -60,8 +104,8 @@ def setup_test_pg(_engine_pg) -> Generator[None, None, None]:
     """
 
     connection_pool.engine = _engine_pg
-    connection_pool.session_factory = scoped_session(
-        sessionmaker(bind=connection_pool.engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    connection_pool.session_factory = sessionmaker(
+        class_=RoutingSession, bind=connection_pool.engine, autocommit=False, autoflush=False, expire_on_commit=False
     )
     Base.metadata.create_all(connection_pool.engine)
     yield
@@ -22,7 +22,7 @@ Test coverage includes:
 - SQLAlchemy session management and relationship loading
 
 Note: Some tests use SQLite in-memory database which may not fully support
-all PostgreSQL-specific features like server_onupdate triggers.
+all PostgreSQL-specific features.
 """
 
 import datetime
@@ -117,21 +117,19 @@ class TestAuditMixin:
             session.refresh(entity)
 
             original_created_at = entity.created_at
-
-        # Note: SQLite with in-memory DB might not support server_onupdate properly
-        # This test verifies basic behavior but may need PostgreSQL for full functionality
+            # an old value, so the change shows even within the second of CURRENT_TIMESTAMP on SQLite
+            entity.updated_at = datetime.datetime(2000, 1, 1)
+            session.commit()
 
         # Act
         with connection_pool.open_session() as session:
             entity = session.get(TestEntity, entity.id)
             entity.name = 'updated name'
             session.commit()
-            session.refresh(entity)
 
         # Assert
         assert entity.created_at == original_created_at  # created_at should not change
-        # Note: In SQLite, server_onupdate may not work, so we just verify it's still a datetime
-        assert isinstance(entity.updated_at, datetime.datetime)
+        assert entity.updated_at > datetime.datetime(2000, 1, 1)
 
     def test_created_user_id_can_be_set(self, test_user):
         """Test that created_user_id can be set to reference a user"""
@@ -0,0 +1,228 @@
+import datetime
+
+import pytest
+from faker import Faker
+from sqlalchemy import update
+
+from app import async_connection_pool, user_cache
+from app.domain.entity.user import User
+from app.domain.repository import async_user_repository
+
+fake = Faker()
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def setup_users(setup_test_async) -> list[User]:
+    users = [
+        User(
+            email=fake.unique.email(),
+            password=fake.sha256(),
+            first_name=fake.unique.first_name(),
+            last_name=fake.last_name(),
+        )
+        for _ in range(3)
+    ]
+    async with async_connection_pool.open_async_session() as session:
+        session.add_all(users)
+    return users
+
+
+class TestAsyncSearchUser:
+    async def test_search_no_filter(self, setup_users):
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            results, count = await async_user_repository.search(session)
+
+        # Assert
+        assert count == 3
+        assert len(results) == 3
+
+    async def test_search_eager_does_not_load_password(self, setup_users, mocker):
+        # Arrange
+        execute = mocker.spy(async_connection_pool.engine.sync_engine.dialect, 'do_execute')
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            results, _ = await async_user_repository.search(session, eager=True)
+
+        # Assert
+        assert len(results) == 3
+        assert not any('password' in call.args[1] for call in execute.call_args_list)
+
+    async def test_search_by_email(self, setup_users):
+        # Arrange
+        target_user = setup_users[1]
+        keyword = target_user.email.split('@')[0]
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            results, count = await async_user_repository.search(session, email=keyword)
+
+        # Assert
+        assert count == 1
+        assert results[0].id == target_user.id
+
+    async def test_search_counts_all_filtered_rows(self, setup_users):
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            results, count = await async_user_repository.search(session, limit=1, offset=1)
+            _, no_count = await async_user_repository.search(session, limit=1, count_mode='none')
+
+        # Assert
+        assert len(results) == 1
+        assert count == 3
+        assert no_count is None
+
+    async def test_search_eager_loads_relationships(self, setup_users):
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            results, _ = await async_user_repository.search(session, eager=True)
+
+        # Assert
+        assert all(user.created_user is None for user in results)
+
+
+class TestAsyncFindUser:
+    async def test_find_by_id(self, setup_users):
+        # Arrange
+        target_user = setup_users[0]
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            user = await async_user_repository.find_by_id(session, target_user.id)
+
+        # Assert
+        assert user is not None
+        assert user.email == target_user.email
+
+    async def test_find_by_id_eager_is_served_from_cache(self, setup_users):
+        # Arrange
+        target_user = setup_users[0]
+        async with async_connection_pool.open_async_session() as session:
+            await async_user_repository.find_by_id(session, target_user.id, eager=True)
+        hits = user_cache.stats()['hits']
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            user = await async_user_repository.find_by_id(session, target_user.id, eager=True)
+            created_user = user.created_user
+
+        # Assert
+        assert user.email == target_user.email
+        assert created_user is None
+        assert user_cache.stats()['hits'] == hits + 1
+
+    async def test_find_by_id_eager_reads_last_seen_at_past_the_cache(self, setup_users):
+        # Arrange
+        target_user = setup_users[0]
+        seen_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+        async with async_connection_pool.open_async_session() as session:
+            await async_user_repository.find_by_id(session, target_user.id, eager=True)
+        # written like the last-seen tracker does, on the table: the cached row stays
+        table = User.__table__
+        async with async_connection_pool.open_async_session() as session:
+            await session.execute(update(table).where(table.c.id == target_user.id).values(last_seen_at=seen_at))
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            user = await async_user_repository.find_by_id(session, target_user.id, eager=True)
+            last_seen_at = user.last_seen_at
+
+        # Assert
+        assert 'last_seen_at' not in user_cache.get(target_user.id)
+        assert last_seen_at.replace(tzinfo=datetime.UTC) == seen_at
+
+    async def test_find_by_email_returns_none_for_unknown(self, setup_users):
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            user = await async_user_repository.find_by_email(session, fake.unique.email())
+
+        # Assert
+        assert user is None
+
+
+class TestAsyncWriteUser:
+    async def test_create_sets_audit_fields(self, setup_users):
+        # Arrange
+        creator = setup_users[0]
+        user = User(email=fake.unique.email(), password=fake.sha256(), first_name='New', last_name='User')
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            session.info['uid'] = creator.id
+            new_user = await async_user_repository.create(session, user)
+
+        # Assert
+        assert new_user.id is not None
+        assert new_user.created_at is not None
+        assert new_user.created_user is not None
+        assert new_user.created_user.id == creator.id
+
+    async def test_update_and_delete(self, setup_users):
+        # Arrange
+        target_user = setup_users[2]
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            user = await async_user_repository.find_by_id(session, target_user.id)
+            user.first_name = 'Updated'
+            await async_user_repository.update(session, user)
+        async with async_connection_pool.open_async_session() as session:
+            updated = await async_user_repository.find_by_id(session, target_user.id)
+            first_name = updated.first_name
+            await async_user_repository.delete(session, updated)
+        async with async_connection_pool.open_async_session() as session:
+            deleted = await async_user_repository.find_by_id(session, target_user.id)
+
+        # Assert
+        assert first_name == 'Updated'
+        assert deleted is None
+
+
+class TestAsyncStreamUser:
+    async def test_stream_yields_batches(self, setup_users):
+        # Act
+        async with async_connection_pool.open_async_session(read_only=True) as session:
+            batches = [batch async for batch in async_user_repository.stream(session, batch_size=2)]
+
+        # Assert
+        assert [[row.email for row in batch] for batch in batches] == [
+            [setup_users[0].email, setup_users[1].email],
+            [setup_users[2].email],
+        ]
+
+
+class TestAsyncBulkUser:
+    async def test_bulk_create_update_delete(self, setup_users):
+        # Arrange
+        row = {'email': 'bulk@example.com', 'password': 'hashed', 'first_name': 'Bulk', 'last_name': 'User'}
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            ids = await async_user_repository.bulk_create(session, [row, {**row, 'email': setup_users[0].email}])
+        async with async_connection_pool.open_async_session() as session:
+            await async_user_repository.bulk_update(session, [{'id': ids['bulk@example.com'], 'first_name': 'Changed'}])
+        async with async_connection_pool.open_async_session() as session:
+            user = await async_user_repository.find_by_id(session, ids['bulk@example.com'])
+            first_name = user.first_name
+            deleted = await async_user_repository.bulk_delete(session, [user.id, 0])
+
+        # Assert
+        assert list(ids) == ['bulk@example.com']
+        assert first_name == 'Changed'
+        assert deleted == [ids['bulk@example.com']]
+
+    async def test_bulk_update_records_old_values(self, setup_users, history):
+        # Arrange
+        target_user = setup_users[0]
+
+        # Act
+        async with async_connection_pool.open_async_session() as session:
+            await async_user_repository.bulk_update(
+                session, [{'id': target_user.id, 'first_name': 'Changed', 'last_name': target_user.last_name}]
+            )
+
+        # Assert
+        assert [row['changes'] for row in history] == [{'first_name': [target_user.first_name, 'Changed']}]
@@ -1,9 +1,39 @@
+import datetime
+
 import pytest
 from faker import Faker
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import Session
 
 from app.domain.entity.user import User
-from app import connection_pool
-from app.domain.repository.user_repository import search
+from app import connection_pool, user_cache
+from app.domain.repository import user_repository
+from app.domain.repository.user_repository import (
+    COUNT_ESTIMATE,
+    COUNT_EXACT,
+    COUNT_NONE,
+    MAX_BIND_PARAMETERS,
+    SEARCH_FULLTEXT,
+    TOTAL_COUNT,
+    TOTAL_PLAN,
+    TOTAL_RELTUPLES,
+    TOTAL_ROW_COUNT,
+    TOTAL_WINDOW,
+    bulk_create,
+    bulk_delete,
+    bulk_update,
+    bulk_update_statements,
+    create,
+    find_by_id,
+    search,
+    search_filters,
+    stream,
+    total_source,
+    update,
+)
+from app.domain.value_object.pagination_value_object import NEXT, PREV, Cursor
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.connection_pool import ConnectionPool
 
 fake = Faker()
 
@@ -34,6 +64,18 @@ def setup_users() -> list[User]:
     return [alice, bobby, charlie]
 
 
+@pytest.fixture
+def statements() -> list[str]:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection_pool.engine, 'before_cursor_execute', _record)
+    yield statements
+    event.remove(connection_pool.engine, 'before_cursor_execute', _record)
+
+
 class TestSearchUser:
     def test_search_no_filter(self, setup_users):
         # Arrange
@@ -81,7 +123,25 @@ class TestSearchUser:
 
         # Assert
         assert len(results) == 2
-        assert count == 2
+        assert count == 3
+
+    def test_search_past_last_page_still_counts(self, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            results, count = search(session, limit=2, offset=10)
+
+        # Assert
+        assert results == []
+        assert count == 3
+
+    def test_search_without_count(self, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            results, count = search(session, limit=2, count_mode=COUNT_NONE)
+
+        # Assert
+        assert len(results) == 2
+        assert count is None
 
     def test_search_eager_does_not_fail(self, setup_users):
         # Arrange
@@ -93,3 +153,509 @@ class TestSearchUser:
         # Assert
         assert count == 3
         assert all(isinstance(user, User) for user in results)
+
+
+class TestSearchUserCount:
+    @pytest.mark.parametrize(
+        ('dialect', 'count_mode', 'filtered', 'cursor', 'expected'),
+        [
+            ('postgresql', COUNT_EXACT, False, None, TOTAL_ROW_COUNT),
+            ('postgresql', COUNT_EXACT, True, None, TOTAL_WINDOW),
+            ('postgresql', COUNT_EXACT, True, Cursor(NEXT, 1), TOTAL_COUNT),
+            ('postgresql', COUNT_ESTIMATE, False, Cursor(NEXT, 1), TOTAL_RELTUPLES),
+            ('postgresql', COUNT_ESTIMATE, True, None, TOTAL_PLAN),
+            ('sqlite', COUNT_EXACT, False, None, TOTAL_WINDOW),
+            ('sqlite', COUNT_ESTIMATE, True, None, TOTAL_WINDOW),
+            ('sqlite', COUNT_EXACT, False, Cursor(NEXT, 1), TOTAL_COUNT),
+            ('sqlite', COUNT_NONE, False, None, None),
+        ],
+    )
+    def test_total_source(self, dialect, count_mode, filtered, cursor, expected):
+        # Arrange
+        bind = create_engine('postgresql+psycopg://' if dialect == 'postgresql' else 'sqlite://')
+
+        # Act
+        source = total_source(bind, count_mode, filtered=filtered, cursor=cursor)
+
+        # Assert
+        assert source == expected
+
+    def test_estimate_is_exact_without_postgresql(self, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            _, count = search(session, email=setup_users[0].email, count_mode=COUNT_ESTIMATE)
+
+        # Assert
+        assert count == 1
+
+    def test_estimate_plans_on_the_replica(self, monkeypatch):
+        # Arrange
+        pool = ConnectionPool('sqlite://', replica_urls=['sqlite://'])
+        for engine in [pool.engine, *pool.replica_engines]:
+            Base.metadata.create_all(engine)
+        # only the replica has a row, so the count tells which database answered
+        with pool.replica_engines[0].begin() as connection:
+            connection.execute(User.__table__.insert().values(id=1, email='replica@example.com', password='x'))
+        monkeypatch.setattr(user_repository, 'total_source', lambda *args, **kwargs: TOTAL_PLAN)
+        monkeypatch.setattr(user_repository, 'explain_statement', lambda *args: ('SELECT count(*) FROM "user"', {}))
+        monkeypatch.setattr(user_repository, 'plan_rows', int)
+
+        # Act
+        with pool.open_session(read_only=True) as session:
+            _, count = search(session, email='replica', count_mode=COUNT_ESTIMATE)
+
+        # Assert
+        assert count == 1
+
+    def test_row_count_follows_inserts_and_deletes(self, setup_test_pg, setup_users):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.info['uid'] = None
+            bulk_create(session, [{'email': 'bulk@example.com', 'password': fake.sha256()}])
+            bulk_delete(session, [setup_users[0].id])
+            session.add(User(email='one@example.com', password=fake.sha256()))
+
+        # Act
+        with connection_pool.open_session() as session:
+            results, count = search(session, limit=1)
+
+        # Assert
+        assert len(results) == 1
+        assert count == 4
+
+    def test_estimate_uses_planner_rows(self, setup_test_pg, setup_users):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.execute(text('ANALYZE "user"'))
+
+        # Act
+        with connection_pool.open_session() as session:
+            _, unfiltered = search(session, count_mode=COUNT_ESTIMATE)
+            _, filtered = search(session, email='example', count_mode=COUNT_ESTIMATE)
+
+        # Assert
+        assert unfiltered == 3
+        assert isinstance(filtered, int) and filtered >= 1
+
+
+class TestSearchUserCreatedAt:
+    @pytest.fixture
+    def dated_users(self, setup_users) -> list[User]:
+        # created a day apart, in reverse id order
+        with connection_pool.open_session() as session:
+            for days, user in enumerate(reversed(setup_users)):
+                session.get(User, user.id).created_at = datetime.datetime(2024, 1, 1 + days)
+        return setup_users
+
+    def test_filters_half_open_range(self, dated_users):
+        # Act
+        with connection_pool.open_session() as session:
+            results, count = search(
+                session, created_from=datetime.datetime(2024, 1, 2), created_to=datetime.datetime(2024, 1, 3)
+            )
+
+        # Assert
+        assert count == 1
+        assert [user.id for user in results] == [dated_users[1].id]
+
+    def test_orders_by_created_at(self, dated_users):
+        # Act
+        with connection_pool.open_session() as session:
+            oldest_first, _ = search(session, order_by='created_at')
+            newest_first, _ = search(session, order_by='-created_at', limit=2, offset=1)
+
+        # Assert
+        assert [user.id for user in oldest_first] == [user.id for user in reversed(dated_users)]
+        assert [user.id for user in newest_first] == [dated_users[1].id, dated_users[2].id]
+
+    def test_orders_by_full_name_then_id(self, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            results, _ = search(session, order_by='-full_name')
+
+        # Assert
+        assert [user.full_name for user in results] == sorted((user.full_name for user in setup_users), reverse=True)
+
+    def test_range_uses_brin_index(self, setup_test_pg, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            session.execute(text('SET LOCAL enable_seqscan = off'))
+            stmt = select(User.id).where(*search_filters(created_from=datetime.datetime(2024, 1, 1)))
+            compiled = stmt.compile(dialect=session.get_bind().dialect, compile_kwargs={'literal_binds': True})
+            plan = '\n'.join(session.execute(text(f'EXPLAIN {compiled}')).scalars())
+
+        # Assert
+        assert 'ix_user_created_at_brin' in plan
+
+
+class TestSearchUserFilters:
+    def test_keyword_wildcards_are_literal(self, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            results, count = search(session, keyword='%')
+
+        # Assert
+        assert count == 0
+        assert results == []
+
+    def test_keyword_matches_users_without_last_name(self):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.add(User(email='solo@example.com', password=fake.sha256(), first_name='Solo'))
+
+        # Act
+        with connection_pool.open_session() as session:
+            results, count = search(session, keyword='solo ')
+
+        # Assert
+        assert count == 1
+
+
+class TestSearchUserIndexes:
+    def _explain(self, session: Session, **filters: str) -> str:
+        stmt = select(User.id).where(*search_filters(**filters))
+        compiled = stmt.compile(dialect=session.get_bind().dialect, compile_kwargs={'literal_binds': True})
+        # the test table is tiny, make any usable index cheaper than a scan
+        session.execute(text('SET LOCAL enable_seqscan = off'))
+        return '\n'.join(session.execute(text(f'EXPLAIN {compiled}')).scalars())
+
+    def test_keyword_search_uses_trigram_indexes(self, setup_test_pg, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            plan = self._explain(session, keyword='ali')
+
+        # Assert
+        assert 'ix_user_email_trgm' in plan
+        assert 'ix_user_full_name_trgm' in plan
+        assert 'Seq Scan' not in plan
+
+    def test_email_search_uses_trigram_index(self, setup_test_pg, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            plan = self._explain(session, email='example')
+
+        # Assert
+        assert 'ix_user_email_trgm' in plan
+        assert 'Seq Scan' not in plan
+
+
+class TestFulltextSearchUser:
+    def test_falls_back_to_substring_search_without_postgresql(self, setup_users):
+        # Arrange
+        target_user = setup_users[0]
+
+        # Act
+        with connection_pool.open_session() as session:
+            results, count = search(session, keyword=target_user.first_name, mode=SEARCH_FULLTEXT)
+
+        # Assert
+        assert count == 1
+        assert results[0].id == target_user.id
+
+    def test_ranks_name_matches_above_email_matches(self, setup_test_pg):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.add_all(
+                [
+                    User(email='ada@example.com', password=fake.sha256(), first_name='Grace', last_name='Hopper'),
+                    User(email='grace@example.com', password=fake.sha256(), first_name='Ada', last_name='Lovelace'),
+                ]
+            )
+
+        # Act
+        with connection_pool.open_session() as session:
+            results, count = search(session, keyword='ada lovelace', mode=SEARCH_FULLTEXT)
+            ranked, _ = search(session, keyword='ada', mode=SEARCH_FULLTEXT)
+
+        # Assert
+        assert count == 1
+        assert results[0].email == 'grace@example.com'
+        assert [user.first_name for user in ranked] == ['Ada', 'Grace']
+
+    def test_uses_search_vector_index(self, setup_test_pg, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            session.execute(text('SET LOCAL enable_seqscan = off'))
+            stmt = select(User.id).where(*search_filters(keyword='ada lovelace', fulltext=True))
+            compiled = stmt.compile(dialect=session.get_bind().dialect, compile_kwargs={'literal_binds': True})
+            plan = '\n'.join(session.execute(text(f'EXPLAIN {compiled}')).scalars())
+
+        # Assert
+        assert 'ix_user_search_vector' in plan
+
+
+class TestKeysetSearchUser:
+    def test_pages_forward_and_back_from_cursors(self, setup_users):
+        # Arrange
+        first, second, third = sorted(setup_users, key=lambda user: user.id)
+
+        # Act
+        with connection_pool.open_session() as session:
+            after_first, _ = search(session, limit=2, cursor=Cursor(NEXT, first.id))
+            before_third, count = search(session, limit=2, cursor=Cursor(PREV, third.id))
+
+        # Assert
+        assert [user.id for user in after_first] == [second.id, third.id]
+        assert [user.id for user in before_third] == [first.id, second.id]
+        # every matching user, not only those past the cursor
+        assert count == 3
+
+    def test_search_eager_only_loads_serialized_columns(self, setup_users, statements):
+        # Arrange
+        creator, target_user = setup_users[0], setup_users[1]
+        with connection_pool.open_session() as session:
+            session.get(User, target_user.id).created_user_id = creator.id
+            session.commit()
+        statements.clear()
+
+        # Act
+        with connection_pool.open_session(read_only=True) as session:
+            results, _ = search(session, email=target_user.email, eager=True)
+            created_user = results[0].created_user
+            full_name = created_user.full_name
+
+        # Assert
+        assert full_name == f'{creator.first_name} {creator.last_name}'
+        assert len(statements) == 1
+        assert 'password' not in statements[0]
+        assert 'phone' not in statements[0].split('LEFT OUTER JOIN')[1]
+
+
+class TestFindUser:
+    def test_find_by_id_returns_user_in_session_without_query(self, setup_users, statements, monkeypatch):
+        # Arrange
+        target_user = setup_users[0]
+        monkeypatch.setattr(user_cache, 'get', lambda key, remote=True: None)
+        with connection_pool.open_session(read_only=True) as session:
+            loaded = session.get(User, target_user.id)
+            statements.clear()
+
+            # Act
+            user = find_by_id(session, target_user.id)
+
+        # Assert
+        assert user is loaded
+        assert statements == []
+
+    def test_find_by_id_does_not_load_password(self, setup_users, statements):
+        # Arrange
+        target_user = setup_users[0]
+
+        # Act
+        with connection_pool.open_session(read_only=True) as session:
+            user = find_by_id(session, target_user.id, eager=True)
+
+        # Assert
+        assert user.email == target_user.email
+        assert statements
+        assert not any('password' in statement for statement in statements)
+
+    def test_find_by_id_is_served_from_cache(self, setup_users, mocker):
+        # Arrange
+        target_user = setup_users[0]
+        with connection_pool.open_session(read_only=True) as session:
+            find_by_id(session, target_user.id)
+        execute = mocker.spy(connection_pool.engine.dialect, 'do_execute')
+
+        # Act
+        with connection_pool.open_session(read_only=True) as session:
+            user = find_by_id(session, target_user.id)
+            email = user.email
+
+        # Assert
+        assert email == target_user.email
+        execute.assert_not_called()
+
+    def test_find_by_id_eager_resolves_audit_users_from_cache(self, setup_users, mocker):
+        # Arrange
+        creator, target_user = setup_users[0], setup_users[1]
+        with connection_pool.open_session() as session:
+            session.get(User, target_user.id).created_user_id = creator.id
+            session.commit()
+        with connection_pool.open_session(read_only=True) as session:
+            find_by_id(session, target_user.id, eager=True)
+        execute = mocker.spy(connection_pool.engine.dialect, 'do_execute')
+
+        # Act
+        with connection_pool.open_session(read_only=True) as session:
+            user = find_by_id(session, target_user.id, eager=True)
+            created_user_email = user.created_user.email
+
+        # Assert
+        assert created_user_email == creator.email
+        # only the target's `last_seen_at`, which isn't cached; none for the audit users
+        assert execute.call_count == 1
+        assert 'last_seen_at' in execute.call_args.args[1]
+
+
+class TestStreamUser:
+    def test_stream_yields_batches_of_plain_rows(self, setup_users):
+        # Arrange
+        alice, bobby, charlie = setup_users
+
+        # Act
+        with connection_pool.open_session(read_only=True) as session:
+            batches = list(stream(session, batch_size=2))
+            identities = len(session.identity_map)
+
+        # Assert
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert [row.email for batch in batches for row in batch] == [alice.email, bobby.email, charlie.email]
+        assert identities == 0
+
+    def test_stream_applies_search_filters(self, setup_users):
+        # Arrange
+        target_user = setup_users[1]
+
+        # Act
+        with connection_pool.open_session(read_only=True) as session:
+            rows = [row for batch in stream(session, email=target_user.email) for row in batch]
+
+        # Assert
+        assert [row.id for row in rows] == [target_user.id]
+
+
+class TestWriteUser:
+    def test_create_reads_server_defaults_in_the_insert(self, statements):
+        # Arrange
+        user = User(email='created@example.com', password='hashed', first_name='Created', last_name='User')
+
+        # Act
+        with connection_pool.open_session() as session:
+            create(session, user)
+            created_at = user.created_at
+
+        # Assert
+        assert isinstance(created_at, datetime.datetime)
+        assert [statement.split()[0] for statement in statements] == ['INSERT']
+        assert 'RETURNING' in statements[0]
+
+    def test_update_sets_updated_at_in_one_statement(self, setup_users, statements):
+        # Arrange
+        target_user = setup_users[0]
+        stale = datetime.datetime(2000, 1, 1)
+        with connection_pool.open_session() as session:
+            session.get(User, target_user.id).updated_at = stale
+        with connection_pool.open_session() as session:
+            user = session.get(User, target_user.id)
+            user.first_name = 'Updated'
+            statements.clear()
+
+            # Act
+            update(session, user)
+            updated_at = user.updated_at
+
+        # Assert
+        assert updated_at > stale
+        assert [statement.split()[0] for statement in statements] == ['UPDATE']
+
+    def test_full_name_is_generated_by_the_database(self, statements):
+        # Arrange
+        user = User(email='ada@example.com', password='hashed', first_name='Ada')
+
+        # Act
+        with connection_pool.open_session() as session:
+            create(session, user)
+            created = user.full_name
+            user.last_name = 'Lovelace'
+            update(session, user)
+            updated = user.full_name
+
+        # Assert
+        assert (created, updated) == ('Ada ', 'Ada Lovelace')
+        assert [statement.split()[0] for statement in statements] == ['INSERT', 'UPDATE']
+
+    def test_name_ordering_uses_full_name_index(self, setup_test_pg, setup_users):
+        # Act
+        with connection_pool.open_session() as session:
+            session.execute(text('SET LOCAL enable_seqscan = off'))
+            stmt = select(User.id).order_by(User.full_name, User.id).limit(10)
+            compiled = stmt.compile(dialect=session.get_bind().dialect, compile_kwargs={'literal_binds': True})
+            plan = '\n'.join(session.execute(text(f'EXPLAIN {compiled}')).scalars())
+
+        # Assert
+        assert 'ix_user_full_name' in plan
+        assert 'Sort' not in plan
+
+
+def _row(email: str) -> dict:
+    return {'email': email, 'password': 'hashed', 'first_name': 'Bulk', 'last_name': 'User', 'phone': None}
+
+
+class TestBulkUser:
+    def test_bulk_create_inserts_in_one_statement(self, statements):
+        # Arrange
+        rows = [_row(f'bulk{index}@example.com') for index in range(5)]
+
+        # Act
+        with connection_pool.open_session() as session:
+            session.info['uid'] = 42
+            ids = bulk_create(session, rows)
+
+        # Assert
+        assert sorted(ids) == sorted(row['email'] for row in rows)
+        assert len([statement for statement in statements if statement.startswith('INSERT')]) == 1
+        with connection_pool.open_session(read_only=True) as session:
+            user = session.get(User, ids['bulk0@example.com'])
+            assert (user.first_name, user.created_user_id, user.updated_user_id) == ('Bulk', 42, 42)
+
+    def test_bulk_create_skips_taken_emails(self, setup_users):
+        # Arrange
+        taken = setup_users[0].email
+
+        # Act
+        with connection_pool.open_session() as session:
+            ids = bulk_create(session, [_row(taken), _row('fresh@example.com')])
+
+        # Assert
+        assert list(ids) == ['fresh@example.com']
+
+    def test_bulk_update_sets_each_row(self, setup_users):
+        # Arrange
+        alice, bobby, charlie = setup_users
+
+        # Act
+        with connection_pool.open_session() as session:
+            session.info['uid'] = charlie.id
+            bulk_update(
+                session,
+                [
+                    {'id': alice.id, 'first_name': 'Alice'},
+                    {'id': bobby.id, 'first_name': 'Bobby', 'phone': '123'},
+                ],
+            )
+
+        # Assert
+        with connection_pool.open_session(read_only=True) as session:
+            users = {user.id: user for user in session.scalars(select(User))}
+        assert users[alice.id].first_name == 'Alice'
+        assert (users[bobby.id].first_name, users[bobby.id].phone) == ('Bobby', '123')
+        assert users[bobby.id].updated_user_id == charlie.id
+        assert users[charlie.id].first_name == charlie.first_name
+
+    def test_bulk_update_pages_values_under_the_parameter_limit(self):
+        # Arrange
+        bind = create_engine('postgresql+psycopg://')
+        rows = [{'id': user_id, 'first_name': 'A', 'last_name': 'B'} for user_id in range(1, 30_001)]
+
+        # Act
+        statements = bulk_update_statements(bind, rows, uid=1)
+
+        # Assert
+        params = [len(stmt.compile(bind).params) for stmt, _ in statements]
+        assert len(statements) == 2
+        assert max(params) <= MAX_BIND_PARAMETERS
+        assert sum(params) == len(rows) * 3 + len(statements)
+
+    def test_bulk_delete_returns_deleted_ids(self, setup_users):
+        # Arrange
+        target_user = setup_users[0]
+
+        # Act
+        with connection_pool.open_session() as session:
+            deleted = bulk_delete(session, [target_user.id, 0])
+
+        # Assert
+        assert deleted == [target_user.id]
+        with connection_pool.open_session(read_only=True) as session:
+            assert session.get(User, target_user.id) is None
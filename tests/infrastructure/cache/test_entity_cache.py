@@ -0,0 +1,175 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import load_only
+
+from app import connection_pool, user_cache
+from app.domain.entity.user import User
+from app.infrastructure.cache.entity_cache import EntityCache
+from app.infrastructure.cache.lru_cache import LRUCache
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.connection_pool import ConnectionPool
+from app.infrastructure.db.last_seen import write_last_seen
+
+
+@pytest.fixture
+def user() -> User:
+    user = User(email='cached@example.com', password='hashed', first_name='Cached', last_name='User')
+    with connection_pool.open_session() as session:
+        session.add(user)
+        session.commit()
+    return user
+
+
+@pytest.fixture
+def statements() -> list[str]:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection_pool.engine, 'before_cursor_execute', _record)
+    yield statements
+    event.remove(connection_pool.engine, 'before_cursor_execute', _record)
+
+
+def _cache_user(user_id: int) -> None:
+    with connection_pool.open_session(read_only=True) as session:
+        user_cache.store(session, session.get(User, user_id))
+
+
+class TestEntityCache:
+    def test_load_attaches_cached_row_without_query(self, user, statements):
+        # Arrange
+        _cache_user(user.id)
+        statements.clear()
+
+        # Act
+        with connection_pool.open_session(read_only=True) as session:
+            cached = user_cache.load(session, user.id)
+            email = cached.email
+            queries_before_password = len(statements)
+            password = cached.password
+
+        # Assert
+        assert email == 'cached@example.com'
+        assert queries_before_password == 0
+        # password is never cached, it loads on access
+        assert password == 'hashed'
+        assert 'password' not in user_cache.get(user.id)
+
+    def test_last_seen_at_is_read_past_the_cache(self, user):
+        # Arrange
+        _cache_user(user.id)
+        seen_at = datetime(2024, 1, 1)
+        with connection_pool.engine.begin() as connection:
+            write_last_seen(connection, [(user.id, seen_at)])
+
+        # Act
+        with connection_pool.open_session(read_only=True) as session:
+            last_seen_at = user_cache.load(session, user.id).last_seen_at
+
+        # Assert
+        assert 'last_seen_at' not in user_cache.get(user.id)
+        assert last_seen_at == seen_at
+
+    def test_committed_update_invalidates(self, user):
+        # Arrange
+        _cache_user(user.id)
+
+        # Act
+        with connection_pool.open_session() as session:
+            cached = user_cache.load(session, user.id)
+            cached.first_name = 'Changed'
+            session.flush()
+            session.commit()
+
+        # Assert
+        assert user_cache.local.get(user.id) is None
+        assert user_cache.stats()['invalidations'] >= 1
+
+    def test_bulk_update_clears_cache(self, user):
+        # Arrange
+        _cache_user(user.id)
+
+        # Act
+        with connection_pool.open_session() as session:
+            session.execute(update(User).values(phone='000'))
+            session.commit()
+
+        # Assert
+        assert len(user_cache.local) == 0
+
+    def test_rolled_back_write_keeps_entries(self, user):
+        # Arrange
+        _cache_user(user.id)
+
+        # Act
+        with connection_pool.open_session() as session:
+            cached = user_cache.load(session, user.id)
+            cached.first_name = 'Changed'
+            session.flush()
+            session.rollback()
+
+        # Assert
+        assert user_cache.local.get(user.id)['first_name'] == 'Cached'
+
+    def test_rows_read_after_a_flush_are_not_stored(self, user):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.get(User, user.id).first_name = 'Uncommitted'
+            session.flush()
+
+            # Act
+            stored = user_cache.store(session, session.get(User, user.id))
+
+        # Assert
+        assert stored is None
+        assert user_cache.local.get(user.id) is None
+
+    def test_rows_read_from_a_replica_are_not_stored(self):
+        # Arrange
+        pool = ConnectionPool('sqlite://', replica_urls=['sqlite://'])
+        for engine in [pool.engine, *pool.replica_engines]:
+            Base.metadata.create_all(engine)
+        # the replica still has the row as it was before a committed write
+        with pool.replica_engines[0].begin() as connection:
+            connection.execute(User.__table__.insert().values(id=1, email='stale@example.com', password='x'))
+
+        with pool.open_session(read_only=True) as session:
+            # Act
+            stored = user_cache.store(session, session.get(User, 1))
+
+        # Assert
+        assert stored is None
+        assert user_cache.local.get(1) is None
+
+    def test_partial_rows_are_not_stored(self, user):
+        # Arrange
+        with connection_pool.open_session(read_only=True) as session:
+            partial = session.scalars(select(User).options(load_only(User.id, User.email))).one()
+
+            # Act
+            stored = user_cache.store(session, partial)
+
+        # Assert
+        assert stored is None
+        assert user_cache.local.get(user.id) is None
+
+    def test_remote_hit_fills_local_tier(self, mocker):
+        # Arrange
+        remote = mocker.Mock()
+        remote.get.return_value = b'{"id":7,"email":"r@example.com","created_at":"2025-01-02T03:04:05"}'
+        cache = EntityCache(User, LRUCache(maxsize=10, ttl=30), remote=remote, exclude=('password',))
+
+        # Act
+        row = cache.get(7)
+        again = cache.get(7)
+
+        # Assert
+        assert row['created_at'] == datetime(2025, 1, 2, 3, 4, 5)
+        assert again is row
+        remote.get.assert_called_once_with(7)
+        assert cache.stats()['remote_hits'] == 1
+        assert cache.stats()['hits'] == 1
@@ -0,0 +1,42 @@
+from app.infrastructure.cache.lru_cache import LRUCache
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        # Arrange
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set(1, 'one')
+        cache.set(2, 'two')
+        cache.get(1)
+
+        # Act
+        cache.set(3, 'three')
+
+        # Assert
+        assert cache.get(2) is None
+        assert cache.get(1) == 'one'
+        assert cache.get(3) == 'three'
+        assert cache.evictions == 1
+
+    def test_expires_entries_after_ttl(self, mocker):
+        # Arrange
+        monotonic = mocker.patch('app.infrastructure.cache.lru_cache.time.monotonic', return_value=100.0)
+        cache = LRUCache(maxsize=10, ttl=30)
+        cache.set(1, 'one')
+
+        # Act
+        monotonic.return_value = 130.0
+
+        # Assert
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+    def test_zero_size_disables_cache(self):
+        # Arrange
+        cache = LRUCache(maxsize=0, ttl=30)
+
+        # Act
+        cache.set(1, 'one')
+
+        # Assert
+        assert cache.get(1) is None
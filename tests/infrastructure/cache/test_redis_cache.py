@@ -0,0 +1,40 @@
+from redis import ConnectionError
+
+from app.infrastructure.cache.redis_cache import RedisCache
+
+
+class TestRedisCache:
+    def test_sets_with_ttl_under_prefix(self, mocker):
+        # Arrange
+        client = mocker.Mock()
+        cache = RedisCache(client, prefix='user', ttl=30)
+
+        # Act
+        cache.set(1, b'{}')
+
+        # Assert
+        client.set.assert_called_once_with('user:1', b'{}', px=30000)
+
+    def test_deletes_all_keys_in_one_call(self, mocker):
+        # Arrange
+        client = mocker.Mock()
+        cache = RedisCache(client, prefix='user', ttl=30)
+
+        # Act
+        cache.delete([1, 2])
+
+        # Assert
+        client.delete.assert_called_once_with('user:1', 'user:2')
+
+    def test_errors_are_misses(self, mocker):
+        # Arrange
+        client = mocker.Mock()
+        client.get.side_effect = ConnectionError('down')
+        cache = RedisCache(client, prefix='user', ttl=30)
+
+        # Act
+        value = cache.get(1)
+
+        # Assert
+        assert value is None
+        assert cache.errors == 1
@@ -0,0 +1,169 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+from app import connection_pool, user_cache
+from app.domain.entity.user import User
+from app.infrastructure.cmd.import_users import (
+    FORMAT_CSV,
+    FORMAT_NDJSON,
+    ImportStats,
+    detect_format,
+    hashed_batches,
+    history_entries,
+    import_users,
+    merge_statement,
+    read_records,
+    valid_rows,
+)
+from app.infrastructure.db.audit_history import REDACTED
+from app.infrastructure.helper.password_helper import verify_password
+
+CSV = """email,password,first_name,last_name,phone
+ada@example.com,secret1,Ada,Lovelace,
+grace@example.com,secret2,Grace,Hopper,555
+,missing-email,No,Email,
+"""
+
+NDJSON = """{"email": "ada@example.com", "password": "secret1", "first_name": "Ada"}
+
+{"email": "grace@example.com", "password": null}
+"""
+
+
+@pytest.fixture
+def csv_file(tmp_path) -> Path:
+    path = tmp_path / 'users.csv'
+    path.write_text(CSV)
+    return path
+
+
+class TestReadRecords:
+    def test_detect_format_from_extension(self):
+        # Act & Assert
+        assert detect_format(Path('users.CSV')) == FORMAT_CSV
+        assert detect_format(Path('users.jsonl')) == FORMAT_NDJSON
+        with pytest.raises(ValueError):
+            detect_format(Path('users.xlsx'))
+
+    def test_valid_rows_from_csv(self, csv_file):
+        # Arrange
+        stats = ImportStats()
+
+        # Act
+        rows = list(valid_rows(read_records(csv_file, FORMAT_CSV), stats))
+
+        # Assert
+        assert rows == [
+            ('ada@example.com', 'secret1', 'Ada', 'Lovelace', None),
+            ('grace@example.com', 'secret2', 'Grace', 'Hopper', '555'),
+        ]
+        assert (stats.read, stats.invalid) == (3, 1)
+
+    def test_valid_rows_from_ndjson(self, tmp_path):
+        # Arrange
+        path = tmp_path / 'users.ndjson'
+        path.write_text(NDJSON)
+        stats = ImportStats()
+
+        # Act
+        rows = list(valid_rows(read_records(path, FORMAT_NDJSON), stats))
+
+        # Assert
+        assert rows == [('ada@example.com', 'secret1', 'Ada', None, None)]
+        assert (stats.read, stats.invalid) == (2, 1)
+
+
+class TestHashedBatches:
+    def test_passwords_are_hashed_in_order(self):
+        # Arrange
+        batches = [[('a@example.com', 'first', None, None, None)], [('b@example.com', 'second', 'B', None, None)]]
+
+        # Act
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hashed = list(hashed_batches(executor, batches))
+
+        # Assert
+        assert [[row[0] for row in batch] for batch in hashed] == [['a@example.com'], ['b@example.com']]
+        assert verify_password('first', hashed[0][0][1])
+        assert verify_password('second', hashed[1][0][1])
+        assert hashed[1][0][2:] == ('B', None, None)
+
+
+class TestImportUsers:
+    def test_merge_statement_skips_or_updates_existing_emails(self):
+        # Act & Assert
+        assert 'ON CONFLICT (email) DO NOTHING RETURNING id' in merge_statement(update_existing=False)
+        assert 'DO UPDATE SET first_name = EXCLUDED.first_name' in merge_statement(update_existing=True)
+        assert 'existing.first_name AS old_first_name' in merge_statement(update_existing=True)
+
+    def test_history_entries_of_inserted_and_updated_users(self, history):
+        # Arrange
+        names = {'first_name': 'Ada', 'last_name': 'Lovelace', 'phone': None}
+        merged = [
+            {'id': 1, 'email': 'ada@example.com', 'password': 'hashed', **names},
+            {
+                'id': 2,
+                'updated': True,
+                **names,
+                'old_first_name': 'Augusta',
+                'old_last_name': 'Lovelace',
+                'old_phone': None,
+            },
+            {
+                'id': 3,
+                'updated': True,
+                **names,
+                'old_first_name': 'Ada',
+                'old_last_name': 'Lovelace',
+                'old_phone': None,
+            },
+        ]
+
+        # Act
+        entries = history_entries(merged)
+
+        # Assert
+        assert [(entry['user_id'], entry['operation']) for entry in entries] == [(1, 'insert'), (2, 'update')]
+        assert entries[0]['changes']['password'] == [None, REDACTED]
+        assert entries[1]['changes'] == {'first_name': ['Augusta', 'Ada']}
+
+    def test_requires_postgresql(self, csv_file):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            import_users(csv_file)
+
+    def test_import_copies_and_merges(self, setup_test_pg, csv_file):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.add(User(email='grace@example.com', password='hashed', first_name='Existing'))
+
+        # Act
+        stats = import_users(csv_file, batch_size=1, workers=1)
+
+        # Assert
+        assert (stats.read, stats.imported, stats.skipped, stats.invalid) == (3, 1, 1, 1)
+        with connection_pool.open_session(read_only=True) as session:
+            users = {user.email: user for user in session.scalars(select(User))}
+        assert verify_password('secret1', users['ada@example.com'].password)
+        assert users['grace@example.com'].first_name == 'Existing'
+
+    def test_update_existing_evicts_cache_and_records_history(self, setup_test_pg, csv_file, history):
+        # Arrange
+        with connection_pool.open_session() as session:
+            grace = User(email='grace@example.com', password='hashed', first_name='Existing')
+            session.add(grace)
+        user_cache.set(grace.id, {'id': grace.id, 'email': grace.email, 'first_name': 'Existing'})
+        history.clear()
+
+        # Act
+        import_users(csv_file, batch_size=1, workers=1, update_existing=True)
+
+        # Assert
+        assert user_cache.get(grace.id) is None
+        assert sorted((row['operation'], row['changes'].get('first_name')) for row in history) == [
+            ('insert', [None, 'Ada']),
+            ('update', ['Existing', 'Grace']),
+        ]
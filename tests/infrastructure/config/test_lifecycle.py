@@ -0,0 +1,42 @@
+import pytest
+from celery.signals import worker_process_init
+
+from app import connection_pool, async_connection_pool
+from app.infrastructure.config import lifecycle
+from app.infrastructure.config.lifecycle import config_lifecycle, after_fork
+
+
+@pytest.fixture
+def registered_pools():
+    pools = list(lifecycle._pools)
+    yield
+    config_lifecycle(*pools)
+
+
+class TestLifecycle:
+    def test_app_registers_its_pools(self):
+        # Assert
+        assert lifecycle._pools == [connection_pool, async_connection_pool]
+
+    def test_after_fork_disposes_registered_pools(self, registered_pools, mocker):
+        # Arrange
+        pools = [mocker.Mock(), mocker.Mock()]
+        config_lifecycle(*pools)
+
+        # Act
+        after_fork()
+
+        # Assert
+        for pool in pools:
+            pool.dispose_after_fork.assert_called_once_with()
+
+    def test_celery_worker_process_init_resets_pools(self, registered_pools, mocker):
+        # Arrange
+        pool = mocker.Mock()
+        config_lifecycle(pool)
+
+        # Act
+        worker_process_init.send(sender=None)
+
+        # Assert
+        pool.dispose_after_fork.assert_called_once_with()
@@ -0,0 +1,102 @@
+from sqlalchemy import select
+
+from app import connection_pool, user_history
+from app.domain.entity.user import User
+from app.domain.entity.user_history import UserHistory
+from app.domain.repository import user_repository
+from app.infrastructure.db.audit_history import REDACTED
+
+
+def _create_user(session, email: str = 'history@example.com') -> User:
+    return user_repository.create(session, User(email=email, password='hashed', first_name='Ada', last_name='Byron'))
+
+
+class TestAuditHistory:
+    def test_records_insert_update_and_delete_after_commit(self, history):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.info['uid'] = 7
+            user = _create_user(session)
+            pending = list(history)
+
+        # Act
+        with connection_pool.open_session() as session:
+            user = session.get(User, user.id)
+            user.last_name = 'Lovelace'
+            user.password = 'rehashed'
+            user_repository.update(session, user)
+        with connection_pool.open_session() as session:
+            user_repository.delete(session, session.get(User, user.id))
+
+        # Assert
+        assert pending == []
+        assert [row['operation'] for row in history] == ['insert', 'update', 'delete']
+        created, updated, deleted = history
+        assert created['user_id'] == user.id
+        assert created['changed_user_id'] == 7
+        assert created['changes']['email'] == [None, 'history@example.com']
+        assert created['changes']['password'] == [None, REDACTED]
+        assert 'updated_at' not in created['changes']
+        assert updated['changes'] == {'last_name': ['Byron', 'Lovelace'], 'password': [REDACTED, REDACTED]}
+        assert deleted['changes']['last_name'] == ['Lovelace', None]
+
+    def test_rollback_discards_changes(self, history):
+        # Act
+        with connection_pool.open_session() as session:
+            _create_user(session)
+            session.rollback()
+
+        # Assert
+        assert history == []
+
+    def test_bulk_statements_are_recorded(self, history):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.info['uid'] = None
+            ids = user_repository.bulk_create(
+                session,
+                [
+                    {'email': 'a@example.com', 'password': 'hashed', 'first_name': 'A'},
+                    {'email': 'a@example.com', 'password': 'hashed', 'first_name': 'Again'},
+                ],
+            )
+
+        # Act
+        with connection_pool.open_session() as session:
+            user_repository.bulk_update(session, [{'id': ids['a@example.com'], 'first_name': 'B', 'last_name': None}])
+        with connection_pool.open_session() as session:
+            # nothing changes
+            user_repository.bulk_update(session, [{'id': ids['a@example.com'], 'first_name': 'B'}])
+        with connection_pool.open_session() as session:
+            user_repository.bulk_delete(session, [ids['a@example.com']])
+
+        # Assert
+        assert [(row['operation'], row['changes'].get('first_name')) for row in history] == [
+            ('insert', [None, 'A']),
+            ('update', ['A', 'B']),
+            ('delete', None),
+        ]
+        # the unchanged last name is left out
+        assert history[1]['changes'] == {'first_name': ['A', 'B']}
+
+    def test_writer_inserts_history_rows(self, history):
+        # Arrange
+        with connection_pool.open_session() as session:
+            _create_user(session)
+
+        # Act
+        user_history.writer.write(history)
+
+        # Assert
+        with connection_pool.open_session(read_only=True) as session:
+            rows = session.scalars(select(UserHistory)).all()
+        assert [(row.operation, row.changes['first_name']) for row in rows] == [('insert', [None, 'Ada'])]
+        assert rows[0].changed_at is not None
+
+    def test_disabled_history_records_nothing(self):
+        # Act
+        with connection_pool.open_session() as session:
+            _create_user(session)
+
+        # Assert
+        assert session.info.get('user_history') is None
@@ -0,0 +1,91 @@
+import threading
+
+from app.infrastructure.db.batch_writer import BatchWriter
+
+
+class TestBatchWriter:
+    def test_flush_writes_in_batches_in_order(self):
+        # Arrange
+        batches: list[list[int]] = []
+        writer = BatchWriter(batches.append, batch_size=2, interval=3600)
+        writer.put(range(5))
+
+        # Act
+        written = writer.flush()
+
+        # Assert
+        assert written == 5
+        assert batches == [[0, 1], [2, 3], [4]]
+        assert writer.stats() == {'written': 5, 'failed': 0, 'dropped': 0, 'pending': 0}
+        writer.close()
+
+    def test_background_thread_writes_after_interval(self):
+        # Arrange
+        written = threading.Event()
+        writer = BatchWriter(lambda batch: written.set(), interval=0.01)
+
+        # Act
+        writer.put(['item'])
+
+        # Assert
+        assert written.wait(timeout=5)
+        writer.close()
+
+    def test_full_batch_wakes_the_writer(self):
+        # Arrange
+        batches: list[list[int]] = []
+        written = threading.Event()
+        writer = BatchWriter(lambda batch: (batches.append(batch), written.set()), batch_size=3, interval=3600)
+        writer.put([1])
+
+        # Act
+        writer.put([2, 3])
+
+        # Assert
+        assert written.wait(timeout=5)
+        assert batches == [[1, 2, 3]]
+        writer.close()
+
+    def test_failed_batch_is_dropped(self):
+        # Arrange
+        def write(batch: list[int]) -> None:
+            if 0 in batch:
+                raise RuntimeError('database is down')
+
+        writer = BatchWriter(write, batch_size=2, interval=3600)
+        writer.put(range(4))
+
+        # Act
+        written = writer.flush()
+
+        # Assert
+        assert written == 2
+        assert writer.stats()['failed'] == 2
+        writer.close()
+
+    def test_items_coalesce_by_key(self):
+        # Arrange
+        batches: list[list[tuple[str, int]]] = []
+        writer = BatchWriter(batches.append, interval=3600, max_pending=2, key=lambda item: item[0])
+
+        # Act
+        writer.put([('a', 1), ('b', 1), ('a', 2)])
+        writer.put([('c', 1)])
+        writer.close()
+
+        # Assert
+        assert batches == [[('b', 1), ('c', 1)]]
+        assert writer.stats()['dropped'] == 1
+
+    def test_oldest_items_are_dropped_past_max_pending(self):
+        # Arrange
+        batches: list[list[int]] = []
+        writer = BatchWriter(batches.append, batch_size=10, interval=3600, max_pending=3)
+
+        # Act
+        writer.put(range(5))
+        writer.close()
+
+        # Assert
+        assert batches == [[2, 3, 4]]
+        assert writer.stats()['dropped'] == 2
@@ -1,6 +1,8 @@
+import anyio
 import pytest
 from sqlalchemy.exc import IntegrityError
-from app.infrastructure.db.connection_pool import ConnectionPool
+from app.infrastructure.db.connection_pool import ConnectionPool, AsyncConnectionPool
+from app.infrastructure.db.pool import PoolConfig
 
 
 @pytest.fixture
@@ -43,6 +45,21 @@ class TestConnectionPool:
         mock_session.rollback.assert_called_once()
         mock_session.close.assert_called_once()
 
+    def test_open_read_only_session_skips_commit(self, pool, mocker):
+        # Arrange
+        mock_factory = mocker.patch.object(pool, 'session_factory')
+        mock_session = mocker.MagicMock()
+        mock_factory.return_value = mock_session
+
+        # Act
+        with pool.open_session(read_only=True):
+            pass
+
+        # Assert
+        mock_factory.assert_called_once_with(read_only=True)
+        mock_session.commit.assert_not_called()
+        mock_session.close.assert_called_once()
+
     def test_open_session_always_closes(self, pool, mocker):
         # Arrange
         mock_factory = mocker.patch.object(pool, 'session_factory')
@@ -58,3 +75,95 @@ class TestConnectionPool:
 
         # Assert
         mock_session.close.assert_called_once()
+
+    def test_dispose_after_fork_keeps_parent_connections_open(self, mocker):
+        # Arrange
+        pool = ConnectionPool('sqlite:///:memory:', replica_urls=['sqlite:///:memory:'])
+        disposes = [mocker.patch.object(engine, 'dispose') for engine in (pool.engine, *pool.replica_engines)]
+
+        # Act
+        pool.dispose_after_fork()
+
+        # Assert
+        for dispose in disposes:
+            dispose.assert_called_once_with(close=False)
+
+    @pytest.mark.anyio
+    async def test_session_slot_waits_when_pool_capacity_is_used(self):
+        # Arrange
+        pool = ConnectionPool('sqlite:///users.db', pool_config=PoolConfig(size=1, max_overflow=1))
+        entered = []
+
+        async def hold_slot(name: str, release: anyio.Event) -> None:
+            async with pool.session_slot():
+                entered.append(name)
+                await release.wait()
+
+        # Act
+        release = anyio.Event()
+        async with anyio.create_task_group() as tg:
+            for name in ('first', 'second', 'third'):
+                tg.start_soon(hold_slot, name, release)
+            await anyio.wait_all_tasks_blocked()
+            waiting = list(entered)
+            release.set()
+
+        # Assert
+        assert waiting == ['first', 'second']
+        assert entered == ['first', 'second', 'third']
+
+    @pytest.mark.anyio
+    async def test_session_slot_is_unbounded_without_queue_pool(self, pool):
+        # Act
+        async with pool.session_slot(), pool.session_slot():
+            pass
+
+        # Assert
+        assert pool._session_slots is None
+
+
+@pytest.fixture
+def async_pool() -> AsyncConnectionPool:
+    return AsyncConnectionPool('sqlite+aiosqlite:///:memory:')
+
+
+@pytest.mark.anyio
+class TestAsyncConnectionPool:
+    async def test_open_async_session_commits(self, async_pool, mocker):
+        # Arrange
+        mock_factory = mocker.patch.object(async_pool, 'session_factory')
+        mock_session = mocker.AsyncMock()
+        mock_factory.return_value = mock_session
+
+        # Act
+        async with async_pool.open_async_session() as session:
+            await session.execute('SELECT 1')
+
+        # Assert
+        mock_session.commit.assert_awaited_once()
+        mock_session.close.assert_awaited_once()
+
+    async def test_open_async_session_rollback_on_integrity_error(self, async_pool, mocker):
+        # Arrange
+        mock_factory = mocker.patch.object(async_pool, 'session_factory')
+        mock_session = mocker.AsyncMock()
+        mock_session.commit.side_effect = IntegrityError('IntegrityError', {}, None)
+        mock_factory.return_value = mock_session
+
+        # Act & Assert
+        with pytest.raises(IntegrityError):
+            async with async_pool.open_async_session():
+                pass
+
+        mock_session.rollback.assert_awaited_once()
+        mock_session.close.assert_awaited_once()
+
+    async def test_dispose_after_fork_recreates_the_sync_pool(self, async_pool):
+        # Arrange
+        inherited = async_pool.engine.sync_engine.pool
+
+        # Act
+        async_pool.dispose_after_fork()
+
+        # Assert
+        assert async_pool.engine.sync_engine.pool is not inherited
@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.db.execution_profile import (
+    ExecutionProfile,
+    apply_profile,
+    apply_profile_async,
+    execution_profile,
+)
+
+PROFILE = ExecutionProfile(statement_timeout=2000, lock_timeout=500, work_mem='16MB', jit=False)
+
+
+@pytest.fixture
+def pg_session(mocker):
+    session = mocker.Mock()
+    session.get_bind.return_value.dialect.name = 'postgresql'
+    return session
+
+
+class TestExecutionProfile:
+    def test_settings_skip_unset_values(self):
+        # Act
+        settings = ExecutionProfile(statement_timeout=1500, jit=True).settings()
+
+        # Assert
+        assert settings == {'statement_timeout': '1500', 'jit': 'on'}
+
+    def test_statement_sets_everything_locally_in_one_query(self):
+        # Act
+        sql = str(PROFILE.statement().compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+
+        # Assert
+        assert sql.count('set_config(') == 4
+        assert "set_config('statement_timeout', '2000', true)" in sql
+        assert "set_config('jit', 'off', true)" in sql
+
+    def test_empty_profile_has_no_statement(self):
+        # Act & Assert
+        assert ExecutionProfile().statement() is None
+
+
+class TestApplyProfile:
+    def test_applies_on_postgresql(self, pg_session):
+        # Act
+        apply_profile(pg_session, PROFILE)
+
+        # Assert
+        pg_session.execute.assert_called_once()
+
+    def test_skips_other_dialects(self, mocker):
+        # Arrange
+        session = mocker.Mock()
+        session.get_bind.return_value.dialect.name = 'sqlite'
+
+        # Act
+        apply_profile(session, PROFILE)
+
+        # Assert
+        session.execute.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_applies_async_on_postgresql(self, mocker):
+        # Arrange
+        session = mocker.AsyncMock()
+        session.get_bind = mocker.Mock()
+        session.get_bind.return_value.dialect.name = 'postgresql'
+
+        # Act
+        await apply_profile_async(session, PROFILE)
+
+        # Assert
+        session.execute.assert_awaited_once()
+
+
+class TestExecutionProfileDecorator:
+    def test_applies_profile_before_use_case(self, pg_session, mocker):
+        # Arrange
+        ctx = mocker.Mock(session=pg_session)
+        calls = []
+        pg_session.execute.side_effect = lambda statement: calls.append('profile')
+
+        @execution_profile(PROFILE)
+        def execute(ctx, value):
+            calls.append('use_case')
+            return value
+
+        # Act
+        result = execute(ctx, 42)
+
+        # Assert
+        assert result == 42
+        assert calls == ['profile', 'use_case']
+
+    @pytest.mark.anyio
+    async def test_applies_profile_before_async_use_case(self, mocker):
+        # Arrange
+        session = mocker.AsyncMock()
+        session.get_bind = mocker.Mock()
+        session.get_bind.return_value.dialect.name = 'postgresql'
+        ctx = mocker.Mock(session=session)
+
+        @execution_profile(PROFILE)
+        async def execute_async(ctx, value):
+            return value
+
+        # Act
+        result = await execute_async(ctx, 42)
+
+        # Assert
+        assert result == 42
+        session.execute.assert_awaited_once()
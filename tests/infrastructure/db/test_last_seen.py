@@ -0,0 +1,116 @@
+import datetime
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+
+from app import connection_pool, user_activity, user_cache
+from app.domain.entity.user import User
+from app.infrastructure.db.last_seen import STATEMENT_ROWS, last_seen_statement, write_last_seen
+
+
+@pytest.fixture
+def user() -> User:
+    user = User(email='seen@example.com', password='hashed', first_name='Seen', last_name='User')
+    with connection_pool.open_session() as session:
+        session.add(user)
+    return user
+
+
+def _seen(day: int) -> datetime.datetime:
+    return datetime.datetime(2024, 1, day, tzinfo=datetime.UTC)
+
+
+def _read(user_id: int) -> User:
+    with connection_pool.open_session(read_only=True) as session:
+        return session.get(User, user_id)
+
+
+class TestLastSeen:
+    def test_write_sets_last_seen_without_touching_updated_at(self, user):
+        # Act
+        with connection_pool.engine.begin() as connection:
+            write_last_seen(connection, [(user.id, _seen(2))])
+
+        # Assert
+        seen = _read(user.id)
+        assert seen.last_seen_at.replace(tzinfo=datetime.UTC) == _seen(2)
+        assert seen.updated_at == user.updated_at
+
+    def test_write_never_moves_last_seen_backwards(self, user):
+        # Arrange
+        with connection_pool.engine.begin() as connection:
+            write_last_seen(connection, [(user.id, _seen(2))])
+
+        # Act
+        with connection_pool.engine.begin() as connection:
+            write_last_seen(connection, [(user.id, _seen(1))])
+
+        # Assert
+        assert _read(user.id).last_seen_at.replace(tzinfo=datetime.UTC) == _seen(2)
+
+    def test_postgresql_updates_from_unnest(self):
+        # Arrange
+        bind = create_engine('postgresql+psycopg://')
+
+        # Act
+        stmt, params = last_seen_statement(bind, [(2, _seen(1)), (1, _seen(1))])
+
+        # Assert
+        sql = str(stmt.compile(bind))
+        assert 'FROM unnest(' in sql
+        assert 'updated_at="user".updated_at' in sql
+        assert params == {'ids': [1, 2], 'seen_at': [_seen(1), _seen(1)]}
+
+    def test_postgresql_binds_two_parameters_whatever_the_rows(self):
+        # Arrange
+        bind = create_engine('postgresql+psycopg://')
+        rows = [(user_id, _seen(1)) for user_id in range(1, 40_001)]
+
+        # Act
+        stmt, params = last_seen_statement(bind, rows)
+
+        # Assert
+        assert set(stmt.compile(bind).params) == {'ids', 'seen_at'}
+        assert len(params['ids']) == len(params['seen_at']) == 40_000
+
+    def test_write_splits_large_flushes_into_bounded_statements(self):
+        # Arrange
+        connection = Mock(dialect=create_engine('postgresql+psycopg://').dialect)
+        rows = [(user_id, _seen(1)) for user_id in range(STATEMENT_ROWS * 2 + 1, 0, -1)]
+
+        # Act
+        write_last_seen(connection, rows)
+
+        # Assert
+        ids = [params['ids'] for (_, params), _ in connection.execute.call_args_list]
+        assert [len(chunk) for chunk in ids] == [STATEMENT_ROWS, STATEMENT_ROWS, 1]
+        assert ids[0][0] == 1 and ids[-1] == [STATEMENT_ROWS * 2 + 1]
+
+    def test_touch_coalesces_and_flushes_in_one_batch(self, user, monkeypatch):
+        # Arrange
+        batches = []
+        monkeypatch.setattr(user_activity, 'enabled', True)
+        monkeypatch.setattr(user_activity.writer, 'write', batches.append)
+        monkeypatch.setattr(user_activity.writer, '_start', lambda: None)
+
+        # Act
+        for _ in range(3):
+            user_activity.touch(user.id)
+        user_activity.touch(user.id + 1)
+        user_activity.writer.flush()
+
+        # Assert
+        assert [[user_id for user_id, _ in batch] for batch in batches] == [[user.id, user.id + 1]]
+
+    def test_statement_keeps_the_entity_cache(self, user):
+        # Arrange
+        with connection_pool.open_session(read_only=True) as session:
+            user_cache.store(session, session.get(User, user.id))
+
+        # Act
+        with connection_pool.open_session() as session:
+            session.execute(*last_seen_statement(session.get_bind(), [(user.id, _seen(1))]))
+
+        # Assert
+        assert user_cache.get(user.id) is not None
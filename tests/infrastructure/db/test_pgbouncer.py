@@ -0,0 +1,217 @@
+import itertools
+import sqlite3
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import connection_pool
+from app.application.dto.user_dto import CreateUserDTO, UpdateUserDTO
+from app.application.use_case.user import (
+    create_user_use_case,
+    delete_user_use_case,
+    get_user_use_case,
+    search_user_use_case,
+    update_user_use_case,
+)
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.connection_pool import ConnectionPool, _statement_cache_config
+from app.infrastructure.db.pgbouncer import to_set_local, use_transaction_local_set
+from app.infrastructure.db.pool import POOL_MODE_PGBOUNCER, PoolConfig, engine_options
+from app.infrastructure.db.routing_session import RoutingSession
+from app.infrastructure.db.statement_cache import StatementCacheConfig
+from app.presentation.dependency.context import AppContext
+
+
+class TransactionPooler:
+    """
+    Stand-in for PgBouncer in transaction mode, in front of a SQLite file.
+
+    Client connections are cheap; each transaction runs on the next of a few server connections,
+    and session-level state or `PREPARE` is refused, like a transaction-pooling bouncer would break it.
+    """
+
+    def __init__(self, database: str, servers: int = 2) -> None:
+        self.servers = [sqlite3.connect(database, check_same_thread=False) for _ in range(servers)]
+        self._next_server = itertools.cycle(self.servers)
+        self.used_servers: set[int] = set()
+        self.client_connections = 0
+        self.statements: list[str] = []
+
+    def connect(self) -> 'ClientConnection':
+        self.client_connections += 1
+        return ClientConnection(self)
+
+    def assign(self) -> sqlite3.Connection:
+        server = next(self._next_server)
+        self.used_servers.add(id(server))
+        return server
+
+
+class ClientConnection:
+    def __init__(self, pooler: TransactionPooler) -> None:
+        self.pooler = pooler
+        self.server: sqlite3.Connection | None = None
+
+    def server_connection(self) -> sqlite3.Connection:
+        if self.server is None:
+            self.server = self.pooler.assign()
+        return self.server
+
+    def cursor(self) -> 'ClientCursor':
+        return ClientCursor(self)
+
+    def commit(self) -> None:
+        if self.server is not None:
+            self.server.commit()
+        self.server = None
+
+    def rollback(self) -> None:
+        if self.server is not None:
+            self.server.rollback()
+        self.server = None
+
+    def close(self) -> None:
+        self.rollback()
+
+    def create_function(self, *args: Any, **kwargs: Any) -> None:
+        for server in self.pooler.servers:
+            server.create_function(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pooler.servers[0], name)
+
+
+class ClientCursor:
+    def __init__(self, client: ClientConnection) -> None:
+        self.client = client
+        self.cursor: sqlite3.Cursor | None = None
+
+    def execute(self, statement: str, parameters: Any = ()) -> 'ClientCursor':
+        self.client.pooler.statements.append(statement)
+        normalized = statement.lstrip().upper()
+        if normalized.startswith('PREPARE') or (normalized.startswith('SET ') and to_set_local(statement) != statement):
+            raise AssertionError(f'Session state does not survive transaction pooling: {statement}')
+        self.cursor = self.client.server_connection().cursor()
+        if normalized.startswith('SET LOCAL'):
+            # SQLite has no settings, accept transaction-scoped ones as a no-op
+            statement, parameters = f'-- {statement}', ()
+        self.cursor.execute(statement, parameters)
+        return self
+
+    def executemany(self, statement: str, parameters: Any) -> 'ClientCursor':
+        self.cursor = self.client.server_connection().cursor()
+        self.cursor.executemany(statement, parameters)
+        return self
+
+    def close(self) -> None:
+        if self.cursor is not None:
+            self.cursor.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.cursor, name)
+
+
+@pytest.fixture
+def pgbouncer_pool(tmp_path) -> TransactionPooler:
+    db_url = f'sqlite:///{tmp_path / "pgbouncer.db"}'
+    pooler = TransactionPooler(str(tmp_path / 'pgbouncer.db'))
+    engine = create_engine(
+        db_url, creator=pooler.connect, **engine_options(db_url, PoolConfig(size=0, mode=POOL_MODE_PGBOUNCER))
+    )
+    use_transaction_local_set(engine)
+    Base.metadata.create_all(engine)
+
+    connection_pool.engine = engine
+    connection_pool.session_factory = sessionmaker(
+        class_=RoutingSession, bind=engine, autocommit=False, autoflush=False, expire_on_commit=False
+    )
+    return pooler
+
+
+class TestPgBouncerMode:
+    def test_engine_options_use_null_pool(self):
+        # Act
+        options = engine_options('postgresql+psycopg://u:p@bouncer/db', PoolConfig(size=0, mode=POOL_MODE_PGBOUNCER))
+
+        # Assert
+        assert options == {'poolclass': NullPool}
+
+    def test_small_local_pool_has_no_overflow_capacity_beyond_config(self):
+        # Arrange
+        pool = ConnectionPool(
+            'postgresql+psycopg://u:p@bouncer/db', pool_config=PoolConfig(size=2, max_overflow=0, mode='pgbouncer')
+        )
+
+        # Assert
+        assert pool.engine.pool.size() == 2
+        assert pool._session_slots is not None
+
+    def test_prepares_are_disabled(self):
+        # Act
+        config = _statement_cache_config(
+            PoolConfig(size=0, mode=POOL_MODE_PGBOUNCER), StatementCacheConfig(prepare_threshold=5)
+        )
+
+        # Assert
+        assert config.prepare_threshold is None
+
+    def test_unknown_mode_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            PoolConfig(mode='session')
+
+    def test_session_set_is_sent_as_set_local(self, pgbouncer_pool):
+        # Arrange
+        pgbouncer_pool.statements.clear()
+
+        # Act
+        with connection_pool.engine.begin() as connection:
+            connection.execute(text('SET statement_timeout = 1000'))
+
+        # Assert
+        assert pgbouncer_pool.statements == ['SET LOCAL statement_timeout = 1000']
+
+    @pytest.mark.parametrize(
+        'statement, expected',
+        [
+            ('SET statement_timeout = 5', 'SET LOCAL statement_timeout = 5'),
+            ('set session work_mem TO 1', 'SET LOCAL work_mem TO 1'),
+            ('SET LOCAL lock_timeout = 1', 'SET LOCAL lock_timeout = 1'),
+            ('SET TRANSACTION READ ONLY', 'SET TRANSACTION READ ONLY'),
+            ('SELECT 1', 'SELECT 1'),
+        ],
+    )
+    def test_to_set_local(self, statement, expected):
+        # Act & Assert
+        assert to_set_local(statement) == expected
+
+
+class TestUseCasesBehindPgBouncer:
+    def test_user_use_cases_work_unchanged(self, pgbouncer_pool):
+        # Arrange
+        dto = CreateUserDTO(email='bouncer@example.com', password='password', first_name='Pg', last_name='Bouncer')
+
+        # Act
+        with connection_pool.open_session() as session:
+            created = create_user_use_case.execute(AppContext(session), dto)
+        with connection_pool.open_session() as session:
+            update_user_use_case.execute(AppContext(session), created.id, UpdateUserDTO(first_name='Updated'))
+        with connection_pool.open_session(read_only=True) as session:
+            fetched = get_user_use_case.execute(AppContext(session), created.id)
+        with connection_pool.open_session(read_only=True) as session:
+            found = search_user_use_case.execute(AppContext(session), None, 'bouncer', 10, 0)
+        with connection_pool.open_session() as session:
+            delete_user_use_case.execute(AppContext(session), created.id)
+        with connection_pool.open_session(read_only=True) as session:
+            remaining = search_user_use_case.execute(AppContext(session), None, 'bouncer', 10, 0)
+
+        # Assert
+        assert fetched.first_name == 'Updated'
+        assert [user.email for user in found.results] == ['bouncer@example.com']
+        assert remaining.count == 0
+        # transactions were spread over server connections, every session opened a new client connection
+        assert len(pgbouncer_pool.used_servers) == 2
+        assert pgbouncer_pool.client_connections >= 6
@@ -0,0 +1,88 @@
+import logging
+
+import pytest
+from sqlalchemy import StaticPool, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import connection_pool, query_monitor as app_query_monitor
+from app.domain.entity.user import User
+from app.infrastructure.db.query_monitor import NPlusOneError, QueryMonitor, statement_shape
+
+
+@pytest.fixture
+def query_monitor(monkeypatch) -> QueryMonitor:
+    monkeypatch.setattr(app_query_monitor, 'n_plus_one_threshold', 3)
+    monkeypatch.setattr(app_query_monitor, 'raise_on_n_plus_one', False)
+    return app_query_monitor
+
+
+class TestQueryMonitor:
+    def test_counts_statements_and_time_inside_track(self, query_monitor):
+        # Arrange
+        with connection_pool.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+
+            # Act
+            with query_monitor.track() as stats:
+                connection.execute(text('SELECT 1'))
+                connection.execute(text('SELECT 2'))
+
+        # Assert
+        assert stats.count == 2
+        assert stats.duration > 0
+
+    def test_statements_outside_track_are_not_recorded(self, query_monitor):
+        # Act
+        with query_monitor.track() as stats:
+            pass
+        with connection_pool.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+
+        # Assert
+        assert stats.count == 0
+
+    def test_repeated_statement_shape_raises(self, query_monitor):
+        # Arrange
+        query_monitor.raise_on_n_plus_one = True
+
+        # Act & Assert
+        with connection_pool.open_session() as session, query_monitor.track():
+            session.scalars(select(User).where(User.id == 1)).all()
+            session.scalars(select(User).where(User.id == 2)).all()
+            with pytest.raises(NPlusOneError):
+                session.scalars(select(User).where(User.id == 3)).all()
+
+    def test_repeated_statement_shape_warns(self, query_monitor, caplog):
+        # Act
+        with connection_pool.open_session() as session, query_monitor.track(), caplog.at_level(logging.WARNING):
+            for user_id in range(3):
+                session.scalars(select(User).where(User.id == user_id)).all()
+
+        # Assert
+        assert 'Possible N+1' in caplog.text
+
+    @pytest.mark.anyio
+    async def test_counts_async_engine_statements(self, query_monitor, anyio_backend):
+        # Arrange
+        engine = create_async_engine('sqlite+aiosqlite:///:memory:', poolclass=StaticPool)
+
+        # Act
+        with query_monitor.track() as stats:
+            async with engine.connect() as connection:
+                await connection.execute(text('SELECT 1'))
+        await engine.dispose()
+
+        # Assert
+        assert stats.count == 1
+
+    @pytest.mark.parametrize(
+        'statement, expected',
+        [
+            ('SELECT *\n  FROM user WHERE id IN (?, ?, ?)', 'SELECT * FROM user WHERE id IN (?)'),
+            ('SELECT * FROM user WHERE id IN (%(id_1)s, %(id_2)s)', 'SELECT * FROM user WHERE id IN (?)'),
+            ('SELECT * FROM user WHERE id = $1', 'SELECT * FROM user WHERE id = $1'),
+        ],
+    )
+    def test_statement_shape(self, statement, expected):
+        # Act & Assert
+        assert statement_shape(statement) == expected
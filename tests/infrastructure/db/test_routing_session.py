@@ -0,0 +1,147 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.domain.entity.user import User
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.connection_pool import ConnectionPool
+from app.infrastructure.db.routing_session import (
+    ReplicaSelector,
+    LEAST_CONNECTIONS,
+    ROUND_ROBIN,
+    READ_ONLY,
+    SESSION_MODE,
+    USE_PRIMARY,
+    ReadOnlySessionError,
+    pin_primary,
+)
+
+
+@pytest.fixture
+def replicated_pool() -> ConnectionPool:
+    pool = ConnectionPool('sqlite://', replica_urls=['sqlite://'])
+    for engine in [pool.engine, *pool.replica_engines]:
+        Base.metadata.create_all(engine)
+    # a row only the replica knows about tells which database served a read
+    with pool.replica_engines[0].begin() as connection:
+        connection.execute(User.__table__.insert().values(id=1, email='replica@example.com', password='x'))
+    return pool
+
+
+class TestRoutingSession:
+    def test_reads_go_to_replica(self, replicated_pool):
+        # Act
+        with replicated_pool.open_session() as session:
+            user = session.scalars(select(User).where(User.id == 1)).first()
+
+        # Assert
+        assert user is not None
+        assert user.email == 'replica@example.com'
+
+    def test_write_pins_rest_of_session_to_primary(self, replicated_pool):
+        # Act
+        with replicated_pool.open_session() as session:
+            session.add(User(email='primary@example.com', password='x'))
+            session.flush()
+            emails = session.scalars(select(User.email)).all()
+
+        # Assert
+        assert emails == ['primary@example.com']
+
+    def test_pin_primary_skips_replica(self, replicated_pool):
+        # Act
+        with replicated_pool.open_session() as session:
+            pin_primary(session)
+            user = session.scalars(select(User).where(User.id == 1)).first()
+
+        # Assert
+        assert session.info[USE_PRIMARY] is True
+        assert user is None
+
+    def test_locking_read_goes_to_primary(self, replicated_pool):
+        # Act
+        with replicated_pool.open_session() as session:
+            user = session.scalars(select(User).where(User.id == 1).with_for_update()).first()
+
+        # Assert
+        assert user is None
+
+    def test_without_replicas_reads_go_to_primary(self):
+        # Arrange
+        pool = ConnectionPool('sqlite://')
+        Base.metadata.create_all(pool.engine)
+
+        # Act
+        with pool.open_session() as session:
+            bind = session.get_bind(clause=select(User))
+
+        # Assert
+        assert bind is pool.engine
+
+
+class TestReadOnlySession:
+    def test_reads_run_in_read_only_mode_on_replica(self, replicated_pool):
+        # Act
+        with replicated_pool.open_session(read_only=True) as session:
+            user = session.scalars(select(User).where(User.id == 1)).first()
+            bind = session.get_bind(clause=select(User))
+
+        # Assert
+        assert user is not None
+        assert bind.get_execution_options()[SESSION_MODE] == READ_ONLY
+        assert bind.get_execution_options()['postgresql_readonly'] is True
+
+    def test_primary_bind_runs_in_read_only_mode(self):
+        # Arrange
+        pool = ConnectionPool('sqlite://')
+
+        # Act
+        with pool.open_session(read_only=True) as session:
+            bind = session.get_bind()
+
+        # Assert
+        assert bind.get_execution_options()[SESSION_MODE] == READ_ONLY
+
+    def test_flushing_changes_raises(self, replicated_pool):
+        # Act & Assert
+        with pytest.raises(ReadOnlySessionError):
+            with replicated_pool.open_session(read_only=True) as session:
+                session.add(User(email='primary@example.com', password='x'))
+                session.flush()
+
+    def test_dml_statement_raises(self, replicated_pool):
+        # Act & Assert
+        with pytest.raises(ReadOnlySessionError):
+            with replicated_pool.open_session(read_only=True) as session:
+                session.execute(update(User).values(first_name='x'))
+
+
+class TestReplicaSelector:
+    def test_round_robin_cycles_replicas(self, mocker):
+        # Arrange
+        engines = [mocker.Mock(), mocker.Mock()]
+        selector = ReplicaSelector(engines, ROUND_ROBIN)
+
+        # Act
+        picked = [selector.select() for _ in range(4)]
+
+        # Assert
+        assert picked == [engines[0], engines[1], engines[0], engines[1]]
+
+    def test_least_connections_picks_idlest_replica(self, mocker):
+        # Arrange
+        busy = mocker.Mock()
+        busy.pool.checkedout.return_value = 7
+        idle = mocker.Mock()
+        idle.pool.checkedout.return_value = 1
+        selector = ReplicaSelector([busy, idle], LEAST_CONNECTIONS)
+
+        # Act
+        picked = selector.select()
+
+        # Assert
+        assert picked is idle
+
+    def test_unknown_strategy_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            ReplicaSelector([], 'random')
@@ -0,0 +1,36 @@
+import pytest
+
+from app.infrastructure.db.statement_cache import StatementCacheConfig, parse_prepare_threshold, statement_options
+
+
+class TestStatementOptions:
+    @pytest.mark.parametrize('db_url', ['postgresql+psycopg://u:p@localhost/db', 'postgresql+psycopg_async://u:p@h/db'])
+    def test_psycopg_gets_prepare_threshold(self, db_url):
+        # Act
+        options = statement_options(db_url, StatementCacheConfig(prepare_threshold=2, query_cache_size=1200))
+
+        # Assert
+        assert options == {'query_cache_size': 1200, 'connect_args': {'prepare_threshold': 2}}
+
+    def test_disabled_prepares_are_passed_as_none(self):
+        # Act
+        options = statement_options(
+            'postgresql+psycopg://u:p@localhost/db', StatementCacheConfig(prepare_threshold=None)
+        )
+
+        # Assert
+        assert options['connect_args'] == {'prepare_threshold': None}
+
+    def test_other_drivers_only_get_cache_size(self):
+        # Act
+        options = statement_options('sqlite:///:memory:', StatementCacheConfig(query_cache_size=0))
+
+        # Assert
+        assert options == {'query_cache_size': 0}
+
+
+class TestParsePrepareThreshold:
+    @pytest.mark.parametrize('value, expected', [('5', 5), ('0', 0), ('off', None), ('None', None), ('', None)])
+    def test_parses_threshold(self, value, expected):
+        # Act & Assert
+        assert parse_prepare_threshold(value) == expected
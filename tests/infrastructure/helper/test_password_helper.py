@@ -1,4 +1,4 @@
-from app.infrastructure.helper.password_helper import hash_password, verify_password, gen_otp
+from app.infrastructure.helper.password_helper import hash_password, hash_passwords, verify_password, gen_otp
 
 
 class TestHashPassword:
@@ -10,6 +10,13 @@ class TestHashPassword:
         assert hash1 != hash2
         assert hash1.startswith('$argon2')
 
+    def test_hash_passwords_keeps_order(self):
+        passwords = ['first', 'second', 'third']
+        hashes = hash_passwords(passwords, max_workers=2)
+
+        assert [verify_password(password, hashed) for password, hashed in zip(passwords, hashes)] == [True] * 3
+        assert verify_password('second', hashes[0]) is False
+
 
 class TestVerifyPassword:
     def test_verify_password_success(self):
@@ -0,0 +1,69 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from app.infrastructure.http.exception_handler import (
+    LOCK_NOT_AVAILABLE,
+    QUERY_CANCELED,
+    db_error_handler,
+    pool_timeout_handler,
+)
+
+
+class PgError(Exception):
+    def __init__(self, sqlstate: str | None) -> None:
+        super().__init__(f'sqlstate {sqlstate}')
+        self.sqlstate = sqlstate
+
+
+@pytest.fixture
+def test_app() -> TestClient:
+    app = FastAPI()
+    app.add_exception_handler(OperationalError, db_error_handler)
+    app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+
+    @app.get('/db-error/{sqlstate}')
+    def db_error(sqlstate: str) -> None:
+        raise OperationalError('SELECT 1', {}, PgError(sqlstate))
+
+    @app.get('/pool-timeout')
+    def pool_timeout() -> None:
+        raise PoolTimeoutError('QueuePool limit reached')
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestDbErrorHandler:
+    def test_statement_timeout_returns_504(self, test_app):
+        # Act
+        response = test_app.get(f'/db-error/{QUERY_CANCELED}')
+
+        # Assert
+        assert response.status_code == 504
+        assert response.json() == {'detail': 'Database query timed out'}
+
+    def test_lock_timeout_returns_503(self, test_app):
+        # Act
+        response = test_app.get(f'/db-error/{LOCK_NOT_AVAILABLE}')
+
+        # Assert
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+
+    def test_other_errors_return_500(self, test_app):
+        # Act
+        response = test_app.get('/db-error/08006')
+
+        # Assert
+        assert response.status_code == 500
+
+
+class TestPoolTimeoutHandler:
+    def test_pool_timeout_returns_503(self, test_app):
+        # Act
+        response = test_app.get('/pool-timeout')
+
+        # Assert
+        assert response.status_code == 503
+        assert response.json() == {'detail': 'Database is busy, retry later'}
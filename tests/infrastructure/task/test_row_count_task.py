@@ -0,0 +1,27 @@
+from sqlalchemy import func, select, text
+
+from app import connection_pool
+from app.domain.entity.user import USER_ROW_COUNT, User
+from app.infrastructure.task.row_count_task import compact_user_row_count
+
+
+class TestCompactUserRowCount:
+    def test_does_nothing_without_postgresql(self):
+        # Act
+        compact_user_row_count()
+
+    def test_folds_deltas_into_one_row(self, setup_test_pg):
+        # Arrange
+        with connection_pool.open_session() as session:
+            session.add_all([User(email=f'delta{i}@example.com', password='x') for i in range(3)])
+            session.flush()
+            session.execute(text('DELETE FROM "user" WHERE email = \'delta0@example.com\''))
+
+        # Act
+        compact_user_row_count()
+
+        # Assert
+        with connection_pool.engine.connect() as connection:
+            rows = connection.execute(select(USER_ROW_COUNT.c.row_count)).scalars().all()
+            users = connection.execute(select(func.count(User.id))).scalar_one()
+        assert rows == [users]
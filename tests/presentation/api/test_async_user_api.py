@@ -0,0 +1,108 @@
+import pytest
+from faker import Faker
+
+fake = Faker()
+
+pytestmark = pytest.mark.anyio
+
+
+class TestAsyncUserApi:
+    async def test_create_then_get_user(self, async_normal_user_client, async_normal_user):
+        # Arrange
+        body = {
+            'email': fake.unique.email(),
+            'password': fake.password(),
+            'first_name': fake.first_name(),
+            'last_name': fake.last_name(),
+        }
+
+        # Act
+        created = await async_normal_user_client.post('/user/', json=body)
+        fetched = await async_normal_user_client.get(f'/user/{created.json()["id"]}/')
+
+        # Assert
+        assert created.status_code == 201, created.text
+        assert fetched.status_code == 200, fetched.text
+        data = fetched.json()
+        assert data['email'] == body['email']
+        assert 'password' not in data
+        assert data['created_user']['id'] == async_normal_user.id
+
+    async def test_search_users(self, async_normal_user_client, async_normal_user):
+        # Act
+        response = await async_normal_user_client.get('/user/', params={'email': 'user@example'})
+
+        # Assert
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data['count'] == 1
+        assert data['results'][0]['id'] == async_normal_user.id
+
+    async def test_update_and_delete_user(self, async_normal_user_client, async_normal_user):
+        # Arrange
+        body = {
+            'email': fake.unique.email(),
+            'password': fake.password(),
+            'first_name': fake.first_name(),
+            'last_name': fake.last_name(),
+        }
+        user_id = (await async_normal_user_client.post('/user/', json=body)).json()['id']
+
+        # Act
+        updated = await async_normal_user_client.patch(f'/user/{user_id}/', json={'first_name': 'Changed'})
+        deleted = await async_normal_user_client.delete(f'/user/{user_id}/')
+        missing = await async_normal_user_client.get(f'/user/{user_id}/')
+
+        # Assert
+        assert updated.status_code == 200, updated.text
+        assert updated.json()['first_name'] == 'Changed'
+        assert deleted.status_code == 204, deleted.text
+        assert missing.status_code == 404, missing.text
+
+    async def test_export_users(self, async_normal_user_client, async_normal_user):
+        # Act
+        response = await async_normal_user_client.get('/user/export/', params={'format': 'csv'})
+
+        # Assert
+        assert response.status_code == 200, response.text
+        lines = response.text.splitlines()
+        assert lines[0] == 'id,email,first_name,last_name,phone,created_at,updated_at'
+        assert lines[1].startswith(f'{async_normal_user.id},{async_normal_user.email},')
+
+    async def test_bulk_create_update_delete(self, async_normal_user_client, async_normal_user):
+        # Arrange
+        body = [
+            {'email': fake.unique.email(), 'password': fake.password(), 'first_name': 'Bulk', 'last_name': 'User'},
+            {'email': async_normal_user.email, 'password': fake.password(), 'first_name': 'Bulk', 'last_name': 'User'},
+        ]
+
+        # Act
+        created = await async_normal_user_client.post('/user/bulk/', json=body)
+        user_id = created.json()['results'][0]['id']
+        updated = await async_normal_user_client.patch('/user/bulk/', json=[{'id': user_id, 'first_name': 'Changed'}])
+        fetched = await async_normal_user_client.get(f'/user/{user_id}/')
+        deleted = await async_normal_user_client.request('DELETE', '/user/bulk/', json=[user_id])
+
+        # Assert
+        assert created.status_code == 200, created.text
+        assert created.json()['failed'] == 1
+        assert updated.json()['succeeded'] == 1
+        assert fetched.json()['first_name'] == 'Changed'
+        assert deleted.json()['results'] == [{'index': 0, 'id': user_id, 'error': None}]
+
+    async def test_unauthenticated_request_is_rejected(self, async_client):
+        # Act
+        response = await async_client.get('/user/')
+
+        # Assert
+        assert response.status_code in (401, 403)
+
+    async def test_login(self, async_client, async_normal_user):
+        # Act
+        response = await async_client.post(
+            '/auth/login/', json={'email': async_normal_user.email, 'password': 'user_password'}
+        )
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert 'access' in response.json()
@@ -0,0 +1,57 @@
+import pytest
+
+
+class TestLiveness:
+    def test_is_served_without_authentication(self, client):
+        # Act
+        response = client.get('/health/')
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert response.json() == {'status': 'ok'}
+
+
+class TestMetricsAuthentication:
+    @pytest.mark.parametrize('path', ['/health/db/', '/health/cache/', '/health/history/'])
+    def test_requires_authentication(self, client, path):
+        # Act
+        response = client.get(path)
+
+        # Assert
+        assert response.status_code == 403, response.text
+
+
+class TestDbPoolMetrics:
+    def test_returns_pool_metrics_per_engine(self, normal_user_client):
+        # Act
+        response = normal_user_client.get('/health/db/')
+
+        # Assert
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert 'primary' in data['sync']['pools']
+        assert 'primary' in data['async']['pools']
+        assert 'checked_out' in data['sync']['pools']['primary']
+        assert 'wait_avg_ms' in data['sync']['pools']['primary']
+        assert 'round_trips' in data['sync']['round_trips']['read_only']
+
+
+class TestCacheMetrics:
+    def test_returns_user_cache_counters(self, normal_user_client):
+        # Act
+        response = normal_user_client.get('/health/cache/')
+
+        # Assert
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert {'hits', 'misses', 'hit_ratio', 'invalidations', 'size'} <= set(data['user'])
+
+
+class TestHistoryMetrics:
+    def test_returns_user_history_writer_counters(self, normal_user_client):
+        # Act
+        response = normal_user_client.get('/health/history/')
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert {'written', 'failed', 'dropped', 'pending', 'enabled'} <= set(response.json()['user'])
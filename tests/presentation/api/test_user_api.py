@@ -1,5 +1,10 @@
+import csv
+import io
+import json
+
 import pytest
 from faker import Faker
+from sqlalchemy import event
 
 from app import connection_pool
 from app.domain.repository import user_repository
@@ -25,6 +30,18 @@ def user_1() -> UserDTO:
         return create_user_use_case.execute(ctx, body)
 
 
+@pytest.fixture
+def user_2(user_1) -> UserDTO:
+    body = CreateUserDTO(
+        email=fake.unique.email(),
+        password=fake.password(),
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+    )
+    with connection_pool.open_session() as session:
+        return create_user_use_case.execute(AppContext(session), body)
+
+
 class TestSearchUsers:
     def test_search_by_keyword_returns_match(self, normal_user_client, user_1):
         # Arrange
@@ -39,6 +56,133 @@ class TestSearchUsers:
         assert data['count'] >= 1
         assert any(u['id'] == user_1.id for u in data['results'])
 
+    def test_search_returns_rows_and_total_in_one_query(self, normal_user_client, user_1, assert_query_count):
+        # Act
+        response = normal_user_client.get('/user/', params={'limit': 1, 'offset': 1})
+
+        # Assert
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data['count'] == 2
+        assert len(data['results']) == 1
+        # the authenticated user, then the page
+        assert_query_count(response, 2)
+
+    def test_search_without_count(self, normal_user_client, user_1):
+        # Act
+        response = normal_user_client.get('/user/', params={'include_count': False})
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert response.json()['count'] is None
+
+    def test_search_count_modes(self, normal_user_client, user_1):
+        # Act
+        estimate = normal_user_client.get('/user/', params={'count_mode': 'estimate'})
+        none = normal_user_client.get('/user/', params={'count_mode': 'none'})
+        invalid = normal_user_client.get('/user/', params={'count_mode': 'approximate'})
+
+        # Assert
+        assert estimate.status_code == 200, estimate.text
+        # exact on SQLite
+        assert estimate.json()['count'] == 2
+        assert none.json()['count'] is None
+        assert invalid.status_code == 422, invalid.text
+
+    def test_search_walks_pages_with_cursors(self, normal_user_client, user_1, user_2, assert_query_count):
+        # Act
+        page_1 = normal_user_client.get('/user/', params={'limit': 2}).json()
+        page_2 = normal_user_client.get('/user/', params={'limit': 2, 'cursor': page_1['next_cursor']})
+        back = normal_user_client.get('/user/', params={'limit': 2, 'cursor': page_2.json()['prev_cursor']}).json()
+
+        # Assert
+        assert page_2.status_code == 200, page_2.text
+        assert page_1['prev_cursor'] is None
+        assert [u['id'] for u in page_2.json()['results']] == [user_2.id]
+        assert page_2.json()['next_cursor'] is None
+        assert [u['id'] for u in back['results']] == [u['id'] for u in page_1['results']]
+        assert back['prev_cursor'] is None
+        assert page_2.json()['count'] == 3
+        # the page, then the total the window can't give past a cursor
+        assert_query_count(page_2, 2)
+
+    def test_fulltext_search_pages_without_cursors(self, normal_user_client, user_1, user_2):
+        # Arrange
+        first = normal_user_client.get('/user/', params={'limit': 1})
+
+        # Act
+        response = normal_user_client.get('/user/', params={'limit': 1, 'keyword': 'example', 'mode': 'fulltext'})
+        with_cursor = normal_user_client.get(
+            '/user/', params={'mode': 'fulltext', 'cursor': first.json()['next_cursor']}
+        )
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert response.json()['next_cursor'] is None
+        assert with_cursor.status_code == 400, with_cursor.text
+
+    def test_search_by_creation_date(self, normal_user_client, user_1):
+        # Act
+        today = normal_user_client.get('/user/', params={'created_from': '2000-01-01T00:00:00', 'order_by': '-id'})
+        before = normal_user_client.get('/user/', params={'created_to': '2000-01-01T00:00:00'})
+
+        # Assert
+        assert today.status_code == 200, today.text
+        assert [u['id'] for u in today.json()['results']][0] == user_1.id
+        assert today.json()['next_cursor'] is None
+        assert before.json()['count'] == 0
+
+    def test_search_ordered_by_name_rejects_cursor(self, normal_user_client, user_1, user_2):
+        # Arrange
+        first = normal_user_client.get('/user/', params={'limit': 1})
+
+        # Act
+        response = normal_user_client.get(
+            '/user/', params={'order_by': 'full_name', 'cursor': first.json()['next_cursor']}
+        )
+
+        # Assert
+        assert response.status_code == 400, response.text
+
+    def test_search_rejects_invalid_cursor(self, normal_user_client):
+        # Act
+        response = normal_user_client.get('/user/', params={'cursor': 'not-a-cursor'})
+
+        # Assert
+        assert response.status_code == 400, response.text
+
+    def test_search_caps_page_size(self, normal_user_client):
+        # Act
+        response = normal_user_client.get('/user/', params={'limit': 10_000})
+
+        # Assert
+        assert response.status_code == 422, response.text
+
+
+class TestExportUsers:
+    def test_export_streams_ndjson(self, normal_user_client, normal_user, user_1):
+        # Act
+        response = normal_user_client.get('/user/export/')
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        assert 'content-length' not in response.headers
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row['email'] for row in rows] == [normal_user.email, user_1.email]
+        assert 'password' not in rows[0]
+
+    def test_export_streams_filtered_csv(self, normal_user_client, user_1):
+        # Act
+        response = normal_user_client.get('/user/export/', params={'format': 'csv', 'email': user_1.email})
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert response.headers['content-type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row['id'] for row in rows] == [str(user_1.id)]
+        assert rows[0]['first_name'] == user_1.first_name
+
 
 class TestGetUser:
     def test_get_user_by_id(self, normal_user_client, user_1):
@@ -54,6 +198,30 @@ class TestGetUser:
         assert data['first_name'] == user_1.first_name
         assert data['last_name'] == user_1.last_name
 
+    def test_get_user_by_id_is_served_from_cache(self, normal_user_client, user_1, assert_query_count):
+        # Arrange
+        first = normal_user_client.get(f'/user/{user_1.id}/')
+
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        # Act
+        event.listen(connection_pool.engine, 'before_cursor_execute', _record)
+        try:
+            response = normal_user_client.get(f'/user/{user_1.id}/')
+        finally:
+            event.remove(connection_pool.engine, 'before_cursor_execute', _record)
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert_query_count(first, 2)
+        # only `last_seen_at`, which isn't cached; the password hash stays in the database
+        assert_query_count(response, 1)
+        assert 'last_seen_at' in statements[0]
+        assert 'password' not in statements[0]
+
     def test_get_user_returns_404_for_nonexistent(self, normal_user_client):
         # Arrange
         fake_id = fake.random_int(min=99999, max=999999)
@@ -134,3 +302,60 @@ class TestDeleteUser:
         with connection_pool.open_session() as session:
             user = user_repository.find_by_id(session, user_1.id)
             assert user is None, f'Expected user {user_1.id} to be deleted'
+
+
+class TestBulkUsers:
+    def test_bulk_create_reports_duplicates_per_item(self, normal_user_client, normal_user, assert_query_count):
+        # Arrange
+        body = [
+            {'email': 'bulk1@example.com', 'password': 'password', 'first_name': 'Bulk', 'last_name': 'One'},
+            {'email': normal_user.email, 'password': 'password', 'first_name': 'Taken', 'last_name': 'Email'},
+            {'email': 'bulk2@example.com', 'password': 'password', 'first_name': 'Bulk', 'last_name': 'Two'},
+            {'email': 'bulk1@example.com', 'password': 'password', 'first_name': 'Repeated', 'last_name': 'Email'},
+        ]
+
+        # Act
+        response = normal_user_client.post('/user/bulk/', json=body)
+
+        # Assert
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert (data['succeeded'], data['failed']) == (2, 2)
+        assert [result['error'] is None for result in data['results']] == [True, False, True, False]
+        assert data['results'][1]['error'] == 'Email already exists'
+        # the authenticated user, the taken emails, one INSERT
+        assert_query_count(response, 3)
+        created = normal_user_client.get(f'/user/{data["results"][0]["id"]}/').json()
+        assert created['email'] == 'bulk1@example.com'
+        assert created['created_user']['id'] == normal_user.id
+
+    def test_bulk_update_reports_missing_users(self, normal_user_client, user_1, user_2):
+        # Arrange
+        body = [{'id': user_1.id, 'first_name': 'First'}, {'id': 0, 'first_name': 'Nobody'}, {'id': user_2.id}]
+
+        # Act
+        response = normal_user_client.patch('/user/bulk/', json=body)
+
+        # Assert
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert [result['id'] for result in data['results']] == [user_1.id, None, user_2.id]
+        assert data['results'][1]['error'] == 'User (0) not found'
+        assert normal_user_client.get(f'/user/{user_1.id}/').json()['first_name'] == 'First'
+        assert normal_user_client.get(f'/user/{user_2.id}/').json()['first_name'] == user_2.first_name
+
+    def test_bulk_delete_reports_missing_users(self, normal_user_client, user_1):
+        # Act
+        response = normal_user_client.request('DELETE', '/user/bulk/', json=[user_1.id, 0])
+
+        # Assert
+        assert response.status_code == 200, response.text
+        assert response.json()['failed'] == 1
+        assert normal_user_client.get(f'/user/{user_1.id}/').status_code == 404
+
+    def test_bulk_rejects_empty_batch(self, normal_user_client):
+        # Act
+        response = normal_user_client.post('/user/bulk/', json=[])
+
+        # Assert
+        assert response.status_code == 422, response.text
@@ -1,13 +1,38 @@
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from typing import Generator
+from httpx import ASGITransport, AsyncClient, Response
+from typing import Callable, Generator, AsyncGenerator
 
-from app import connection_pool
+from app import connection_pool, async_connection_pool, query_monitor
 from app.application.dto.user_dto import CreateUserDTO, UserDTO
 from app.infrastructure.helper.jwt_helper import generate_token_pair
+from app.infrastructure.http.response import MsgSpecJSONResponse
 from app.main import app
 from app.application.use_case.user import create_user_use_case
-from app.presentation.dependency.context import AppContext
+from app.presentation.api.auth_api import async_auth_router
+from app.presentation.api.user_api import async_user_router
+from app.presentation.dependency.context import AppContext, AsyncAppContext
+
+
+@pytest.fixture(autouse=True)
+def raise_on_n_plus_one(monkeypatch) -> None:
+    monkeypatch.setattr(query_monitor, 'raise_on_n_plus_one', True)
+
+
+@pytest.fixture
+def assert_query_count() -> Callable[[Response, int], None]:
+    """
+    Assert the exact number of SQL statements an endpoint ran, read from its `X-DB-Query-Count` header.
+    """
+
+    def _assert_query_count(response: Response, expected: int) -> None:
+        count = int(response.headers['X-DB-Query-Count'])
+        assert count == expected, (
+            f'{response.request.method} {response.request.url} ran {count} queries, not {expected}'
+        )
+
+    return _assert_query_count
 
 
 @pytest.fixture
@@ -55,3 +80,34 @@ def admin_user_client(client, admin_user) -> Generator[TestClient, None, None]:
     access, _ = generate_token_pair(admin_user.id)
     client.headers['Authorization'] = f'Bearer {access}'
     yield client
+
+
+@pytest.fixture
+async def async_client(setup_test_async) -> AsyncGenerator[AsyncClient, None]:
+    async_app = FastAPI(default_response_class=MsgSpecJSONResponse)
+    async_app.include_router(async_auth_router, prefix='/api/v1')
+    async_app.include_router(async_user_router, prefix='/api/v1')
+    transport = ASGITransport(app=async_app)
+    async with AsyncClient(transport=transport, base_url='http://localhost:8000/api/v1') as client:
+        yield client
+
+
+@pytest.fixture
+async def async_normal_user(setup_test_async) -> UserDTO:
+    async with async_connection_pool.open_async_session() as session:
+        ctx = AsyncAppContext(session)
+        dto = CreateUserDTO(
+            email='user@example.com',
+            password='user_password',
+            first_name='Normal',
+            last_name='User',
+            phone=None,
+        )
+        return await create_user_use_case.execute_async(ctx, dto)
+
+
+@pytest.fixture
+async def async_normal_user_client(async_client, async_normal_user) -> AsyncGenerator[AsyncClient, None]:
+    access, _ = generate_token_pair(async_normal_user.id)
+    async_client.headers['Authorization'] = f'Bearer {access}'
+    yield async_client
@@ -1,9 +1,13 @@
+import inspect
+
 import pytest
 from unittest.mock import Mock
 from sqlalchemy.orm import Session
 
 from app.presentation.dependency.context import AppContext, get_context
 from app.domain.entity.user import User
+from app.infrastructure.db.routing_session import USE_PRIMARY
+from app.presentation.dependency.db import get_authenticated_db, get_read_only_authenticated_db, get_read_only_db
 from app.presentation.dependency.translator import Translator
 
 
@@ -176,6 +180,40 @@ class TestGetContext:
         assert context.session == mock_session
         assert context.translator == mock_translator
 
+    def test_get_context_pins_write_requests_to_primary(self):
+        """Test that a non read-only context sends the rest of the request to the primary"""
+        session = Mock(spec=Session)
+        session.info = {}
+
+        context = get_context(read_only=False)(session, Mock(spec=Translator))
+
+        assert context.session.info[USE_PRIMARY] is True
+
+    def test_get_context_read_only_keeps_replica_routing(self):
+        """Test that a read-only context leaves reads routable to replicas"""
+        session = Mock(spec=Session)
+        session.info = {}
+
+        context = get_context(read_only=True)(session, Mock(spec=Translator))
+
+        assert USE_PRIMARY not in context.session.info
+
+    @pytest.mark.parametrize(
+        'is_authenticated, read_only, expected',
+        [
+            (True, False, get_authenticated_db),
+            (True, True, get_read_only_authenticated_db),
+            (False, True, get_read_only_db),
+        ],
+    )
+    def test_get_context_picks_session_dependency(self, is_authenticated, read_only, expected):
+        """Test that read-only contexts get a read-only session"""
+        dependency = get_context(is_authenticated, read_only)
+
+        session_param = inspect.signature(dependency).parameters['session']
+
+        assert session_param.default.dependency is expected
+
 
 class TestAppContextIntegration:
     """Integration tests for AppContext with real-like objects"""